@@ -0,0 +1,367 @@
+# benchmark.py
+"""
+Reproducible benchmarks for the match engine, file parsing, persistence and
+page rendering. Every benchmark uses the samples/ rosters and fixed seeds, so
+two runs on the same machine do the same work.
+
+Usage:
+    python benchmark.py run [--output FILE] [--only NAME ...] [--quick]
+    python benchmark.py compare BASELINE CURRENT [--threshold 0.1]
+
+run writes the timings as JSON (by default benchmarks/<commit>.json).
+compare lists each benchmark's change between two result files and exits with
+status 1 when any got slower by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from config import Config
+
+SAMPLES = 'samples'
+SEED = 2024
+
+
+class BenchmarkConfig(Config):
+    """In-memory database and no on-disk cache, so runs never touch instance/"""
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SIMULATION_CACHE_PATH = None
+    PACKED_MATCH_EVENTS = False
+
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES, name), 'r') as f:
+        return f.read()
+
+
+class Suite:
+    """Shared fixtures - parsed samples, the Flask app and its database - built on first use"""
+    def __init__(self, quick=False):
+        self.quick = quick
+        self._samples = {}
+        self._app = None
+        self.match_ids = []  # Completed matches for the rendering benchmarks
+
+    def scale(self, number):
+        return max(1, number // 10) if self.quick else number
+
+    def sample(self, prefix):
+        """(Roster, Teamsheet) of a samples/ team"""
+        if prefix not in self._samples:
+            from esms.models.roster import Roster
+            from esms.models.teamsheet import Teamsheet
+            self._samples[prefix] = (
+                Roster.parse(read_sample(f'{prefix}_roster.txt')),
+                Teamsheet.parse(read_sample(f'{prefix}_teamsheet.txt'))
+            )
+        return self._samples[prefix]
+
+    def engine_team(self, prefix):
+        """A fresh engine team and its bench (roster players left out of the teamsheet)"""
+        from esms.engine.player import Player
+        roster, teamsheet = self.sample(prefix)
+        team = roster.to_team(teamsheet)
+        selected = {name for position, name in teamsheet.positions}
+        subs = [Player(name=name, position=data['position'], attributes=data['attributes'])
+                for name, data in roster.players_data.items() if name not in selected]
+        return team, subs
+
+    def app(self):
+        """Flask app on an in-memory database holding the sample teams and a few played matches"""
+        if self._app is None:
+            from factory import create_app
+            self._app = create_app(BenchmarkConfig)
+            self._app.app_context().push()  # Kept for the rest of the run
+            for prefix in ('home', 'away'):
+                self._add_team(prefix)
+            self.match_ids = self.new_matches(10)
+            from esms.services.match_service import MatchService
+            service = MatchService()
+            for match_id in self.match_ids:
+                service.run_match_simulation(match_id)
+        return self._app
+
+    def _add_team(self, prefix):
+        from extensions import db
+        from esms.models.team import Team, TeamPlayer
+        from esms.models.player import Player
+        roster, teamsheet = self.sample(prefix)
+        team = Team(name=roster.team_name, tactic=teamsheet.tactic)
+        db.session.add(team)
+        for position, name in teamsheet.positions:
+            attributes = roster.players_data[name]['attributes']
+            first_name, _, last_name = name.partition(' ')
+            player = Player(first_name=first_name, last_name=last_name or first_name,
+                            primary_position=position, **attributes)
+            db.session.add(player)
+            db.session.add(TeamPlayer(team=team, player=player, position=position))
+        db.session.commit()
+
+    def new_matches(self, count):
+        """Schedule count home v away matches; returns their ids"""
+        from extensions import db
+        from esms.models.match import Match
+        from esms.models.team import Team
+        home, away = Team.query.order_by(Team.id).limit(2).all()
+        start = datetime(2024, 8, 1)
+        matches = [Match(home_team_id=home.id, away_team_id=away.id, completed=False,
+                         scheduled_time=start + timedelta(days=i), home_score=0, away_score=0)
+                   for i in range(count)]
+        db.session.add_all(matches)
+        db.session.commit()
+        return [match.id for match in matches]
+
+
+# name -> (description, function(suite) returning (run, number, setup)). run(state)
+# is one operation; setup(number), when given, returns the states of number
+# operations and is not timed.
+BENCHMARKS = {}
+
+
+def benchmark(name, description):
+    def register(function):
+        BENCHMARKS[name] = (description, function)
+        return function
+    return register
+
+
+@benchmark('engine_single_match', 'EnhancedMatchEngine.run_full_match with events and substitutes')
+def engine_single_match(suite):
+    from esms.engine.match_engine import EnhancedMatchEngine
+
+    def setup(number):
+        return [(SEED + index,) + suite.engine_team('home') + suite.engine_team('away') for index in range(number)]
+
+    def run(fixture):
+        seed, home, home_subs, away, away_subs = fixture
+        engine = EnhancedMatchEngine(seed=seed)
+        engine.setup_match(home, away, home_subs, away_subs)
+        engine.run_full_match()
+    return run, suite.scale(50), setup
+
+
+@benchmark('engine_batch', 'EnhancedMatchEngine.simulate_many, 200 matches per operation')
+def engine_batch(suite):
+    from esms.engine.match_engine import EnhancedMatchEngine
+    home, home_subs = suite.engine_team('home')
+    away, away_subs = suite.engine_team('away')
+
+    def run(state):
+        EnhancedMatchEngine().simulate_many(home, away, 200, seed=SEED, home_subs=home_subs, away_subs=away_subs)
+    return run, 1, None
+
+
+@benchmark('vector_batch', 'VectorMatchEngine.simulate, 20000 matches per operation')
+def vector_batch(suite):
+    from esms.engine.vector_engine import VectorMatchEngine
+    home, _ = suite.engine_team('home')
+    away, _ = suite.engine_team('away')
+
+    def run(state):
+        VectorMatchEngine().simulate(home, away, 20000, seed=SEED)
+    return run, 1, None
+
+
+@benchmark('roster_parse', 'Roster.parse of an 18-player sample roster')
+def roster_parse(suite):
+    from esms.models.roster import Roster
+    text = read_sample('home_roster.txt')
+
+    def run(state):
+        Roster.parse(text)
+    return run, suite.scale(2000), None
+
+
+@benchmark('teamsheet_parse', 'Teamsheet.parse of a sample teamsheet')
+def teamsheet_parse(suite):
+    from esms.models.teamsheet import Teamsheet
+    text = read_sample('home_teamsheet.txt')
+
+    def run(state):
+        Teamsheet.parse(text)
+    return run, suite.scale(2000), None
+
+
+@benchmark('team_to_engine_model', 'team_to_engine_model of a database team, including its queries')
+def team_to_engine_model(suite):
+    from esms.models.team import Team
+    from esms.utils.converters import team_to_engine_model as convert
+    suite.app()
+    team = Team.query.order_by(Team.id).first()
+
+    def run(state):
+        convert(team)
+    return run, suite.scale(200), None
+
+
+@benchmark('run_match_simulation', 'MatchService.run_match_simulation with its database writes')
+def run_match_simulation(suite):
+    from esms.services.match_service import MatchService
+    suite.app()
+    service = MatchService()
+
+    def run(match_id):
+        service.run_match_simulation(match_id)
+    return run, suite.scale(20), suite.new_matches
+
+
+@benchmark('render_match_detail', 'GET /match/<id> (match_detail.html) for a played match')
+def render_match_detail(suite):
+    client = suite.app().test_client()
+    url = f'/match/{suite.match_ids[0]}'
+
+    def run(state):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+    return run, suite.scale(100), None
+
+
+@benchmark('render_results', 'GET /match/results (results.html)')
+def render_results(suite):
+    client = suite.app().test_client()
+
+    def run(state):
+        response = client.get('/match/results')
+        if response.status_code != 200:
+            raise RuntimeError(f"/match/results returned {response.status_code}")
+    return run, suite.scale(100), None
+
+
+def measure(run, number, setup=None, repeat=5):
+    """Seconds per operation over repeat timings of number operations"""
+    timings = []
+    for _ in range(repeat):
+        states = setup(number) if setup else [None] * number
+        start = time.perf_counter()
+        for state in states:
+            run(state)
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'best': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings) if repeat > 1 else 0.0
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_suite(names=None, quick=False, repeat=5):
+    """Run the named benchmarks (all by default) and return the results document"""
+    from esms.engine import init_engine
+    init_engine()
+
+    unknown = set(names or []) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    suite = Suite(quick)
+    results = {}
+    for name, (description, function) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        run, number, setup = function(suite)
+        run(setup(1)[0] if setup else None)  # Warm up imports and caches
+        results[name] = dict(description=description, **measure(run, number, setup, repeat))
+        print(f"{name:<24}{results[name]['median'] * 1000:>12.3f} ms/op  (best {results[name]['best'] * 1000:.3f})")
+
+    return {
+        'commit': current_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'seed': SEED,
+        'results': results
+    }
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Rows of (name, baseline median, current median, ratio, verdict) for the
+    benchmarks in both documents; verdict is 'slower' or 'faster' when the
+    median moved by more than threshold
+    """
+    rows = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['median']
+        after = result['median']
+        ratio = after / before if before else float('inf')
+        if ratio > 1 + threshold:
+            verdict = 'slower'
+        elif ratio < 1 - threshold:
+            verdict = 'faster'
+        else:
+            verdict = ''
+        rows.append((name, before, after, ratio, verdict))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ESMS benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run the benchmarks and save the results")
+    run_parser.add_argument('--output', help="results file (default benchmarks/<commit>.json)")
+    run_parser.add_argument('--only', nargs='+', metavar='NAME', choices=sorted(BENCHMARKS),
+                            help="run only these benchmarks")
+    run_parser.add_argument('--quick', action='store_true', help="a tenth of the operations, for smoke runs")
+    run_parser.add_argument('--repeat', type=int, default=5, help="timings per benchmark (default 5)")
+
+    compare_parser = commands.add_parser('compare', help="compare two results files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help="relative change in the median that counts (default 0.1)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        if args.repeat < 1:
+            parser.error("--repeat must be at least 1")
+        document = run_suite(args.only, args.quick, args.repeat)
+        output = args.output or os.path.join('benchmarks', f"{document['commit']}.json")
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"Results written to {output}")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r') as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'benchmark':<24}{baseline['commit']:>14}{current['commit']:>14}{'change':>10}")
+    for name, before, after, ratio, verdict in rows:
+        print(f"{name:<24}{before * 1000:>12.3f}ms{after * 1000:>12.3f}ms{(ratio - 1) * 100:>+9.1f}%  {verdict}")
+
+    regressions = [row[0] for row in rows if row[4] == 'slower']
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,5 +12,11 @@ class Config:
     # Match engine configurations
     SUBSTITUTIONS = 3  # Default number of substitutions allowed
     HOME_BONUS = 150   # Home advantage bonus
+    PACKED_MATCH_EVENTS = False  # Store each match's events as one packed blob instead of MatchEvent rows
+    SIMULATION_CACHE_SIZE = 256  # Results kept in memory by the simulation cache
+    SIMULATION_CACHE_PATH = 'instance/simulation_cache.sqlite'  # On-disk tier, None for memory only
+    LIVE_MATCH_SPEED = 30  # Match minutes per real minute for /match/<id>/live
+    JOB_WORKERS = 2  # Background simulation worker threads per process
+    JOB_TIMEOUT = 600  # Seconds a running job may take before it counts as abandoned and is run again
     
     # Add more configuration settings as needed
\ No newline at end of file
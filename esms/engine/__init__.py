@@ -3,6 +3,7 @@ def init_engine():
     """Initialize engine components like tactics and commentary managers"""
     from esms.engine.tactics import tact_manager
     from esms.engine.commentary import commentary_manager
+    from esms.engine.context import reset_shared_context
     import os
     import shutil
     
@@ -23,4 +24,7 @@ def init_engine():
         commentary_manager().init('language.dat')
         print("Commentary manager initialized")
     except Exception as e:
-        print(f"Warning: Could not initialize commentary manager: {str(e)}")
\ No newline at end of file
+        print(f"Warning: Could not initialize commentary manager: {str(e)}")
+    
+    # Matches snapshot the managers into a shared read-only context
+    reset_shared_context()
\ No newline at end of file
@@ -0,0 +1,350 @@
+# esms/engine/analytic.py
+"""
+Analytic match model.
+
+The event loop of EnhancedMatchEngine is a Markov chain over (score, zone,
+injury time, momentum). Instead of sampling it, this module propagates the
+probability of every state through the match by dynamic programming and
+reads the full-time score distribution off the final state, so one pass
+gives exact-for-the-model odds with no sampling noise.
+
+Transition probabilities come from the lineups' ratings and follow
+update_possession, update_field_position, process_goal_attempt,
+process_attacking_play, process_midfield_play, update_momentum and
+simulate_injury_time. The per-action player picks and the random variation
+of get_effective_attribute are integrated out exactly (the variation with
+a midpoint rule).
+
+It makes the same simplifications as VectorMatchEngine (no substitutions,
+red cards or fatigue) plus a few of its own:
+- Momentum is kept on a 0.5-wide grid; values between grid points are
+  split between the two neighbours, which keeps the mean exact
+- Every card is treated as a player's first booking
+- Scores above max_goals and injury time above MAX_INJURY_TIME are
+  counted at the cap
+"""
+import numpy as np
+
+from esms.engine.match_engine import EnhancedMatchEngine
+from esms.engine.tactics import position_factor, TK, PS, SH
+from esms.engine.vector_engine import (
+    GROUP_POSITIONS, FORWARD, MIDFIELDER, WINGER, DEFENDER, KEEPER, ANY,
+    MIDFIELD_POSITIONS, CENTRAL_POSITIONS, TACTIC_INDEX, FORWARD_ADJUSTMENT,
+    ATTACKING_PLAY_WEIGHTS, MIDFIELD_PLAY_WEIGHTS, SHOT, CROSS, THROUGH_BALL, DRIBBLE
+)
+
+MOMENTUM_STEP = 0.5
+MOMENTUM_GRID = np.linspace(-10, 10, int(20 / MOMENTUM_STEP) + 1)
+ZONES = 5
+MAX_INJURY_TIME = 8
+
+# Offsets of the per-action random variation, one per midpoint-rule node
+VARIATION = (np.arange(8) + 0.5) / 8 - 0.5
+
+# Chance that a foul leads to a card (first offence, midfield zone)
+FOUL_CARD_CHANCE = 0.3
+
+# Injury time added by process_injury: (probability, minutes)
+INJURY_TIME_ADDED = ((0.99 + 0.01 * 0.7, 0), (0.01 * 0.25, 1), (0.01 * 0.025, 2), (0.01 * 0.025, 3))
+
+# Momentum grid points moved by an event: none, save/card by either side, goal by either side
+MOMENTUM_JUMPS = (0, 2, -2, -10, 10)
+
+HOME, AWAY = 0, 1
+
+
+def _shift(array, axis, steps):
+    """Move probability mass `steps` places along an axis, piling up at the ends"""
+    if steps == 0:
+        return array
+    size = array.shape[axis]
+    result = np.zeros_like(array)
+    source = [slice(None)] * array.ndim
+    target = [slice(None)] * array.ndim
+    edge = [slice(None)] * array.ndim
+    if steps > 0:
+        source[axis], target[axis] = slice(0, size - steps), slice(steps, size)
+        edge[axis] = slice(size - steps, size)
+        result[tuple(target)] = array[tuple(source)]
+        target[axis] = size - 1
+    else:
+        source[axis], target[axis] = slice(-steps, size), slice(0, size + steps)
+        edge[axis] = slice(0, -steps)
+        result[tuple(target)] = array[tuple(source)]
+        target[axis] = 0
+    result[tuple(target)] += array[tuple(edge)].sum(axis=axis)
+    return result
+
+
+def _momentum_transitions(score_diff):
+    """update_momentum as a grid transition matrix [from, to] for a home - away score difference"""
+    size = len(MOMENTUM_GRID)
+    matrix = np.zeros((size, size))
+    for i, momentum in enumerate(MOMENTUM_GRID):
+        reverted = momentum - 0.2 * np.sign(momentum)
+        for chance, shift in ((0.9, 0.0), (0.1, 0.1)):
+            value = min(10.0, max(-10.0, reverted - shift - 0.05 * score_diff))
+            position = (value + 10) / MOMENTUM_STEP
+            low = min(int(position), size - 1)
+            fraction = position - low
+            matrix[i, low] += chance * (1 - fraction)
+            if fraction:
+                matrix[i, low + 1] += chance * fraction
+    return matrix
+
+
+class _Lineup:
+    """Player groups and tactic-adjusted skill values of one team against one opponent"""
+    def __init__(self, team):
+        players = team.players
+        if not players:
+            raise ValueError(f"Team {team.name} has no players")
+
+        self.team = team
+        self.groups = []
+        for group, positions in enumerate(GROUP_POSITIONS + (None,)):
+            chosen = [] if positions is None else [p for p in players if p.position in positions]
+            if group == KEEPER:
+                chosen = chosen[:1]  # Always the first goalkeeper
+            self.groups.append(chosen or list(players))
+
+        self.tactic = TACTIC_INDEX.get(team.tactic, 0)
+        self.avg_passing = np.mean([getattr(p, 'passing', 10) for p in players])
+        midfielders = [p for p in players if p.position in MIDFIELD_POSITIONS]
+        if midfielders:
+            self.midfield_quality = (np.mean([getattr(p, 'passing', 10) for p in midfielders]) +
+                                     np.mean([getattr(p, 'technique', 10) for p in midfielders])) / 2
+            self.midfield_quality += team.temp_passing_boost
+        else:
+            self.midfield_quality = 10
+
+    def skill(self, group, attribute, skill=None):
+        """Effective skill of each group member at every variation node, shape (players, nodes)"""
+        players = self.groups[group]
+        base = np.array([getattr(p, attribute, 10) for p in players], dtype=float)
+        values = np.clip(base[:, None] + VARIATION, 1, 20)
+        if skill is not None:
+            factors = [position_factor(self.team.tactic_factors, p.position, skill) for p in players]
+            values *= np.array(factors)[:, None]
+        return values
+
+
+def _contest(attack, defence, offset, scale):
+    """Mean success chance of clip((attack - defence + offset) / scale) over players and variation"""
+    chance = (attack.reshape(-1)[:, None] - defence.reshape(-1)[None, :] + offset) / scale
+    return float(np.clip(chance, 0, 1).mean())
+
+
+class AnalyticMatchModel:
+    """
+    Computes a fixture's full-time score distribution by dynamic programming
+    over the engine's Markov chain. Results have the simulate_many keys, with
+    'matches' set to None (nothing is sampled) and 'mean_stats' holding only
+    'goals' - the model does not track shots, fouls and the other counts.
+    'expected_goals' adds the unrounded mean goals per team.
+    """
+    def __init__(self, config=None, context=None, max_goals=10):
+        if max_goals < 1:
+            raise ValueError("max_goals must be at least 1")
+        self.config = config
+        self.context = context
+        self.max_goals = max_goals
+
+    def score_distribution(self, home_team, away_team):
+        """Exact (within the model) score distribution of home_team v away_team"""
+        scalar = EnhancedMatchEngine(self.config, context=self.context)
+        scalar.apply_tactical_effects(home_team, away_team)
+        scalar.apply_tactical_effects(away_team, home_team)
+        lineups = (_Lineup(home_team), _Lineup(away_team))
+
+        size = self.max_goals + 1
+        state = np.zeros((size, size, ZONES, MAX_INJURY_TIME + 1, len(MOMENTUM_GRID)))
+        state[0, 0, 2, 0, len(MOMENTUM_GRID) // 2] = 1.0
+
+        tables = self._transition_tables(lineups)
+        state = self._half(state, 1, 45, tables)
+        state = self._half(state, 46, 90, tables)
+        scores = self._injury_time(state.sum(axis=4), tables)
+        return self._summarise(scores, home_team.name, away_team.name)
+
+    def _transition_tables(self, lineups):
+        """Per-event probabilities that do not depend on the match state"""
+        home, away = lineups
+        size = self.max_goals + 1
+
+        base_possession = 55.0 if home.tactic == TACTIC_INDEX['P'] else 45.0 if away.tactic == TACTIC_INDEX['P'] else 50.0
+        possession_bias = (base_possession
+                           + (home.team.temp_passing_boost - away.team.temp_passing_boost) * 2
+                           + (home.avg_passing - away.avg_passing) / 4)
+        home_chance = np.clip(possession_bias - MOMENTUM_GRID * 0.5, 30, 70) / 100
+
+        tables = {
+            'side': (home_chance, 1 - home_chance),
+            'forward': np.zeros((2, ZONES)),
+            'goal': np.zeros((2, ZONES)),
+            'save': np.zeros((2, ZONES)),
+            'card': np.zeros((2, ZONES)),
+            'stoppage_goal': np.zeros((2, ZONES)),
+        }
+
+        for side, (team, opponent) in enumerate(((home, away), (away, home))):
+            for z in range(1, ZONES + 1):
+                forward = 0.6 + FORWARD_ADJUSTMENT[team.tactic]
+                if team.tactic == TACTIC_INDEX['C'] and z == 3:
+                    forward += 0.15
+                if (z >= 4) if side == HOME else (z <= 2):
+                    forward -= 0.15
+                forward += (team.midfield_quality - opponent.midfield_quality) * 0.01
+                tables['forward'][side, z - 1] = min(1.0, max(0.0, forward))
+
+            box_goal, box_save = self._goal_attempt(team, opponent, distance=False)
+            far_goal, far_save = self._goal_attempt(team, opponent, distance=True)
+            box_shot = self._shot_chance(team, opponent, in_box=True)
+            far_shot = self._shot_chance(team, opponent, in_box=False)
+
+            # Zones 1/5 are goal attempts, 2/4 attacking play and 3 midfield play
+            tables['goal'][side] = (box_goal, far_shot * far_goal, 0.0, far_shot * far_goal, box_goal)
+            tables['save'][side] = (box_save, far_shot * far_save, 0.0, far_shot * far_save, box_save)
+            tables['card'][side, 2] = self._foul_chance(team, opponent) * FOUL_CARD_CHANCE
+
+            # Injury time is all attacking play, in whatever zone the ball was left
+            tables['stoppage_goal'][side] = (box_shot * box_goal, far_shot * far_goal, far_shot * box_goal,
+                                             far_shot * far_goal, box_shot * box_goal)
+
+        # update_field_position as a [from, to] zone matrix per side
+        tables['zones'] = np.zeros((2, ZONES, ZONES))
+        for side, step in ((HOME, 1), (AWAY, -1)):
+            for z in range(ZONES):
+                forward = tables['forward'][side, z]
+                tables['zones'][side, z, min(ZONES - 1, max(0, z + step))] += forward
+                tables['zones'][side, z, min(ZONES - 1, max(0, z - step))] += 1 - forward
+
+        # update_momentum per score, after an optional jump of some grid points (goal, save, card)
+        differences = np.subtract.outer(np.arange(size), np.arange(size))
+        by_difference = np.stack([_momentum_transitions(d) for d in range(-self.max_goals, self.max_goals + 1)])
+        update = by_difference[differences + self.max_goals]
+        points = np.arange(len(MOMENTUM_GRID))
+        stacked = []
+        for jump in MOMENTUM_JUMPS:
+            moved = np.zeros((len(points), len(points)))
+            moved[points, np.clip(points + jump, 0, len(points) - 1)] = 1.0
+            stacked.append(np.matmul(moved, update))
+        tables['momentum'] = np.concatenate(stacked, axis=2)
+        return tables
+
+    def _goal_attempt(self, team, opponent, distance):
+        """Chances that process_goal_attempt ends in a goal and in a save"""
+        shooting = team.skill(FORWARD, 'shooting', SH)
+        central = np.array([p.position in CENTRAL_POSITIONS for p in team.groups[FORWARD]])
+        on_target = np.clip(0.3 + shooting / 40 + np.where(central, 0.05, 0.0)[:, None], 0, 1)
+
+        goalkeeping = opponent.skill(KEEPER, 'goalkeeper')
+        save = (0.6 + goalkeeping.reshape(-1) / 50)[None, None, :]
+        save = save - np.where(shooting > 15, 0.1, 0.0)[:, :, None] + (0.1 if distance else 0.0)
+        scored = on_target[:, :, None] * np.clip(1 - save, 0, 1)
+        return float(scored.mean()), float(on_target.mean() - scored.mean())
+
+    def _shot_chance(self, team, opponent, in_box):
+        """Chance that process_attacking_play leads to a shot"""
+        weights = np.diff(ATTACKING_PLAY_WEIGHTS[team.tactic, int(in_box)], prepend=0.0)
+        cross = _contest(team.skill(WINGER, 'passing', PS), opponent.skill(DEFENDER, 'tackling', TK), 10, 30)
+        through = float(np.clip((team.skill(MIDFIELDER, 'passing', PS) - 5) / 20, 0, 1).mean())
+        dribble = _contest(team.skill(ANY, 'technique'), opponent.skill(ANY, 'tackling', TK), 10, 30)
+        return (weights[SHOT] + weights[CROSS] * cross * 0.6 +
+                weights[THROUGH_BALL] * through * 0.7 + weights[DRIBBLE] * dribble * 0.4)
+
+    def _foul_chance(self, team, opponent):
+        """Chance that process_midfield_play ends in a foul by the opponent"""
+        weights = np.diff(MIDFIELD_PLAY_WEIGHTS, prepend=0.0)
+        tackle = _contest(opponent.skill(ANY, 'tackling', TK), team.skill(ANY, 'technique'), 10, 30)
+        return weights[3] + weights[2] * (1 - tackle) * 0.3
+
+    def _half(self, state, start_minute, end_minute, tables):
+        """Propagate the state through one half; each step advances 1-3 minutes"""
+        pending = {start_minute: state}
+        for minute in range(start_minute, end_minute):
+            current = pending.pop(minute, None)
+            if current is None:
+                continue
+            after = self._event(current, tables) / 3
+            for increment in (1, 2, 3):
+                arrival = min(minute + increment, end_minute)
+                pending[arrival] = pending[arrival] + after if arrival in pending else after
+        return pending[end_minute]
+
+    def _event(self, state, tables):
+        """One generate_match_event step applied to the whole state"""
+        shape = state.shape
+        # Mass by the momentum jump the event causes; momentum moves 1 grid point per 0.5
+        jumps = {0: 0.0}
+        for side, step in ((HOME, 1), (AWAY, -1)):
+            attacking = np.moveaxis(np.tensordot(state * tables['side'][side], tables['zones'][side], axes=(2, 0)), -1, 2)
+
+            goal = attacking * tables['goal'][side][:, None, None]
+            swing = attacking * (tables['save'][side] + tables['card'][side])[:, None, None]
+            jumps[0] = jumps[0] + attacking - goal - swing
+            jumps[step * 2] = swing
+
+            # A goal adds 0-1 minutes of injury time and swings momentum by 5 towards the conceding team
+            goal = _shift(goal, side, 1)
+            jumps[-step * 10] = 0.5 * (goal + _shift(goal, 3, 1))
+
+        masses = np.concatenate([jumps[jump] for jump in MOMENTUM_JUMPS], axis=4)
+        result = np.matmul(masses.reshape(shape[0], shape[1], -1, masses.shape[4]), tables['momentum']).reshape(shape)
+
+        # process_injury
+        return sum(chance * _shift(result, 3, minutes) for chance, minutes in INJURY_TIME_ADDED)
+
+    def _injury_time(self, state, tables):
+        """Play out injury time for every amount of added time; returns the (home, away) score table"""
+        size = self.max_goals + 1
+        goals = np.arange(size)
+        losing = np.where(goals[:, None] < goals[None, :], 1.0, np.where(goals[:, None] > goals[None, :], 0.0, 0.5))
+        attack_chance = (0.6 * losing, 0.6 * losing.T)
+
+        scores = state[:, :, :, 0].sum(axis=2)
+        for added in range(1, MAX_INJURY_TIME + 1):
+            end_minute = 90 + added
+            pending = {90: state[:, :, :, added]}
+            for minute in range(90, end_minute):
+                current = pending.pop(minute, None)
+                if current is None:
+                    continue
+                after = current.copy()
+                for side in (HOME, AWAY):
+                    goal = current * attack_chance[side][:, :, None] * tables['stoppage_goal'][side]
+                    after += _shift(goal, side, 1) - goal
+                for increment in (1, 2):
+                    arrival = min(minute + increment, end_minute)
+                    pending[arrival] = pending[arrival] + after / 2 if arrival in pending else after / 2
+            scores += pending[end_minute].sum(axis=2)
+        return scores
+
+    def _summarise(self, scores, home_name, away_name):
+        """Score table to the simulate_many keys, see AnalyticMatchModel"""
+        goals = np.arange(len(scores))
+        home_goals = scores.sum(axis=1)
+        away_goals = scores.sum(axis=0)
+        home_mean = float(goals @ home_goals)
+        away_mean = float(goals @ away_goals)
+        return {
+            'home_team': home_name,
+            'away_team': away_name,
+            'matches': None,
+            'home_win': float(np.tril(scores, -1).sum()),
+            'draw': float(np.trace(scores)),
+            'away_win': float(np.triu(scores, 1).sum()),
+            'score_distribution': {
+                (int(home), int(away)): float(scores[home, away])
+                for home, away in zip(*np.nonzero(scores > 1e-12))
+            },
+            'home_goals': {int(g): float(p) for g, p in zip(goals, home_goals) if p > 1e-12},
+            'away_goals': {int(g): float(p) for g, p in zip(goals, away_goals) if p > 1e-12},
+            'mean_stats': {
+                'goals': {'home': round(home_mean, 2), 'away': round(away_mean, 2)}
+            },
+            'expected_goals': {
+                'home': round(home_mean, 4),
+                'away': round(away_mean, 4)
+            }
+        }
@@ -1,4 +1,210 @@
 # esms/engine/commentary.py
+import os
+import random
+import re
+
+# Categories the engine renders, with the placeholders filled by their
+# arguments in argument order. 'shot' leads in outcome lines that do not name
+# the shooter, see esms.engine.events.
+CATEGORY_SLOTS = {
+    'shot': ('{player}',),
+    'goal': ('{player}', '{minute}'),
+    'goal_with_assist': ('{player}', '{assist}', '{minute}'),
+    'save': ('{goalkeeper}', '{player}'),
+    'miss': ('{player}',),
+    'cross': ('{player}', '{target}'),
+    'failed_cross': ('{player}', '{defender}'),
+    'through_ball': ('{player}', '{target}'),
+    'failed_through_ball': ('{player}', '{defender}'),
+    'dribble': ('{player}', '{defender}'),
+    'tackle': ('{defender}', '{player}'),
+    'interception': ('{defender}', '{player}'),
+    'pass': ('{player}', '{target}'),
+    'foul': ('{player}', '{victim}'),
+    'yellow_card': ('{player}', '{victim}'),
+    'red_card': ('{player}', '{victim}')
+}
+
+# Built-in templates, used for any category the language file does not define
+DEFAULT_TEMPLATES = {
+    'shot': ["{player} shoots!"],
+    'goal': ["GOAL! {player} scores!"],
+    'goal_with_assist': ["GOAL! {player} scores after a brilliant assist from {assist}!"],
+    'save': ["Save by {goalkeeper}!"],
+    'miss': ["{player} shoots wide!"],
+    'foul': ["Foul by {player}!"],
+    'yellow_card': ["Yellow card for {player}!"],
+    'red_card': ["Red card! {player} is sent off!"],
+    'cross': ["{player} crosses for {target}"],
+    'failed_cross': ["{player}'s cross is cleared by {defender}"],
+    'through_ball': ["{player} slides a through ball to {target}"],
+    'failed_through_ball': ["{player}'s through ball is cut out by {defender}"],
+    'dribble': ["{player} dribbles past {defender}"],
+    'tackle': ["{defender} tackles {player}"],
+    'interception': ["{defender} intercepts {player}'s pass"],
+    'pass': ["{player} finds {target}"]
+}
+
+# Named placeholders, positional %s slots and literal percent signs
+_PLACEHOLDER = re.compile(r'\{\w+\}|%s|%')
+
+# language.dat entry: [CATEGORY] {text}
+_LANGUAGE_LINE = re.compile(r'^\[(\w+)\]\s*\{(.*)\}\s*$')
+
+# Text-report layout at the start of a language.dat text: new lines, indentation and '...'
+_LAYOUT = re.compile(r'^\s*(?:\.\.\.\s*)?')
+
+
+class CompiledTemplate:
+    """
+    A commentary template compiled once into a %-format string plus the
+    argument index of each slot. Named placeholders ({player}) take the
+    category's argument at that name's position in CATEGORY_SLOTS, while
+    language.dat's %s slots take the arguments in order.
+    """
+    __slots__ = ('text', 'format', 'order', 'in_order')
+    
+    def __init__(self, text, slots=()):
+        self.text = text
+        order = []
+        positional = 0
+        parts = []
+        last = 0
+        for match in _PLACEHOLDER.finditer(text):
+            parts.append(text[last:match.start()].replace('%', '%%'))
+            token = match.group()
+            if token == '%s':
+                order.append(positional)
+                positional += 1
+                parts.append('%s')
+            elif token == '%':
+                parts.append('%%')
+            elif token in slots:
+                order.append(slots.index(token))
+                parts.append('%s')
+            else:
+                parts.append(token)  # Unknown placeholders are left as they are
+            last = match.end()
+        parts.append(text[last:].replace('%', '%%'))
+        self.format = ''.join(parts)
+        self.order = tuple(order)
+        self.in_order = self.order == tuple(range(len(order)))
+    
+    def render(self, args):
+        """Fill the slots from the category's arguments (missing ones are left empty)"""
+        count = len(args)
+        if self.in_order and count == len(self.order):
+            return self.format % tuple(args)
+        return self.format % tuple(args[i] if i < count else '' for i in self.order)
+    
+    def __repr__(self):
+        return f"<CompiledTemplate {self.text!r}>"
+
+
+def read_language_file(language_file):
+    """
+    Read a language.dat file into {category: [texts]}. Each entry is
+    [CATEGORY] {text} with %s argument slots and \\n escapes for new lines;
+    lines starting with | are comments. Categories are returned in lower
+    case, and a category found in the file replaces the built-in templates.
+    Categories the engine does not render (language.dat's [CHANCE] and
+    [COMM_*] report lines) are skipped.
+    
+    The texts are laid out for ESMS's text reports, so the leading new
+    lines, indentation and '...' are dropped. Texts that leave out the
+    player of a category whose built-in templates name them (a bare
+    [GOAL] {GOAL !!}) are skipped too, and if none are left the built-in
+    templates stay.
+    """
+    loaded = {}
+    with open(language_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('|'):
+                continue
+                
+            match = _LANGUAGE_LINE.match(line)
+            if not match:
+                raise ValueError(f"{language_file}:{line_number}: expected '[CATEGORY] {{text}}'")
+                
+            category = match.group(1).lower()
+            if category not in CATEGORY_SLOTS:
+                continue
+            text = _LAYOUT.sub('', match.group(2).replace('\\n', '\n')).rstrip()
+            if names_player(category, DEFAULT_TEMPLATES.get(category, ())) and not names_player(category, [text]):
+                continue
+            loaded.setdefault(category, []).append(text)
+    return loaded
+
+
+def names_player(category, texts):
+    """Whether every one of the texts (at least one) fills the category's {player} slot"""
+    slots = CATEGORY_SLOTS.get(category, ())
+    if not texts or '{player}' not in slots:
+        return False
+    player = slots.index('{player}')
+    return all(player in CompiledTemplate(text, slots).order for text in texts)
+
+
+def compile_templates(texts):
+    """Compile {category: [texts]} into {category: (CompiledTemplate, ...)}"""
+    return {
+        category: tuple(CompiledTemplate(text, CATEGORY_SLOTS.get(category, ())) for text in category_texts)
+        for category, category_texts in texts.items()
+    }
+
+
+class CommentarySet:
+    """
+    Read-only set of compiled templates with the same pick_template, render
+    and describe calls as CommentaryManager. Safe to share between matches
+    and threads since nothing in it can change.
+    """
+    __slots__ = ('_templates',)
+    
+    def __init__(self, templates):
+        object.__setattr__(self, '_templates', {category: tuple(items) for category, items in templates.items()})
+    
+    @classmethod
+    def from_texts(cls, texts):
+        """Build from uncompiled {category: [texts]}"""
+        return cls(compile_templates(texts))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("CommentarySet is read-only")
+    
+    def __reduce__(self):
+        return (CommentarySet, (self._templates,))
+    
+    def categories(self):
+        """Names of all categories that have templates"""
+        return [category for category, templates in self._templates.items() if templates]
+    
+    def pick_template(self, category, context=None, rng=None):
+        """Choose the index of a random template in a category, None if there are none"""
+        templates = self._templates.get(category)
+        if not templates:
+            return None
+        return (rng or random).randrange(len(templates))
+    
+    def names_player(self, category, index):
+        """Whether a picked template fills the category's {player} slot"""
+        slots = CATEGORY_SLOTS.get(category, ())
+        templates = self._templates.get(category)
+        return bool(templates) and '{player}' in slots and slots.index('{player}') in templates[index].order
+    
+    def render(self, category, index, *args):
+        """Fill a previously picked template with the category's arguments in order"""
+        templates = self._templates.get(category)
+        if index is None or not templates:
+            return f"[{category}]"
+        return templates[index].render(args)
+    
+    def describe(self, category, *args, rng=None):
+        """Pick and render a template in one step"""
+        return self.render(category, self.pick_template(category, rng=rng), *args)
+
+
 class CommentaryManager:
     _instance = None
     
@@ -13,14 +219,9 @@ class CommentaryManager:
         if self.initialized:
             return
             
-        self.templates = {
-            'goal': ["GOAL! {player} scores!"],
-            'save': ["Save by {goalkeeper}!"],
-            'miss': ["{player} shoots wide!"],
-            'foul': ["Foul by {player}!"],
-            'yellow_card': ["Yellow card for {player}!"],
-            'red_card': ["Red card! {player} is sent off!"]
-        }
+        self.templates = {}
+        for category, texts in DEFAULT_TEMPLATES.items():
+            self.add_templates(category, texts)
         
         # Load from file if it exists
         if os.path.exists(language_file):
@@ -28,12 +229,29 @@ class CommentaryManager:
         
         self.initialized = True
     
+    def add_templates(self, category, texts, replace=True):
+        """Compile templates into a category, replacing what it had unless replace is False"""
+        slots = CATEGORY_SLOTS.get(category, ())
+        compiled = [CompiledTemplate(text, slots) for text in texts]
+        if replace or category not in self.templates:
+            self.templates[category] = compiled
+        else:
+            self.templates[category].extend(compiled)
+    
     def load_templates(self, language_file):
-        """Load commentary templates from file"""
-        # This is a placeholder - you'll implement the actual loading logic later
-        print(f"Would load commentary from {language_file}")
+        """Load commentary templates from a language.dat file, see read_language_file"""
+        for category, texts in read_language_file(language_file).items():
+            self.add_templates(category, texts)
     
-    def get_template(self, category, context=None):
+    def snapshot(self):
+        """Read-only copy of the current templates, see CommentarySet"""
+        return CommentarySet(self.templates if self.initialized else {})
+    
+    def categories(self):
+        """Names of all categories that have templates"""
+        return [category for category, templates in self.templates.items() if templates]
+    
+    def get_template(self, category, context=None, rng=None):
         """Get a random template from the specified category, with optional context"""
         if not self.initialized:
             return f"Commentary not initialized."
@@ -41,32 +259,93 @@ class CommentaryManager:
         if category not in self.templates or not self.templates[category]:
             return f"[{category}]"  # Default if no templates available
             
-        import random
-        return random.choice(self.templates[category])
+        return (rng or random).choice(self.templates[category]).text
+    
+    def pick_template(self, category, context=None, rng=None):
+        """Choose the index of a random template in a category, None if there are none"""
+        if not self.initialized or not self.templates.get(category):
+            return None
+            
+        return (rng or random).randrange(len(self.templates[category]))
+    
+    def render(self, category, index, *args):
+        """Fill a previously picked template with the category's arguments in order"""
+        if not self.initialized:
+            return f"Commentary not initialized."
+            
+        templates = self.templates.get(category)
+        if index is None or not templates:
+            return f"[{category}]"
+            
+        return templates[index].render(args)
+    
+    def describe(self, category, *args, rng=None):
+        """Pick and render a template in one step"""
+        return self.render(category, self.pick_template(category, rng=rng), *args)
     
-    def get_goal(self, scorer, minute, home_score, away_score):
+    def get_shot(self, shooter, rng=None):
+        """Get shot commentary"""
+        return self.describe('shot', shooter, rng=rng)
+    
+    def get_goal(self, scorer, minute, home_score, away_score, rng=None):
         """Get goal commentary"""
-        template = self.get_template('goal')
-        return template.replace('{player}', scorer).replace('{minute}', str(minute))
+        return self.describe('goal', scorer, str(minute), rng=rng)
     
-    def get_goal_with_assist(self, scorer, assister, minute, home_score, away_score):
+    def get_goal_with_assist(self, scorer, assister, minute, home_score, away_score, rng=None):
         """Get goal with assist commentary"""
-        return f"GOAL! {scorer} scores after a brilliant assist from {assister}!"
+        return self.describe('goal_with_assist', scorer, assister, str(minute), rng=rng)
     
-    def get_save(self, goalkeeper, shooter):
+    def get_save(self, goalkeeper, shooter, rng=None):
         """Get save commentary"""
-        template = self.get_template('save')
-        return template.replace('{goalkeeper}', goalkeeper).replace('{player}', shooter)
+        return self.describe('save', goalkeeper, shooter, rng=rng)
     
-    def get_miss(self, shooter):
+    def get_miss(self, shooter, rng=None):
         """Get miss commentary"""
-        template = self.get_template('miss')
-        return template.replace('{player}', shooter)
+        return self.describe('miss', shooter, rng=rng)
     
-    # Add more commentary methods as needed
-
-# Add missing import
-import os
+    def get_cross(self, crosser, target, rng=None):
+        """Get cross commentary"""
+        return self.describe('cross', crosser, target, rng=rng)
+    
+    def get_failed_cross(self, crosser, defender, rng=None):
+        """Get failed cross commentary"""
+        return self.describe('failed_cross', crosser, defender, rng=rng)
+    
+    def get_through_ball(self, passer, receiver, rng=None):
+        """Get through ball commentary"""
+        return self.describe('through_ball', passer, receiver, rng=rng)
+    
+    def get_failed_through_ball(self, passer, defender, rng=None):
+        """Get failed through ball commentary"""
+        return self.describe('failed_through_ball', passer, defender, rng=rng)
+    
+    def get_dribble(self, dribbler, defender, rng=None):
+        """Get dribble commentary"""
+        return self.describe('dribble', dribbler, defender, rng=rng)
+    
+    def get_tackle(self, defender, attacker, rng=None):
+        """Get tackle commentary"""
+        return self.describe('tackle', defender, attacker, rng=rng)
+    
+    def get_interception(self, defender, passer, rng=None):
+        """Get interception commentary"""
+        return self.describe('interception', defender, passer, rng=rng)
+    
+    def get_pass(self, passer, receiver, rng=None):
+        """Get pass commentary"""
+        return self.describe('pass', passer, receiver, rng=rng)
+    
+    def get_foul(self, fouler, fouled, rng=None):
+        """Get foul commentary"""
+        return self.describe('foul', fouler, fouled, rng=rng)
+    
+    def get_yellow_card(self, carded, fouled, rng=None):
+        """Get yellow card commentary"""
+        return self.describe('yellow_card', carded, fouled, rng=rng)
+    
+    def get_red_card(self, carded, fouled, rng=None):
+        """Get red card commentary"""
+        return self.describe('red_card', carded, fouled, rng=rng)
 
 # Singleton accessor
 def commentary_manager():
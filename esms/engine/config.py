@@ -13,7 +13,8 @@ class Config:
             'SUSPENSION_MARGIN': 10,
             'MAX_INJURY_LENGTH': 5,
             'UPDTR_FITNESS_GAIN': 10,
-            'UPDTR_FITNESS_AFTER_INJURY': 80
+            'UPDTR_FITNESS_AFTER_INJURY': 80,
+            'TACTIC_INFLUENCE': 0.25  # How far tactics.dat multipliers move skills (0 = off, 1 = full)
         }
         
         # Override defaults with any provided kwargs
@@ -0,0 +1,99 @@
+# esms/engine/context.py
+"""
+Per-match engine context.
+
+Everything a match reads apart from the teams (config, tactics table,
+commentary templates and the random generator) lives in one read-only
+MatchContext, so the engine does not touch process-wide singletons while a
+match runs. The shared parts are built once. Each match gets a copy of the
+context with its own RNG, which means matches can run in threads or worker
+processes without locks or cross-talk.
+"""
+import hashlib
+import os
+import pickle
+
+from esms.engine.config import Config
+from esms.engine.rng import make_rng
+from esms.engine.tactics import tact_manager, read_tactics_file, TacticsTable
+from esms.engine.commentary import commentary_manager, read_language_file, CommentarySet, DEFAULT_TEMPLATES
+
+
+class MatchContext:
+    """Frozen bundle of config, tactics table, commentary set and RNG for one match"""
+    __slots__ = ('config', 'tactics', 'commentary', 'rng', '_data_digest')
+
+    def __init__(self, config, tactics, commentary, rng=None, data_digest=None):
+        object.__setattr__(self, 'config', config)
+        object.__setattr__(self, 'tactics', tactics)
+        object.__setattr__(self, 'commentary', commentary)
+        object.__setattr__(self, 'rng', rng)
+        object.__setattr__(self, '_data_digest', data_digest)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MatchContext is read-only")
+
+    def __reduce__(self):
+        return (MatchContext, (self.config, self.tactics, self.commentary, self.rng, self._data_digest))
+
+    def with_rng(self, seed=None, rng=None):
+        """Copy of this context with its own random generator"""
+        return MatchContext(self.config, self.tactics, self.commentary, rng or make_rng(seed), self._data_digest)
+
+    def with_config(self, config):
+        """Copy of this context with a different engine config"""
+        return MatchContext(config, self.tactics, self.commentary, self.rng, self._data_digest)
+
+    def data_digest(self):
+        """sha256 of the tactics table and commentary templates, worked out on first use and kept"""
+        if self._data_digest is None:
+            digest = hashlib.sha256(pickle.dumps(
+                (self.tactics.codes, self.tactics.values.tobytes(), self.commentary))).hexdigest()
+            object.__setattr__(self, '_data_digest', digest)
+        return self._data_digest
+
+    @classmethod
+    def load(cls, config=None, tactics_file='tactics.dat', language_file='language.dat', seed=None):
+        """Build a context straight from data files, without the singleton managers"""
+        table = None
+        if os.path.exists(tactics_file):
+            table = read_tactics_file(tactics_file)[2]
+
+        texts = dict(DEFAULT_TEMPLATES)
+        if os.path.exists(language_file):
+            texts.update(read_language_file(language_file))
+
+        return cls(
+            config or Config(),
+            table or TacticsTable(['N']),
+            CommentarySet.from_texts(texts),
+            make_rng(seed)
+        )
+
+
+_shared_context = None
+
+
+def shared_context():
+    """
+    Context built once from the initialized tactics and commentary managers.
+    It has no RNG of its own; use with_rng() to get one per match. Before
+    init_engine() the managers are empty, so the context is read straight
+    from the data files instead (see MatchContext.load).
+    """
+    global _shared_context
+    if _shared_context is None:
+        tactics, commentary = tact_manager(), commentary_manager()
+        if tactics.initialized and commentary.initialized:
+            _shared_context = MatchContext(Config(), tactics.get_table(), commentary.snapshot())
+        else:
+            print("Warning: match engine used before init_engine(), reading tactics.dat and language.dat directly")
+            loaded = MatchContext.load()
+            _shared_context = MatchContext(loaded.config, loaded.tactics, loaded.commentary)
+    return _shared_context
+
+
+def reset_shared_context():
+    """Rebuild the shared context on next use, after the managers have been (re)loaded"""
+    global _shared_context
+    _shared_context = None
@@ -0,0 +1,57 @@
+# esms/engine/estimates.py
+"""Confidence intervals for outcome probabilities estimated from simulated matches"""
+from statistics import NormalDist
+
+
+def z_score(confidence):
+    """Two-sided standard normal quantile for a confidence level such as 0.95"""
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def wilson_interval(successes, n, confidence=0.95):
+    """
+    Wilson score interval (low, high) for a proportion. Unlike the normal
+    approximation it stays inside [0, 1] and behaves for rare outcomes.
+    """
+    if n < 1:
+        raise ValueError("wilson_interval needs at least one trial")
+    z = z_score(confidence)
+    p = successes / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    half_width = z / denominator * (p * (1 - p) / n + z * z / (4 * n * n)) ** 0.5
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def paired_difference(baseline, variant, confidence=0.95):
+    """
+    Mean difference variant - baseline of paired per-run values, with its
+    standard error and a normal-approximation interval. variance_ratio is
+    how much smaller the paired variance is than for independent runs
+    (None when the paired runs never differ).
+    """
+    n = len(baseline)
+    if n != len(variant):
+        raise ValueError("paired_difference needs the same number of baseline and variant runs")
+    if n < 2:
+        raise ValueError("paired_difference needs at least two runs")
+
+    def mean_and_variance(values):
+        mean = sum(values) / n
+        return mean, sum((value - mean) ** 2 for value in values) / (n - 1)
+
+    baseline_mean, baseline_variance = mean_and_variance(baseline)
+    variant_mean, variant_variance = mean_and_variance(variant)
+    difference, variance = mean_and_variance([v - b for b, v in zip(baseline, variant)])
+    std_error = (variance / n) ** 0.5
+    z = z_score(confidence)
+    return {
+        'baseline': baseline_mean,
+        'variant': variant_mean,
+        'difference': difference,
+        'std_error': std_error,
+        'interval': (difference - z * std_error, difference + z * std_error),
+        'variance_ratio': (baseline_variance + variant_variance) / variance if variance else None
+    }
@@ -0,0 +1,189 @@
+# esms/engine/events.py
+"""
+Compact match event log.
+
+The engine records each event as a small tuple:
+(minute, code, team, player, other, template, value)
+where team is 0 (home) / 1 (away), player and other are indexes into the
+log's player names, template is the commentary template index picked at the
+time, and value holds extra data (score, injury minutes, free text).
+Descriptions are rendered only when an event's text is actually read.
+
+A shot outcome whose commentary line does not name the shooter (language.dat's
+'Saved by %s') stores (shot template, outcome template) instead, and is
+rendered as a shot line followed by the outcome.
+"""
+from esms.engine.commentary import CATEGORY_SLOTS
+from esms.engine.context import shared_context
+
+# Event codes: (event type, commentary category or None for fixed text). Codes
+# are kept in snapshots, so new kinds go at the end; removing or reordering
+# kinds needs a new SNAPSHOT_VERSION in match_engine.
+EVENT_KINDS = (
+    ('kickoff', None),
+    ('halftime', None),
+    ('injury_time', None),
+    ('fulltime', None),
+    ('goal', 'goal'),
+    ('goal', 'goal_with_assist'),
+    ('save', 'save'),
+    ('miss', 'miss'),
+    ('corner', None),
+    ('cross', 'cross'),
+    ('cross', 'failed_cross'),
+    ('through_ball', 'through_ball'),
+    ('through_ball', 'failed_through_ball'),
+    ('dribble', 'dribble'),
+    ('tackle', 'tackle'),
+    ('pass', 'pass'),
+    ('interception', 'interception'),
+    ('foul', 'foul'),
+    ('yellow_card', 'yellow_card'),
+    ('red_card', 'red_card'),
+    ('injury', None),
+    ('injury', None),
+    ('injury', None),
+    ('substitution', None),
+    (None, None),  # Free text added through add_event, value is (type, description)
+)
+
+(KICKOFF, HALFTIME, INJURY_TIME, FULLTIME, GOAL, GOAL_WITH_ASSIST, SAVE, MISS, CORNER,
+ CROSS, FAILED_CROSS, THROUGH_BALL, FAILED_THROUGH_BALL, DRIBBLE, TACKLE, PASS,
+ INTERCEPTION, FOUL, YELLOW_CARD, RED_CARD, INJURY_MINOR, INJURY_MODERATE, INJURY_SEVERE,
+ SUBSTITUTION, TEXT) = range(len(EVENT_KINDS))
+
+# Outcomes of a shot, whose category's {player} is the shooter
+SHOT_OUTCOMES = (GOAL, GOAL_WITH_ASSIST, SAVE, MISS)
+
+# Descriptions of events that do not come from commentary templates
+FIXED_TEXT = {
+    KICKOFF: "Match begins!",
+    HALFTIME: "Half time score: {home} {home_score} - {away_score} {away}",
+    INJURY_TIME: "+{value} minutes of injury time",
+    FULLTIME: "Full time: {home} {home_score} - {away_score} {away}",
+    CORNER: "Corner kick for {team}",
+    INJURY_MINOR: "{player} is down with a knock but seems able to continue",
+    INJURY_MODERATE: "{player} has picked up an injury and needs treatment",
+    INJURY_SEVERE: "{player} has a serious injury and cannot continue",
+    SUBSTITUTION: "{player} comes on for {other}",
+}
+
+# Commentary categories whose templates also take the minute
+MINUTE_CATEGORIES = ('goal', 'goal_with_assist')
+
+
+class EventLog:
+    """
+    List-like log of recorded events. Indexing or iterating yields Event
+    views whose description is rendered on demand.
+    """
+    def __init__(self, player_names, team_names, commentary=None):
+        self.records = []
+        self.player_names = player_names
+        self.team_names = team_names
+        self.commentary = commentary
+
+    def __getstate__(self):
+        # Commentary is shared by every match, use this process's copy after unpickling
+        state = self.__dict__.copy()
+        state['commentary'] = None
+        return state
+
+    def append(self, record):
+        self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Event(self, record) for record in self.records[index]]
+        return Event(self, self.records[index])
+
+    def __iter__(self):
+        for record in self.records:
+            yield Event(self, record)
+
+    def to_dicts(self):
+        """Render every event into a plain dict"""
+        return [event.to_dict() for event in self]
+
+    def describe(self, record):
+        """Render the text of one event record"""
+        minute, code, team, player, other, template, value = record
+        if code == TEXT:
+            return value[1]
+
+        category = EVENT_KINDS[code][1]
+        if category:
+            args = [self.player_names[player]]
+            if other is not None:
+                args.append(self.player_names[other])
+            if category in MINUTE_CATEGORIES:
+                args.append(str(minute))
+            commentary = self.commentary or shared_context().commentary
+            if isinstance(template, tuple):
+                shot, template = template
+                shooter = args[CATEGORY_SLOTS[category].index('{player}')]
+                return f"{commentary.render('shot', shot, shooter)} {commentary.render(category, template, *args)}"
+            return commentary.render(category, template, *args)
+
+        home, away = self.team_names
+        home_score, away_score = value if isinstance(value, tuple) else (None, None)
+        return FIXED_TEXT[code].format(
+            home=home,
+            away=away,
+            home_score=home_score,
+            away_score=away_score,
+            value=value,
+            team=None if team is None else self.team_names[team],
+            player=None if player is None else self.player_names[player],
+            other=None if other is None else self.player_names[other]
+        )
+
+
+class Event:
+    """Read-only view of one recorded event, usable like the old event dicts"""
+    __slots__ = ('log', 'record')
+
+    KEYS = ('minute', 'type', 'description')
+
+    def __init__(self, log, record):
+        self.log = log
+        self.record = record
+
+    @property
+    def minute(self):
+        return self.record[0]
+
+    @property
+    def type(self):
+        if self.record[1] == TEXT:
+            return self.record[6][0]
+        return EVENT_KINDS[self.record[1]][0]
+
+    @property
+    def team(self):
+        team = self.record[2]
+        return None if team is None else self.log.team_names[team]
+
+    @property
+    def description(self):
+        return self.log.describe(self.record)
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def to_dict(self):
+        return {'minute': self.minute, 'type': self.type, 'description': self.description}
+
+    def __repr__(self):
+        return f"<Event {self.minute}' {self.type}>"
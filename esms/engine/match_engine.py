@@ -1,8 +1,40 @@
 # esms/engine/match_engine.py
-import random
 from datetime import timedelta
-from esms.engine.tactics import tact_manager
-from esms.engine.commentary import commentary_manager
+from esms.engine.tactics import position_factor, TACTIC_SKILLS, TK, PS, SH
+from esms.engine.context import shared_context
+from esms.engine.ratings import TeamRatings
+from esms.engine.positions import PositionIndex
+from esms.engine import events as ev
+from esms.engine.events import EventLog
+from esms.engine.estimates import wilson_interval, paired_difference, z_score
+from esms.engine.rng import make_rng, match_seed
+from esms.engine.profiling import PhaseProfile
+
+# Bump whenever a change alters simulated results; cached results are keyed on it
+ENGINE_VERSION = '2.0'
+
+# Team boost per unit of average tactic factor above 1.0
+TACTIC_BOOST_SCALE = 10
+
+# Decision points with their own random stream (self.rng_<name>), see use_streams
+RNG_STREAMS = ('tempo', 'possession', 'field', 'play', 'players', 'outcome',
+               'discipline', 'injury', 'substitution', 'momentum', 'commentary')
+
+# Match outcomes reported by simulate_many, in tally order
+OUTCOMES = ('home_win', 'draw', 'away_win')
+
+# Per-run values compared by compare()
+COMPARE_METRICS = OUTCOMES + ('home_goals', 'away_goals')
+
+# Parts of a match in the order run_full_match plays them
+MATCH_PHASES = ('kickoff', 'first_half', 'second_half', 'injury_time', 'full_time')
+
+# Version of the snapshot() format
+SNAPSHOT_VERSION = 2
+
+# Team statistics iter_match reports as they change
+STREAM_STATS = ('possession', 'shots', 'shots_on_target', 'fouls', 'corners', 'offsides')
+
 
 class EnhancedMatchEngine:
     """
@@ -13,19 +45,37 @@ class EnhancedMatchEngine:
     - Better tactical influences
     - Contextual commentary
     """
-    def __init__(self, config):
-        self.config = config
+    def __init__(self, config=None, seed=None, rng=None, context=None, profile=False):
+        # Tactics, commentary, config and RNG all come from a read-only MatchContext
+        if context is None:
+            context = shared_context()
+        if config is not None:
+            context = context.with_config(config)
+        if context.rng is None or seed is not None or rng is not None:
+            context = context.with_rng(seed, rng)
+        self.context = context
+        self.config = context.config
+        self.rng = context.rng  # Every random decision in a match comes from here
+        self.use_streams()
+        self.tactics = context.tactics
+        self.commentary = context.commentary
         self.home_team = None
         self.away_team = None
         self.home_subs = []  # Available substitutes
         self.away_subs = []
         self.home_subs_used = 0
         self.away_subs_used = 0
-        self.max_subs = config.get('SUBSTITUTIONS', 3)
+        self.home_ratings = None  # Cached aggregate ratings, see TeamRatings
+        self.away_ratings = None
+        self.home_positions = None  # Position-group indexes, see PositionIndex
+        self.away_positions = None
+        self.max_subs = self.config.get('SUBSTITUTIONS', 3)
         self.current_minute = 0
         self.home_score = 0
         self.away_score = 0
-        self.match_events = []
+        self.match_events = EventLog([], ('', ''))
+        self.event_players = {}  # Player -> index into the event log's player names
+        self.record_events = True  # False for batch runs that only need scores and stats
         
         # Match statistics
         self.home_possession = 50
@@ -47,6 +97,47 @@ class EnhancedMatchEngine:
         self.momentum = 0  # -10 to +10 scale (negative=home momentum, positive=away)
         self.injury_time = 0  # Injury time in minutes
         self.is_injury_time = False
+        self.phase = 'kickoff'  # Next part of run_full_match to play, see MATCH_PHASES
+
+        self.profile = None  # PhaseProfile while profiling is enabled
+        if profile:
+            self.enable_profiling()
+
+    def enable_profiling(self):
+        """Time every phase in esms.engine.profiling.PHASES; see self.profile.report()"""
+        if self.profile is None:
+            self.profile = PhaseProfile()
+            self.profile.attach(self)
+        return self.profile
+
+    def disable_profiling(self):
+        """Stop timing and return the last profile"""
+        profile = self.profile
+        if profile is not None:
+            profile.detach(self)
+            self.profile = None
+        return profile
+
+    def use_streams(self, seed=None):
+        """
+        Give every decision point in RNG_STREAMS its own generator derived
+        from seed, or share self.rng between all of them when seed is None
+        (the default). With a seed, each stream is also re-seeded from the
+        event step number before every event, so two runs with the same seed
+        see the same random numbers at the same step even after a changed
+        tactic or lineup has sent them down different paths. compare()
+        relies on this.
+        """
+        self.stream_seeds = None if seed is None else {name: match_seed(name, seed) for name in RNG_STREAMS}
+        for name in RNG_STREAMS:
+            setattr(self, 'rng_' + name, self.rng if seed is None else make_rng(self.stream_seeds[name]))
+        self.event_step = 0
+
+    def _sync_streams(self):
+        """Re-seed every decision stream for the next event step"""
+        self.event_step += 1
+        for name, stream_seed in self.stream_seeds.items():
+            getattr(self, 'rng_' + name).seed(stream_seed + self.event_step)
 
     def setup_match(self, home_team, away_team, home_subs=None, away_subs=None):
         """Set up the match with teams and substitutes"""
@@ -56,11 +147,23 @@ class EnhancedMatchEngine:
         self.away_subs = away_subs or []
         self.home_subs_used = 0
         self.away_subs_used = 0
+        self.event_step = 0
+        self.home_ratings = TeamRatings(home_team, self.rng_possession)
+        self.away_ratings = TeamRatings(away_team, self.rng_possession)
         
         # Reset player stats
-        for player in self.home_team.players + self.away_team.players + self.home_subs + self.away_subs:
+        squad = self.home_team.players + self.away_team.players + self.home_subs + self.away_subs
+        for player in squad:
             player.reset_match_stats()
             
+        # Events refer to players by index, names are only looked up when rendering
+        self.event_players = {player: index for index, player in enumerate(squad)}
+        self.match_events = EventLog(
+            [player.name for player in squad], (home_team.name, away_team.name), self.commentary)
+            
+        self.home_positions = PositionIndex(home_team, self.rng_players)
+        self.away_positions = PositionIndex(away_team, self.rng_players)
+            
         # Apply tactical effects
         self.apply_tactical_effects(self.home_team, self.away_team)
         self.apply_tactical_effects(self.away_team, self.home_team)
@@ -69,12 +172,24 @@ class EnhancedMatchEngine:
         self.home_score = 0
         self.away_score = 0
         self.current_minute = 0
-        self.match_events = []
-        self.last_team_with_ball = self.home_team if random.random() < 0.5 else self.away_team
+        self.home_possession = 50
+        self.away_possession = 50
+        self.home_shots = 0
+        self.away_shots = 0
+        self.home_shots_on_target = 0
+        self.away_shots_on_target = 0
+        self.home_fouls = 0
+        self.away_fouls = 0
+        self.home_corners = 0
+        self.away_corners = 0
+        self.home_offsides = 0
+        self.away_offsides = 0
+        self.last_team_with_ball = self.home_team if self.rng_possession.random() < 0.5 else self.away_team
         self.current_zone = 3
         self.momentum = 0
         self.injury_time = 0
         self.is_injury_time = False
+        self.phase = 'kickoff'
         
         # Initialize player positions based on formation
         self._initialize_player_positions(home_team)
@@ -124,71 +239,30 @@ class EnhancedMatchEngine:
                 player.field_y = 0.5
 
     def apply_tactical_effects(self, team, opponent):
-        """Apply tactical effects to team attributes"""
-        tactic = team.tactic
-        
-        # Default values if tactic not found
-        team.temp_attacking_boost = 0
-        team.temp_defensive_boost = 0
-        team.temp_passing_boost = 0
-        team.temp_counter_boost = 0
-        team.temp_pressing_boost = 0
-        team.temp_attacking_penalty = 0
-        team.temp_defensive_penalty = 0
-        team.temp_stamina_drain = 1.0  # Multiplier for stamina drain
-        
-        # Get tactic effects from the tactics manager
-        tactic_effects = tact_manager().get_tactic_effects(tactic)
-        
-        if tactic_effects:
-            # Apply effects based on tactic
-            if tactic == 'A':  # Attacking
-                team.temp_attacking_boost = tactic_effects.get('attacking_boost', 2)
-                team.temp_defensive_penalty = tactic_effects.get('defensive_penalty', 1)
-                team.temp_stamina_drain = 1.1  # 10% more stamina drain
-            elif tactic == 'D':  # Defensive
-                team.temp_defensive_boost = tactic_effects.get('defensive_boost', 2)
-                team.temp_attacking_penalty = tactic_effects.get('attacking_penalty', 1)
-                team.temp_stamina_drain = 0.9  # 10% less stamina drain
-            elif tactic == 'P':  # Possession
-                team.temp_passing_boost = tactic_effects.get('passing_boost', 2)
-                team.temp_stamina_drain = 1.0  # Normal stamina drain
-            elif tactic == 'C':  # Counter
-                team.temp_counter_boost = tactic_effects.get('counter_boost', 2)
-                team.temp_stamina_drain = 0.95  # 5% less stamina drain
-            
-            # Consider counter-tactic relationships
-            counter_bonus = 0
-            if (tactic == 'P' and opponent.tactic == 'A'):  # Possession against Attacking
-                counter_bonus = tactic_effects.get('counter_bonus', 1)
-            elif (tactic == 'C' and opponent.tactic == 'P'):  # Counter against Possession
-                counter_bonus = tactic_effects.get('counter_bonus', 2)
-            elif (tactic == 'D' and opponent.tactic == 'A'):  # Defensive against Attacking
-                counter_bonus = tactic_effects.get('counter_bonus', 1.5)
-                
-            team.temp_counter_boost += counter_bonus
+        """
+        Apply tactical effects from the tactics table. team.tactic_factors holds
+        the matchup's multipliers relative to Normal v Normal (see
+        TacticsTable.relative), indexed by position group and skill; tackles,
+        passes and shots read them through tactical_attribute. Midfield
+        quality also gets temp_passing_boost, which follows the average
+        passing factor.
+        """
+        factors = self.tactics.relative(team.tactic, opponent.tactic, weight=self.config.get('TACTIC_INFLUENCE', 0.25))
+        team.tactic_factors = factors
+        
+        skills = len(TACTIC_SKILLS)
+        groups = len(factors) // skills
+        team.temp_passing_boost = TACTIC_BOOST_SCALE * (sum(factors[PS::skills]) / groups - 1)
+
+    def tactical_attribute(self, player, team, attribute, skill):
+        """Effective attribute scaled by the team's tactic factor for the player's position"""
+        value = player.get_effective_attribute(attribute, self.current_minute, self.rng_players)
+        return value * position_factor(team.tactic_factors, player.position, skill)
 
     def run_full_match(self):
         """Run a complete match simulation"""
-        self.add_event(0, "kickoff", "Match begins!")
-        
-        # Simulate first half
-        self.simulate_half(1, 1, 45)
-        
-        # Half time
-        self.add_event(45, "halftime", f"Half time score: {self.home_team.name} {self.home_score} - {self.away_score} {self.away_team.name}")
-        
-        # Simulate second half
-        self.simulate_half(2, 46, 90)
-        
-        # Injury time
-        if self.injury_time > 0:
-            self.add_event(90, "injury_time", f"+{self.injury_time} minutes of injury time")
-            self.is_injury_time = True
-            self.simulate_injury_time(self.injury_time)
-        
-        # Final whistle
-        self.add_event(90 + self.injury_time, "fulltime", f"Full time: {self.home_team.name} {self.home_score} - {self.away_score} {self.away_team.name}")
+        for _ in self._match_steps():
+            pass
         
         # Generate match stats
         match_stats = self.generate_match_stats()
@@ -204,13 +278,433 @@ class EnhancedMatchEngine:
             'away_subs_used': self.away_subs_used
         }
 
+    def _match_steps(self):
+        """
+        Play the match from the current phase to the end, yielding after
+        kickoff, each event step and each break. self.phase is kept up to date
+        so a snapshot taken between steps resumes at the right point.
+        """
+        if self.phase == 'kickoff':
+            self.record_event(ev.KICKOFF, minute=0)
+            self.phase = 'first_half'
+            yield
+        
+        if self.phase == 'first_half':
+            # Simulate first half
+            yield from self._half_steps(1, 1, 45)
+            
+            # Half time
+            self.record_event(ev.HALFTIME, value=(self.home_score, self.away_score), minute=45)
+            self.phase = 'second_half'
+            yield
+        
+        if self.phase == 'second_half':
+            # Simulate second half
+            yield from self._half_steps(2, 46, 90)
+            
+            # Injury time
+            if self.injury_time > 0:
+                self.record_event(ev.INJURY_TIME, value=self.injury_time, minute=90)
+                self.is_injury_time = True
+            self.phase = 'injury_time'
+        
+        if self.phase == 'injury_time':
+            if self.is_injury_time:
+                yield from self._injury_time_steps(self.injury_time)
+            
+            # Final whistle
+            self.record_event(ev.FULLTIME, value=(self.home_score, self.away_score), minute=90 + self.injury_time)
+            self.phase = 'full_time'
+            yield
+
+    def iter_match(self, keep_events=False):
+        """
+        Play the match set up by setup_match, yielding each event as soon as
+        its step has been simulated, as a dict with:
+        - 'minute' and 'event' (an esms.engine.events.Event view)
+        - 'score': (home, away) after the step
+        - 'stats': the STREAM_STATS that changed since the last yielded
+          event, with their new {'home', 'away'} values
+        Yielded events are dropped from self.match_events unless keep_events,
+        so memory stays flat however long the match runs. Stop iterating to
+        abandon the match early; once the full time event has been yielded
+        generate_match_stats() gives the final statistics.
+        """
+        log = self.match_events
+        previous = self._stream_stats()
+        start = 0
+        for _ in self._match_steps():
+            if len(log) == start:
+                continue  # Changed stats carry over to the next event
+            current = self._stream_stats()
+            delta = {
+                stat: {'home': home, 'away': away}
+                for stat, (home, away) in current.items() if previous[stat] != (home, away)
+            }
+            previous = current
+            score = (self.home_score, self.away_score)
+            for event in log[start:]:
+                yield {'minute': event.minute, 'event': event, 'score': score, 'stats': delta}
+                delta = {}
+            if keep_events:
+                start = len(log)
+            else:
+                log.records.clear()
+
+    def _stream_stats(self):
+        """Current team statistics for iter_match, possession rounded as in generate_match_stats"""
+        stats = {stat: (getattr(self, 'home_' + stat), getattr(self, 'away_' + stat)) for stat in STREAM_STATS}
+        stats['possession'] = (round(self.home_possession, 1), round(self.away_possession, 1))
+        return stats
+
+    def snapshot(self, include_events=True):
+        """
+        The in-match state as a dict of plain values (JSON-serialisable):
+        phase, minute, score, zone, momentum, injury time, substitutions,
+        team statistics, lineups and benches, each player's match state and
+        the random state, plus the events so far unless include_events is
+        False. Take it between steps - before kickoff, after run_full_match
+        or while iter_match() is paused. Teams are referred to by squad
+        position, see restore().
+        """
+        squad = list(self.event_players)
+        index = self.event_players
+        
+        if self.stream_seeds:
+            # Streams are re-seeded from the step number before every event
+            random_state = {'stream_seeds': self.stream_seeds}
+        else:
+            version, internal, gauss_next = self.rng.getstate()
+            random_state = {'state': [version, list(internal), gauss_next]}
+        random_state['event_step'] = self.event_step
+        
+        state = {
+            'version': SNAPSHOT_VERSION,
+            'phase': self.phase,
+            'minute': self.current_minute,
+            'score': [self.home_score, self.away_score],
+            'zone': self.current_zone,
+            'momentum': self.momentum,
+            'injury_time': self.injury_time,
+            'is_injury_time': self.is_injury_time,
+            'subs_used': [self.home_subs_used, self.away_subs_used],
+            'last_team_with_ball': 0 if self.last_team_with_ball is self.home_team else 1,
+            'stats': {stat: [getattr(self, 'home_' + stat), getattr(self, 'away_' + stat)] for stat in STREAM_STATS},
+            'squad': [player.name for player in squad],
+            'lineups': {
+                'home': [index[player] for player in self.home_team.players],
+                'away': [index[player] for player in self.away_team.players],
+                'home_subs': [index[player] for player in self.home_subs],
+                'away_subs': [index[player] for player in self.away_subs]
+            },
+            'players': [player.match_state() for player in squad],
+            'random': random_state
+        }
+        if include_events:
+            state['events'] = [list(record) for record in self.match_events.records]
+        return state
+
+    def restore(self, state, home_team, away_team, home_subs=None, away_subs=None):
+        """
+        Continue a match from snapshot() state. The teams and benches must
+        hold the same players in the same order as when the match was set up
+        (e.g. rebuilt from the database or the same files); their tactics are
+        taken as given, so a tactic changed at half time applies from here.
+        Carry on with run_full_match() or iter_match().
+        """
+        if state.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {state.get('version')}")
+        if state['phase'] not in MATCH_PHASES:
+            raise ValueError(f"Unknown match phase: {state['phase']}")
+        
+        # Streams first: setup_match hands them to the team caches
+        random_state = state['random']
+        self.use_streams()
+        if 'stream_seeds' in random_state:
+            self.stream_seeds = dict(random_state['stream_seeds'])
+            for name, stream_seed in self.stream_seeds.items():
+                setattr(self, 'rng_' + name, make_rng(stream_seed))
+        
+        self.setup_match(home_team, away_team, home_subs, away_subs)
+        squad = list(self.event_players)
+        if [player.name for player in squad] != state['squad']:
+            raise ValueError("Teams do not match the snapshot's squad")
+        
+        lineups = state['lineups']
+        home_team.players = [squad[i] for i in lineups['home']]
+        away_team.players = [squad[i] for i in lineups['away']]
+        self.home_subs = [squad[i] for i in lineups['home_subs']]
+        self.away_subs = [squad[i] for i in lineups['away_subs']]
+        for player, player_state in zip(squad, state['players']):
+            player.restore_match_state(player_state)
+        
+        self.phase = state['phase']
+        self.current_minute = state['minute']
+        self.home_score, self.away_score = state['score']
+        self.current_zone = state['zone']
+        self.momentum = state['momentum']
+        self.injury_time = state['injury_time']
+        self.is_injury_time = state['is_injury_time']
+        self.home_subs_used, self.away_subs_used = state['subs_used']
+        self.last_team_with_ball = self.home_team if state['last_team_with_ball'] == 0 else self.away_team
+        for stat, (home, away) in state['stats'].items():
+            setattr(self, 'home_' + stat, home)
+            setattr(self, 'away_' + stat, away)
+        
+        # Lineups may differ from the ones setup_match indexed
+        self.lineup_changed(home_team)
+        self.lineup_changed(away_team)
+        
+        if 'state' in random_state:
+            version, internal, gauss_next = random_state['state']
+            self.rng.setstate((version, tuple(internal), gauss_next))
+        self.event_step = random_state['event_step']
+        
+        if 'events' in state:
+            # JSON turns the score and free-text tuples into lists
+            self.match_events.records = [
+                tuple(tuple(value) if isinstance(value, list) else value for value in record)
+                for record in state['events']
+            ]
+
+    def simulate_many(self, home_team, away_team, n, seed=None, home_subs=None, away_subs=None):
+        """
+        Run n matches between the same two teams and return aggregated results.
+
+        No events, commentary or per-player stats are built - only the score and
+        team statistics of each run are kept. Lineups and substitute lists are
+        restored before every run, so the teams are left as they were passed in.
+        """
+        if n < 1:
+            raise ValueError("simulate_many needs at least one match")
+        if seed is not None:
+            self.rng.seed(seed)
+
+        tally = self._new_tally()
+        self._simulate_runs(home_team, away_team, n, tally, home_subs, away_subs)
+        return self._summarise_runs(home_team, away_team, tally)
+
+    def simulate_until(self, home_team, away_team, target_width=0.02, confidence=0.95, batch_size=200,
+                       min_matches=200, max_matches=50000, seed=None, home_subs=None, away_subs=None):
+        """
+        Run matches in batches until the confidence intervals of the home win,
+        draw and away win probabilities are all at most target_width wide, or
+        max_matches have been played.
+
+        Returns the simulate_many result plus 'intervals' (Wilson score
+        interval per outcome), 'confidence' and 'converged'. One-sided
+        pairings stop after a few hundred matches, close ones run longer.
+        """
+        if not 0 < target_width < 1:
+            raise ValueError("target_width must be between 0 and 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_matches < max(1, min_matches):
+            raise ValueError("max_matches must be at least min_matches and 1")
+        z_score(confidence)  # Validate before running anything
+        if seed is not None:
+            self.rng.seed(seed)
+
+        tally = self._new_tally()
+        while True:
+            runs = min(batch_size, max_matches - tally['matches'])
+            self._simulate_runs(home_team, away_team, runs, tally, home_subs, away_subs)
+
+            n = tally['matches']
+            intervals = {
+                outcome: wilson_interval(count, n, confidence)
+                for outcome, count in zip(OUTCOMES, tally['outcomes'])
+            }
+            converged = all(high - low <= target_width for low, high in intervals.values())
+            if (converged and n >= min_matches) or n >= max_matches:
+                break
+
+        result = self._summarise_runs(home_team, away_team, tally)
+        result['intervals'] = intervals
+        result['confidence'] = confidence
+        result['converged'] = converged
+        return result
+
+    def compare(self, home_team, away_team, variants, n=1000, seed=None, confidence=0.95,
+                home_subs=None, away_subs=None):
+        """
+        What-if comparison with common random numbers.
+
+        variants maps a name to a (home_team, away_team) pair, e.g. the same
+        teams with another tactic or one player swapped. Run i of the
+        baseline and of every variant uses the same per-decision random
+        streams (see use_streams), so differences come from the change and
+        not from luck. Returns the baseline means and, per variant, a
+        paired_difference estimate for each of the OUTCOMES and both teams'
+        goals.
+        """
+        if n < 2:
+            raise ValueError("compare needs at least two matches")
+        if not variants:
+            raise ValueError("compare needs at least one variant")
+        z_score(confidence)
+        base_seed = self.rng.getrandbits(64) if seed is None else seed
+
+        scenarios = {None: (home_team, away_team)}
+        scenarios.update(variants)
+        values = {name: {metric: [] for metric in COMPARE_METRICS} for name in scenarios}
+        lineups = {
+            name: (list(home.players), list(away.players))
+            for name, (home, away) in scenarios.items()
+        }
+
+        record_events = self.record_events
+        self.record_events = False
+        try:
+            for run in range(n):
+                run_seed = match_seed(run, base_seed)
+                for name, (home, away) in scenarios.items():
+                    home.players = list(lineups[name][0])
+                    away.players = list(lineups[name][1])
+                    self.use_streams(run_seed)
+                    self.setup_match(home, away, list(home_subs or []), list(away_subs or []))
+                    self._play_match()
+
+                    run_values = values[name]
+                    run_values['home_win'].append(int(self.home_score > self.away_score))
+                    run_values['draw'].append(int(self.home_score == self.away_score))
+                    run_values['away_win'].append(int(self.home_score < self.away_score))
+                    run_values['home_goals'].append(self.home_score)
+                    run_values['away_goals'].append(self.away_score)
+        finally:
+            self.use_streams()
+            self.record_events = record_events
+            for name, (home, away) in scenarios.items():
+                home.players, away.players = lineups[name]
+
+        baseline = values.pop(None)
+        return {
+            'home_team': home_team.name,
+            'away_team': away_team.name,
+            'matches': n,
+            'confidence': confidence,
+            'baseline': {metric: sum(runs) / n for metric, runs in baseline.items()},
+            'variants': {
+                name: {
+                    metric: paired_difference(baseline[metric], runs, confidence)
+                    for metric, runs in variant.items()
+                }
+                for name, variant in values.items()
+            }
+        }
+
+    def _new_tally(self):
+        """Empty running totals for _simulate_runs"""
+        return {
+            'matches': 0,
+            'scores': {},
+            'outcomes': [0, 0, 0],  # Home wins, draws, away wins
+            'totals': {
+                'goals': [0, 0],
+                'possession': [0.0, 0.0],
+                'shots': [0, 0],
+                'shots_on_target': [0, 0],
+                'fouls': [0, 0],
+                'corners': [0, 0]
+            }
+        }
+
+    def _simulate_runs(self, home_team, away_team, n, tally, home_subs=None, away_subs=None):
+        """Play n matches without events and add their scores and stats to tally"""
+        home_lineup = list(home_team.players)
+        away_lineup = list(away_team.players)
+        home_bench = list(home_subs or [])
+        away_bench = list(away_subs or [])
+
+        score_counts = tally['scores']
+        outcomes = tally['outcomes']
+        totals = tally['totals']
+
+        record_events = self.record_events
+        self.record_events = False
+        try:
+            for _ in range(n):
+                home_team.players = list(home_lineup)
+                away_team.players = list(away_lineup)
+                self.setup_match(home_team, away_team, list(home_bench), list(away_bench))
+                self._play_match()
+
+                score = (self.home_score, self.away_score)
+                score_counts[score] = score_counts.get(score, 0) + 1
+                if self.home_score > self.away_score:
+                    outcomes[0] += 1
+                elif self.home_score < self.away_score:
+                    outcomes[2] += 1
+                else:
+                    outcomes[1] += 1
+
+                totals['goals'][0] += self.home_score
+                totals['goals'][1] += self.away_score
+                totals['possession'][0] += self.home_possession
+                totals['possession'][1] += self.away_possession
+                totals['shots'][0] += self.home_shots
+                totals['shots'][1] += self.away_shots
+                totals['shots_on_target'][0] += self.home_shots_on_target
+                totals['shots_on_target'][1] += self.away_shots_on_target
+                totals['fouls'][0] += self.home_fouls
+                totals['fouls'][1] += self.away_fouls
+                totals['corners'][0] += self.home_corners
+                totals['corners'][1] += self.away_corners
+                tally['matches'] += 1
+        finally:
+            self.record_events = record_events
+            home_team.players = home_lineup
+            away_team.players = away_lineup
+
+    def _summarise_runs(self, home_team, away_team, tally):
+        """Turn a tally into the simulate_many result format"""
+        n = tally['matches']
+        home_goals = {}
+        away_goals = {}
+        for (home, away), count in tally['scores'].items():
+            home_goals[home] = home_goals.get(home, 0) + count
+            away_goals[away] = away_goals.get(away, 0) + count
+
+        home_wins, draws, away_wins = tally['outcomes']
+        return {
+            'home_team': home_team.name,
+            'away_team': away_team.name,
+            'matches': n,
+            'home_win': home_wins / n,
+            'draw': draws / n,
+            'away_win': away_wins / n,
+            'score_distribution': {score: count / n for score, count in sorted(tally['scores'].items())},
+            'home_goals': {goals: count / n for goals, count in sorted(home_goals.items())},
+            'away_goals': {goals: count / n for goals, count in sorted(away_goals.items())},
+            'mean_stats': {
+                stat: {'home': round(home / n, 2), 'away': round(away / n, 2)}
+                for stat, (home, away) in tally['totals'].items()
+            }
+        }
+
+    def _play_match(self):
+        """Play both halves and injury time without the kickoff/half time/full time events"""
+        self.simulate_half(1, 1, 45)
+        self.simulate_half(2, 46, 90)
+        if self.injury_time > 0:
+            self.is_injury_time = True
+            self.simulate_injury_time(self.injury_time)
+
     def simulate_half(self, half_id, start_minute, end_minute):
         """Simulate one half of the match"""
-        self.current_minute = start_minute
+        for _ in self._half_steps(half_id, start_minute, end_minute):
+            pass
+
+    def _half_steps(self, half_id, start_minute, end_minute):
+        """simulate_half, yielding after every event step; a restored match carries on from its minute"""
+        self.current_minute = max(self.current_minute, start_minute)
         
         while self.current_minute < end_minute:
+            if self.stream_seeds:
+                self._sync_streams()
+                
             # Determine event time increment (1-3 minutes)
-            time_increment = random.randint(1, 3)
+            time_increment = self.rng_tempo.randint(1, 3)
             self.current_minute += time_increment
             
             if self.current_minute > end_minute:
@@ -225,19 +719,32 @@ class EnhancedMatchEngine:
                 self.check_for_substitutions()
             
             # Update player fatigue and match distance
-            for player in self.home_team.players + self.away_team.players:
-                player.match_minutes = self.current_minute
-                # Simulate distance covered
-                distance_per_minute = random.uniform(0.08, 0.12)  # km per minute
-                player.match_distance += distance_per_minute * time_increment
+            self.update_player_condition(time_increment)
+            yield
+
+    def update_player_condition(self, time_increment):
+        """Advance every player's minutes played (which drives fatigue) and distance covered"""
+        for player in self.home_team.players + self.away_team.players:
+            player.match_minutes = self.current_minute
+            # Simulate distance covered
+            distance_per_minute = self.rng_tempo.uniform(0.08, 0.12)  # km per minute
+            player.match_distance += distance_per_minute * time_increment
 
     def simulate_injury_time(self, injury_time_minutes):
         """Simulate injury time at the end of the match"""
+        for _ in self._injury_time_steps(injury_time_minutes):
+            pass
+
+    def _injury_time_steps(self, injury_time_minutes):
+        """simulate_injury_time, yielding after every event step"""
         end_minute = 90 + injury_time_minutes
         
         while self.current_minute < end_minute:
+            if self.stream_seeds:
+                self._sync_streams()
+                
             # Shorter time increments in injury time
-            time_increment = random.randint(1, 2)
+            time_increment = self.rng_tempo.randint(1, 2)
             self.current_minute += time_increment
             
             if self.current_minute > end_minute:
@@ -246,7 +753,7 @@ class EnhancedMatchEngine:
             # Higher chance of attacking events in injury time
             attacking_chance = 0.6  # 60% chance of an attacking event
             
-            if random.random() < attacking_chance:
+            if self.rng_possession.random() < attacking_chance:
                 # Determine which team attacks (losing team more likely)
                 if self.home_score < self.away_score:
                     attacking_team = self.home_team
@@ -258,7 +765,7 @@ class EnhancedMatchEngine:
                     is_home_attacking = False
                 else:
                     # If tied, random team attacks
-                    if random.random() < 0.5:
+                    if self.rng_possession.random() < 0.5:
                         attacking_team = self.home_team
                         defending_team = self.away_team
                         is_home_attacking = True
@@ -271,19 +778,20 @@ class EnhancedMatchEngine:
                 self.process_attacking_play(attacking_team, defending_team, is_home_attacking)
             else:
                 # General midfield play
-                if random.random() < 0.5:
+                if self.rng_possession.random() < 0.5:
                     self.process_midfield_play(self.home_team, self.away_team, True)
                 else:
                     self.process_midfield_play(self.away_team, self.home_team, False)
+            yield
 
     def check_for_substitutions(self):
         """Check if teams want to make substitutions"""
         # Home team substitution
-        if random.random() < self.calculate_substitution_probability(self.home_team, self.away_team):
+        if self.rng_substitution.random() < self.calculate_substitution_probability(self.home_team, self.away_team):
             self.make_team_substitution(self.home_team, True)
             
         # Away team substitution
-        if random.random() < self.calculate_substitution_probability(self.away_team, self.home_team):
+        if self.rng_substitution.random() < self.calculate_substitution_probability(self.away_team, self.home_team):
             self.make_team_substitution(self.away_team, False)
 
     def calculate_substitution_probability(self, team, opponent):
@@ -365,24 +873,25 @@ class EnhancedMatchEngine:
         else:
             normalized_weights = [w/total_weight for w in weights]
             
-        player_out = random.choices([c[0] for c in candidates], weights=normalized_weights, k=1)[0]
+        player_out = self.rng_substitution.choices([c[0] for c in candidates], weights=normalized_weights, k=1)[0]
         
         # Find appropriate replacement with similar position
         position_matches = [s for s in available_subs if s.position == player_out.position]
         position_similar = [s for s in available_subs if self.positions_are_similar(s.position, player_out.position)]
         
         if position_matches:
-            player_in = random.choice(position_matches)
+            player_in = self.rng_substitution.choice(position_matches)
         elif position_similar:
-            player_in = random.choice(position_similar)
+            player_in = self.rng_substitution.choice(position_similar)
         elif available_subs:
-            player_in = random.choice(available_subs)
+            player_in = self.rng_substitution.choice(available_subs)
         else:
             return False
             
         # Make the substitution
         team.players.remove(player_out)
         team.players.append(player_in)
+        self.lineup_changed(team)
         
         if is_home_team:
             self.home_subs.remove(player_in)
@@ -392,11 +901,7 @@ class EnhancedMatchEngine:
             self.away_subs_used += 1
             
         # Record substitution event
-        self.add_event(
-            self.current_minute, 
-            "substitution", 
-            f"{player_in.name} comes on for {player_out.name}"
-        )
+        self.record_event(ev.SUBSTITUTION, player_in, player_out, team=team)
         
         # Apply tactical impact - fresh player gets a small boost
         player_in.substitution_boost = 1.1  # 10% attribute boost for 10-15 minutes
@@ -425,7 +930,7 @@ class EnhancedMatchEngine:
         self.update_possession()
         
         # Determine which team has the ball for this event
-        if random.random() * 100 < self.home_possession:
+        if self.rng_possession.random() * 100 < self.home_possession:
             attacking_team = self.home_team
             defending_team = self.away_team
             is_home_attacking = True
@@ -449,8 +954,8 @@ class EnhancedMatchEngine:
         self.update_momentum(attacking_team, defending_team, is_home_attacking)
         
         # Small chance of injury
-        if random.random() < 0.01:  # 1% chance per event
-            self.process_injury(attacking_team if random.random() < 0.5 else defending_team)
+        if self.rng_injury.random() < 0.01:  # 1% chance per event
+            self.process_injury(attacking_team if self.rng_injury.random() < 0.5 else defending_team)
 
     def update_possession(self):
         """Update possession statistics based on team tactics and momentum"""
@@ -471,8 +976,8 @@ class EnhancedMatchEngine:
         tactical_effect = (home_passing_boost - away_passing_boost) * 2  # Each point is worth 2% possession
         
         # Player quality effect - average passing skill difference
-        home_passing = sum(p.get_effective_attribute('passing', self.current_minute) for p in self.home_team.players) / len(self.home_team.players)
-        away_passing = sum(p.get_effective_attribute('passing', self.current_minute) for p in self.away_team.players) / len(self.away_team.players)
+        home_passing = self.home_ratings.average_passing(self.current_minute)
+        away_passing = self.away_ratings.average_passing(self.current_minute)
         quality_effect = (home_passing - away_passing) / 4  # Each point difference is worth 0.25% possession
         
         # Calculate new possession value
@@ -517,7 +1022,7 @@ class EnhancedMatchEngine:
         forward_prob += midfield_difference * 0.01  # Each point worth 1%
             
         # Determine movement
-        if random.random() < forward_prob:
+        if self.rng_field.random() < forward_prob:
             # Move forward
             new_zone = self.current_zone + direction
         else:
@@ -527,16 +1032,22 @@ class EnhancedMatchEngine:
         # Ensure zone is within valid range
         self.current_zone = max(1, min(5, new_zone))
 
+    def get_team_ratings(self, team):
+        """Get the rating cache for one of the two teams in the match"""
+        return self.home_ratings if team is self.home_team else self.away_ratings
+
+    def lineup_changed(self, team):
+        """Refresh the per-team caches after a substitution or red card"""
+        self.get_team_ratings(team).invalidate()
+        (self.home_positions if team is self.home_team else self.away_positions).rebuild()
+
     def get_team_midfield_quality(self, team):
         """Calculate team's midfield quality"""
-        midfielders = [p for p in team.players if p.position in ['CM', 'DM', 'AM', 'LM', 'RM']]
-        if not midfielders:
+        quality = self.get_team_ratings(team).midfield_quality(self.current_minute)
+        if quality is None:
             return 10  # Default if no midfielders
-            
-        avg_passing = sum(p.get_effective_attribute('passing', self.current_minute) for p in midfielders) / len(midfielders)
-        avg_technique = sum(p.get_effective_attribute('technique', self.current_minute) for p in midfielders) / len(midfielders)
         
-        return (avg_passing + avg_technique) / 2 + team.temp_passing_boost
+        return quality + team.temp_passing_boost
 
     def process_goal_attempt(self, attacking_team, defending_team, is_home_attacking):
         """Process a goal attempt"""
@@ -551,20 +1062,20 @@ class EnhancedMatchEngine:
         attacker.match_shots += 1
         
         # Determine if it's on target
-        shooting_skill = attacker.get_effective_attribute('shooting', self.current_minute)
+        shooting_skill = self.tactical_attribute(attacker, attacking_team, 'shooting', SH)
         on_target_chance = 0.3 + (shooting_skill / 40)  # Base 30% + up to 50% from skill
         
         # Adjust based on position - central positions have better angles
         if attacker.position in ['ST', 'CF', 'AM']:
             on_target_chance += 0.05  # +5% for central positions
         
-        if random.random() < on_target_chance:
+        if self.rng_outcome.random() < on_target_chance:
             # Shot is on target
             self.increment_shots_on_target(is_home_attacking)
             attacker.match_shots_on_target += 1
             
             # Determine if it's a goal
-            gk_skill = goalkeeper.get_effective_attribute('goalkeeper', self.current_minute)
+            gk_skill = goalkeeper.get_effective_attribute('goalkeeper', self.current_minute, self.rng_players)
             save_chance = 0.6 + (gk_skill / 50)  # Base 60% + up to 40% from skill
             
             # Decrease save chance for very good shots
@@ -575,7 +1086,7 @@ class EnhancedMatchEngine:
             if self.current_zone == 2 or self.current_zone == 4:  # Not in the box
                 save_chance += 0.1  # +10% for distance shots
             
-            if random.random() > save_chance:
+            if self.rng_outcome.random() > save_chance:
                 # Goal scored!
                 if is_home_attacking:
                     self.home_score += 1
@@ -585,50 +1096,44 @@ class EnhancedMatchEngine:
                 attacker.match_goals += 1
                 
                 # Determine if there was an assist
-                if random.random() < 0.7:  # 70% of goals have assists
+                if self.rng_outcome.random() < 0.7:  # 70% of goals have assists
                     assister = self.select_player_for_action(attacking_team, exclude=[attacker])
                     assister.match_assists += 1
-                    goal_desc = commentary_manager().get_goal_with_assist(
-                        attacker.name, assister.name, self.current_minute, self.home_score, self.away_score)
+                    self.record_event(ev.GOAL_WITH_ASSIST, attacker, assister, team=attacking_team)
                 else:
-                    goal_desc = commentary_manager().get_goal(
-                        attacker.name, self.current_minute, self.home_score, self.away_score)
-                
-                self.add_event(self.current_minute, "goal", goal_desc)
+                    self.record_event(ev.GOAL, attacker, team=attacking_team)
                 
                 # Add small amount of injury time for goal celebration
-                self.injury_time += random.randint(0, 1)
+                self.injury_time += self.rng_tempo.randint(0, 1)
                 
                 # Big momentum swing for scoring team
                 self.momentum += -5 if is_home_attacking else 5
             else:
                 # Save by goalkeeper
                 goalkeeper.match_saves += 1
-                save_desc = commentary_manager().get_save(goalkeeper.name, attacker.name)
-                self.add_event(self.current_minute, "save", save_desc)
+                self.record_event(ev.SAVE, goalkeeper, attacker, team=defending_team)
                 
                 # Check for corner
-                if random.random() < 0.7:  # 70% of saved shots result in corners
+                if self.rng_outcome.random() < 0.7:  # 70% of saved shots result in corners
                     if is_home_attacking:
                         self.home_corners += 1
                     else:
                         self.away_corners += 1
-                    self.add_event(self.current_minute, "corner", f"Corner kick for {attacking_team.name}")
+                    self.record_event(ev.CORNER, team=attacking_team)
                 
                 # Small momentum boost for good save
                 self.momentum += 1 if is_home_attacking else -1
         else:
             # Shot off target
-            miss_desc = commentary_manager().get_miss(attacker.name)
-            self.add_event(self.current_minute, "miss", miss_desc)
+            self.record_event(ev.MISS, attacker, team=attacking_team)
             
             # Check for goal kick or corner
-            if random.random() < 0.3:  # 30% of missed shots result in corners
+            if self.rng_outcome.random() < 0.3:  # 30% of missed shots result in corners
                 if is_home_attacking:
                     self.home_corners += 1
                 else:
                     self.away_corners += 1
-                self.add_event(self.current_minute, "corner", f"Corner kick for {attacking_team.name}")
+                self.record_event(ev.CORNER, team=attacking_team)
 
     def process_attacking_play(self, attacking_team, defending_team, is_home_attacking):
         """Process an attacking play in the final third"""
@@ -655,7 +1160,7 @@ class EnhancedMatchEngine:
         weights = [w/total for w in weights]
         
         # Choose event type
-        event_type = random.choices(event_types, weights=weights)[0]
+        event_type = self.rng_play.choices(event_types, weights=weights)[0]
         
         if event_type == "shot":
             self.process_goal_attempt(attacking_team, defending_team, is_home_attacking)
@@ -668,22 +1173,20 @@ class EnhancedMatchEngine:
             crosser.match_passes += 1
             
             # Determine if cross is successful
-            crossing_skill = crosser.get_effective_attribute('passing', self.current_minute)
-            defending_skill = defender.get_effective_attribute('tackling', self.current_minute)
+            crossing_skill = self.tactical_attribute(crosser, attacking_team, 'passing', PS)
+            defending_skill = self.tactical_attribute(defender, defending_team, 'tackling', TK)
             
-            cross_success = random.random() < ((crossing_skill - defending_skill + 10) / 30)
+            cross_success = self.rng_outcome.random() < ((crossing_skill - defending_skill + 10) / 30)
             
             if cross_success:
                 crosser.match_passes_completed += 1
-                cross_desc = commentary_manager().get_cross(crosser.name, target.name)
-                self.add_event(self.current_minute, "cross", cross_desc)
+                self.record_event(ev.CROSS, crosser, target, team=attacking_team)
                 
                 # Successful cross often leads to a shot
-                if random.random() < 0.6:  # 60% chance of shot from successful cross
+                if self.rng_outcome.random() < 0.6:  # 60% chance of shot from successful cross
                     self.process_goal_attempt(attacking_team, defending_team, is_home_attacking)
             else:
-                cross_desc = commentary_manager().get_failed_cross(crosser.name, defender.name)
-                self.add_event(self.current_minute, "cross", cross_desc)
+                self.record_event(ev.FAILED_CROSS, crosser, defender, team=attacking_team)
                 
                 # Defender gets tackle credit
                 defender.match_tackles += 1
@@ -696,22 +1199,20 @@ class EnhancedMatchEngine:
             passer.match_passes += 1
             
             # Determine if through ball is successful
-            passing_skill = passer.get_effective_attribute('passing', self.current_minute)
+            passing_skill = self.tactical_attribute(passer, attacking_team, 'passing', PS)
             # Through balls are harder than normal passes
-            pass_success = random.random() < ((passing_skill - 5) / 20)
+            pass_success = self.rng_outcome.random() < ((passing_skill - 5) / 20)
             
             if pass_success:
                 passer.match_passes_completed += 1
-                through_desc = commentary_manager().get_through_ball(passer.name, receiver.name)
-                self.add_event(self.current_minute, "through_ball", through_desc)
+                self.record_event(ev.THROUGH_BALL, passer, receiver, team=attacking_team)
                 
                 # Successful through ball likely leads to a shot
-                if random.random() < 0.7:  # 70% chance
+                if self.rng_outcome.random() < 0.7:  # 70% chance
                     self.process_goal_attempt(attacking_team, defending_team, is_home_attacking)
             else:
                 defender = self.select_player_for_action(defending_team, preference='defender')
-                through_desc = commentary_manager().get_failed_through_ball(passer.name, defender.name)
-                self.add_event(self.current_minute, "through_ball", through_desc)
+                self.record_event(ev.FAILED_THROUGH_BALL, passer, defender, team=attacking_team)
                 
                 # Defender gets tackle credit
                 defender.match_tackles += 1
@@ -725,34 +1226,31 @@ class EnhancedMatchEngine:
                 defender = self.select_player_for_action(defending_team)
                 
                 # Dribble success calculation
-                dribble_skill = player.get_effective_attribute('technique', self.current_minute)
-                tackle_skill = defender.get_effective_attribute('tackling', self.current_minute)
+                dribble_skill = player.get_effective_attribute('technique', self.current_minute, self.rng_players)
+                tackle_skill = self.tactical_attribute(defender, defending_team, 'tackling', TK)
                 
-                dribble_success = random.random() < ((dribble_skill - tackle_skill + 10) / 30)
+                dribble_success = self.rng_outcome.random() < ((dribble_skill - tackle_skill + 10) / 30)
                 
                 if dribble_success:
-                    dribble_desc = commentary_manager().get_dribble(player.name, defender.name)
-                    self.add_event(self.current_minute, "dribble", dribble_desc)
+                    self.record_event(ev.DRIBBLE, player, defender, team=attacking_team)
                     
                     # Successful dribble can lead to shot opportunity
-                    if random.random() < 0.4:  # 40% chance
+                    if self.rng_outcome.random() < 0.4:  # 40% chance
                         self.process_goal_attempt(attacking_team, defending_team, is_home_attacking)
                 else:
-                    dribble_desc = commentary_manager().get_tackle(defender.name, player.name)
-                    self.add_event(self.current_minute, "tackle", dribble_desc)
+                    self.record_event(ev.TACKLE, defender, player, team=defending_team)
                     
                     defender.match_tackles += 1
                     defender.match_tackles_won += 1
             else:  # pass
                 player.match_passes += 1
                 
-                pass_skill = player.get_effective_attribute('passing', self.current_minute)
-                pass_success = random.random() < (pass_skill / 20)
+                pass_skill = self.tactical_attribute(player, attacking_team, 'passing', PS)
+                pass_success = self.rng_outcome.random() < (pass_skill / 20)
                 
                 if pass_success:
                     player.match_passes_completed += 1
-                    pass_desc = commentary_manager().get_pass(player.name, target.name)
-                    self.add_event(self.current_minute, "pass", pass_desc)
+                    self.record_event(ev.PASS, player, target, team=attacking_team)
 
     def process_midfield_play(self, attacking_team, defending_team, is_home_attacking):
         """Process play in the midfield"""
@@ -760,7 +1258,7 @@ class EnhancedMatchEngine:
         weights = [0.5, 0.2, 0.2, 0.1]
         
         # Choose event type
-        event_type = random.choices(event_types, weights=weights)[0]
+        event_type = self.rng_play.choices(event_types, weights=weights)[0]
         
         if event_type == "pass":
             # Process midfield pass
@@ -770,16 +1268,15 @@ class EnhancedMatchEngine:
             passer.match_passes += 1
             
             # Pass success calculation
-            pass_skill = passer.get_effective_attribute('passing', self.current_minute)
-            pass_success = random.random() < (pass_skill / 20)
+            pass_skill = self.tactical_attribute(passer, attacking_team, 'passing', PS)
+            pass_success = self.rng_outcome.random() < (pass_skill / 20)
             
             if pass_success:
                 passer.match_passes_completed += 1
                 
                 # Important passes get commentary
-                if random.random() < 0.3:  # Only 30% of midfield passes get commentary
-                    pass_desc = commentary_manager().get_pass(passer.name, receiver.name)
-                    self.add_event(self.current_minute, "pass", pass_desc)
+                if self.rng_commentary.random() < 0.3:  # Only 30% of midfield passes get commentary
+                    self.record_event(ev.PASS, passer, receiver, team=attacking_team)
             else:
                 interceptor = self.select_player_for_action(defending_team)
                 interceptor.match_tackles += 1
@@ -788,22 +1285,20 @@ class EnhancedMatchEngine:
                 # Turnover of possession
                 self.last_team_with_ball = defending_team
                 
-                interception_desc = commentary_manager().get_interception(interceptor.name, passer.name)
-                self.add_event(self.current_minute, "interception", interception_desc)
+                self.record_event(ev.INTERCEPTION, interceptor, passer, team=defending_team)
         
         elif event_type == "dribble":
             # Process midfield dribble
             dribbler = self.select_player_for_action(attacking_team)
             defender = self.select_player_for_action(defending_team)
             
-            dribble_skill = dribbler.get_effective_attribute('technique', self.current_minute)
-            tackle_skill = defender.get_effective_attribute('tackling', self.current_minute)
+            dribble_skill = dribbler.get_effective_attribute('technique', self.current_minute, self.rng_players)
+            tackle_skill = self.tactical_attribute(defender, defending_team, 'tackling', TK)
             
-            dribble_success = random.random() < ((dribble_skill - tackle_skill + 10) / 30)
+            dribble_success = self.rng_outcome.random() < ((dribble_skill - tackle_skill + 10) / 30)
             
-            if dribble_success and random.random() < 0.3:  # Only 30% get commentary
-                dribble_desc = commentary_manager().get_dribble(dribbler.name, defender.name)
-                self.add_event(self.current_minute, "dribble", dribble_desc)
+            if dribble_success and self.rng_commentary.random() < 0.3:  # Only 30% get commentary
+                self.record_event(ev.DRIBBLE, dribbler, defender, team=attacking_team)
             elif not dribble_success:
                 defender.match_tackles += 1
                 defender.match_tackles_won += 1
@@ -811,8 +1306,7 @@ class EnhancedMatchEngine:
                 # Turnover of possession
                 self.last_team_with_ball = defending_team
                 
-                tackle_desc = commentary_manager().get_tackle(defender.name, dribbler.name)
-                self.add_event(self.current_minute, "tackle", tackle_desc)
+                self.record_event(ev.TACKLE, defender, dribbler, team=defending_team)
         
         elif event_type == "tackle":
             # Process midfield tackle attempt
@@ -821,10 +1315,10 @@ class EnhancedMatchEngine:
             
             defender.match_tackles += 1
             
-            tackle_skill = defender.get_effective_attribute('tackling', self.current_minute)
-            dribble_skill = attacker.get_effective_attribute('technique', self.current_minute)
+            tackle_skill = self.tactical_attribute(defender, defending_team, 'tackling', TK)
+            dribble_skill = attacker.get_effective_attribute('technique', self.current_minute, self.rng_players)
             
-            tackle_success = random.random() < ((tackle_skill - dribble_skill + 10) / 30)
+            tackle_success = self.rng_outcome.random() < ((tackle_skill - dribble_skill + 10) / 30)
             
             if tackle_success:
                 defender.match_tackles_won += 1
@@ -832,12 +1326,11 @@ class EnhancedMatchEngine:
                 # Turnover of possession
                 self.last_team_with_ball = defending_team
                 
-                tackle_desc = commentary_manager().get_tackle(defender.name, attacker.name)
-                self.add_event(self.current_minute, "tackle", tackle_desc)
+                self.record_event(ev.TACKLE, defender, attacker, team=defending_team)
             else:
                 # Failed tackle - possible foul
                 foul_chance = 0.3
-                if random.random() < foul_chance:
+                if self.rng_outcome.random() < foul_chance:
                     self.process_foul(defender, attacker, is_home_attacking)
         
         elif event_type == "foul":
@@ -849,6 +1342,8 @@ class EnhancedMatchEngine:
 
     def process_foul(self, fouler, fouled, is_home_attacking):
         """Process a foul event"""
+        fouling_team = self.away_team if is_home_attacking else self.home_team
+        
         # Record foul
         if is_home_attacking:
             self.away_fouls += 1
@@ -869,38 +1364,36 @@ class EnhancedMatchEngine:
         if fouler.match_yellow_card:
             card_chance += 0.1  # Higher chance for second yellow
             
-        if random.random() < card_chance:
+        if self.rng_discipline.random() < card_chance:
             if fouler.match_yellow_card:
                 # Second yellow = red
                 fouler.match_red_card = True
-                card_desc = commentary_manager().get_red_card(fouler.name, fouled.name)
-                self.add_event(self.current_minute, "red_card", card_desc)
+                self.lineup_changed(fouling_team)
+                self.record_event(ev.RED_CARD, fouler, fouled, team=fouling_team)
                 
                 # Add injury time for red card
-                self.injury_time += random.randint(1, 2)
+                self.injury_time += self.rng_tempo.randint(1, 2)
                 
                 # Major momentum swing
                 self.momentum += 3 if is_home_attacking else -3
             else:
                 # Yellow card
                 fouler.match_yellow_card = True
-                card_desc = commentary_manager().get_yellow_card(fouler.name, fouled.name)
-                self.add_event(self.current_minute, "yellow_card", card_desc)
+                self.record_event(ev.YELLOW_CARD, fouler, fouled, team=fouling_team)
                 
                 # Minor momentum swing
                 self.momentum += 1 if is_home_attacking else -1
         else:
             # Just a foul, no card
-            foul_desc = commentary_manager().get_foul(fouler.name, fouled.name)
-            self.add_event(self.current_minute, "foul", foul_desc)
+            self.record_event(ev.FOUL, fouler, fouled, team=fouling_team)
 
     def process_injury(self, team):
         """Process a player injury event"""
         # Select random player for injury
-        player = random.choice(team.players)
+        player = self.rng_injury.choice(team.players)
         
         # Generate injury severity
-        severity = random.choices(
+        severity = self.rng_injury.choices(
             ["minor", "moderate", "severe"],
             weights=[0.7, 0.25, 0.05],  # Most injuries are minor
             k=1
@@ -908,16 +1401,16 @@ class EnhancedMatchEngine:
         
         # Record injury based on severity
         if severity == "minor":
-            description = f"{player.name} is down with a knock but seems able to continue"
+            code = ev.INJURY_MINOR
             recovery_time = 0  # Can continue
         elif severity == "moderate":
-            description = f"{player.name} has picked up an injury and needs treatment"
-            recovery_time = random.randint(1, 2)  # 1-2 minutes
+            code = ev.INJURY_MODERATE
+            recovery_time = self.rng_injury.randint(1, 2)  # 1-2 minutes
             self.injury_time += 1  # Add 1 minute to injury time
         else:  # severe
-            description = f"{player.name} has a serious injury and cannot continue"
+            code = ev.INJURY_SEVERE
             recovery_time = 5  # will need substitution
-            self.injury_time += random.randint(2, 3)  # Add 2-3 minutes to injury time
+            self.injury_time += self.rng_tempo.randint(2, 3)  # Add 2-3 minutes to injury time
             
             # Force substitution if severe and subs available
             if team == self.home_team and self.home_subs and self.home_subs_used < self.max_subs:
@@ -926,7 +1419,7 @@ class EnhancedMatchEngine:
                 self.make_team_substitution(team, False)
         
         # Add injury event
-        self.add_event(self.current_minute, "injury", description)
+        self.record_event(code, player, team=team)
 
     def update_momentum(self, attacking_team, defending_team, is_home_attacking):
         """Update match momentum"""
@@ -937,7 +1430,7 @@ class EnhancedMatchEngine:
             self.momentum += 0.2
             
         # Home advantage gives slight momentum boost
-        if random.random() < 0.1:  # 10% chance per event
+        if self.rng_momentum.random() < 0.1:  # 10% chance per event
             self.momentum -= 0.1  # Negative momentum favors home team
             
         # Score difference affects momentum
@@ -953,47 +1446,37 @@ class EnhancedMatchEngine:
         # Cap momentum
         self.momentum = max(-10, min(10, self.momentum))
 
+    def record_event(self, code, player=None, other=None, team=None, value=None, minute=None):
+        """
+        Record a compact event (see esms.engine.events). Only the commentary
+        template is chosen now - the text is rendered when it is read.
+        """
+        if not self.record_events:
+            return
+        category = ev.EVENT_KINDS[code][1]
+        template = self.commentary.pick_template(category, rng=self.rng_commentary) if category else None
+        if code in ev.SHOT_OUTCOMES and template is not None and not self.commentary.names_player(category, template):
+            # The outcome line leaves out who shot, so a shot line leads in
+            template = (self.commentary.pick_template('shot', rng=self.rng_commentary), template)
+        players = self.event_players
+        self.match_events.append((
+            self.current_minute if minute is None else minute,
+            code,
+            None if team is None else (0 if team is self.home_team else 1),
+            None if player is None else players[player],
+            None if other is None else players[other],
+            template,
+            value
+        ))
+
     def add_event(self, minute, event_type, description):
-        """Add an event to the match events list"""
-        event = {
-            'minute': minute,
-            'type': event_type,
-            'description': description
-        }
-        self.match_events.append(event)
+        """Add a free-text event to the match events list"""
+        self.record_event(ev.TEXT, value=(event_type, description), minute=minute)
 
     def select_player_for_action(self, team, preference=None, exclude=None):
         """Select a player from the team for an action, with optional position preference"""
-        exclude = exclude or []
-        available_players = [p for p in team.players if p not in exclude and not p.match_red_card]
-        
-        if not available_players:
-            # Fallback to first player if no others available
-            return team.players[0] if team.players else None
-            
-        if preference == 'forward':
-            forwards = [p for p in available_players if p.position in ['ST', 'CF', 'LF', 'RF', 'LW', 'RW']]
-            if forwards:
-                return random.choice(forwards)
-        elif preference == 'midfielder':
-            midfielders = [p for p in available_players if p.position in ['CM', 'DM', 'AM', 'LM', 'RM']]
-            if midfielders:
-                return random.choice(midfielders)
-        elif preference == 'winger':
-            wingers = [p for p in available_players if p.position in ['LW', 'RW', 'LM', 'RM']]
-            if wingers:
-                return random.choice(wingers)
-        elif preference == 'defender':
-            defenders = [p for p in available_players if p.position in ['CB', 'LB', 'RB', 'LWB', 'RWB']]
-            if defenders:
-                return random.choice(defenders)
-        elif preference == 'goalkeeper':
-            goalkeepers = [p for p in available_players if p.position == 'GK']
-            if goalkeepers:
-                return goalkeepers[0]
-                
-        # Default: return random player
-        return random.choice(available_players)
+        positions = self.home_positions if team is self.home_team else self.away_positions
+        return positions.select(preference, exclude)
 
     def increment_shots(self, is_home):
         """Increment shot count for the appropriate team"""
@@ -1,147 +1,242 @@
 # esms/engine/player.py
+from array import array
 import random
 
+# Base attributes read from the roster or database, with their defaults
+BASE_ATTRIBUTES = (
+    ('speed', 10), ('stamina', 10), ('technique', 10), ('passing', 10), ('shooting', 10),
+    ('tackling', 10), ('heading', 10), ('goalkeeper', 10), ('positioning', 10),
+    ('aggression', 10), ('fitness', 100)
+)
+
+# Integer match counters, stored together in one array per player
+MATCH_COUNTERS = (
+    'match_goals', 'match_assists', 'match_shots', 'match_shots_on_target',
+    'match_passes', 'match_passes_completed', 'match_tackles', 'match_tackles_won',
+    'match_fouls', 'match_saves'
+)
+_ZERO_COUNTERS = array('l', [0] * len(MATCH_COUNTERS))
+
+# In-match state besides the counters, in match_state() order
+MATCH_STATE = (
+    'position', 'match_minutes', 'match_distance', 'match_yellow_card', 'match_red_card',
+    'current_fatigue', 'substitution_boost', 'injury_status', 'field_x', 'field_y'
+)
+
+# Fatigue workload per position (higher = tires faster); unlisted positions use 1.0
+POSITION_WORKLOAD = {
+    # Central midfielders and wing-backs typically cover more ground
+    'CM': 1.2, 'LWB': 1.2, 'RWB': 1.2,
+    # Wide midfielders and wingers also run a lot
+    'LM': 1.15, 'RM': 1.15, 'LW': 1.15, 'RW': 1.15,
+    # Strikers, attacking midfielders, defensive midfielders with average workload
+    'ST': 1.0, 'AM': 1.0, 'DM': 1.0,
+    # Defenders have less total running but more high-intensity bursts
+    'CB': 0.9, 'LB': 0.9, 'RB': 0.9,
+    # Goalkeepers have the least running
+    'GK': 0.5,
+}
+
+_fatigue_curves = {}
+
+
+def fatigue_curve(stamina, workload):
+    """
+    Unclamped fatigue by whole minutes played (0-90) for a stamina and
+    position workload. Built once per pair and shared by all players.
+    """
+    curve = _fatigue_curves.get((stamina, workload))
+    if curve is None:
+        # Scale from 0.5 (best stamina) to 1.5 (worst stamina)
+        stamina_factor = 1.5 - (stamina / 20.0)
+        curve = _fatigue_curves[(stamina, workload)] = tuple(
+            (minutes_played / 90.0) ** 1.2 * 10 * stamina_factor * workload
+            for minutes_played in range(91)
+        )
+    return curve
+
+
+def _counter(index):
+    """Property exposing one slot of the match counter array"""
+    def get(self):
+        return self.match_counters[index]
+    
+    def set(self, value):
+        self.match_counters[index] = value
+    
+    return property(get, set)
+
+
 class Player:
     """
     Represents a player in the match simulation engine with enhanced attributes
     and performance modeling.
+    
+    Uses __slots__ and keeps the integer match counters in a single array,
+    so large numbers of players stay small in memory and reset quickly.
     """
+    __slots__ = (
+        'name', 'position',
+        'speed', 'stamina', 'technique', 'passing', 'shooting', 'tackling',
+        'heading', 'goalkeeper', 'positioning', 'aggression', 'fitness',
+        'field_x', 'field_y',
+        'match_counters', 'match_minutes', 'match_distance', 'match_yellow_card', 'match_red_card',
+        'current_fatigue', 'substitution_boost', 'injury_status',
+        'fatigue_table', 'fatigue_position', 'fatigue_key', 'fatigue_value'
+    )
+    
+    match_goals = _counter(0)
+    match_assists = _counter(1)
+    match_shots = _counter(2)
+    match_shots_on_target = _counter(3)
+    match_passes = _counter(4)
+    match_passes_completed = _counter(5)
+    match_tackles = _counter(6)
+    match_tackles_won = _counter(7)
+    match_fouls = _counter(8)
+    match_saves = _counter(9)  # For goalkeepers
+    
     def __init__(self, name, position, attributes):
         self.name = name
         self.position = position
-        self.attributes = attributes
-        
-        # Base attributes (from roster or database)
-        self.speed = attributes.get('speed', 10)
-        self.stamina = attributes.get('stamina', 10)
-        self.technique = attributes.get('technique', 10)
-        self.passing = attributes.get('passing', 10)
-        self.shooting = attributes.get('shooting', 10)
-        self.tackling = attributes.get('tackling', 10)
-        self.heading = attributes.get('heading', 10)
-        self.goalkeeper = attributes.get('goalkeeper', 10)
-        self.positioning = attributes.get('positioning', 10)
-        
-        # Additional optional attributes
-        self.aggression = attributes.get('aggression', 10)
-        self.fitness = attributes.get('fitness', 100)  # 0-100 scale
+        
+        # Base attributes (from roster or database), plus optional
+        # aggression and fitness (0-100 scale)
+        for attribute_name, default in BASE_ATTRIBUTES:
+            setattr(self, attribute_name, attributes.get(attribute_name, default))
         
         # Field position attributes (for visualization)
         self.field_x = 0.5  # 0.0 to 1.0 (percentage of field width)
         self.field_y = 0.5  # 0.0 to 1.0 (percentage of field height)
         
         # Match statistics
+        self.match_counters = array('l', _ZERO_COUNTERS)
         self.reset_match_stats()
         
+    @property
+    def attributes(self):
+        """Base attributes as a dict, in the form the player was created from"""
+        return {attribute_name: getattr(self, attribute_name) for attribute_name, _ in BASE_ATTRIBUTES}
+        
     def reset_match_stats(self):
         """Reset all match-related statistics"""
-        self.match_goals = 0
-        self.match_assists = 0
-        self.match_shots = 0
-        self.match_shots_on_target = 0
-        self.match_passes = 0
-        self.match_passes_completed = 0
-        self.match_tackles = 0
-        self.match_tackles_won = 0
-        self.match_fouls = 0
+        self.match_counters[:] = _ZERO_COUNTERS
+        self.match_minutes = 0  # Read on every fatigue check, so kept out of the array
         self.match_distance = 0
-        self.match_minutes = 0
-        self.match_saves = 0  # For goalkeepers
         self.match_yellow_card = False
         self.match_red_card = False
         self.current_fatigue = 0
         self.substitution_boost = 1.0  # Fresh players might get a boost
         self.injury_status = None  # None, "minor", "moderate", "severe"
         
+        # Fatigue lookup for this match, see calculate_fatigue
+        self.fatigue_table = fatigue_curve(self.stamina, self.get_position_workload())
+        self.fatigue_position = self.position
+        self.fatigue_key = None  # (current minute, minute on) of fatigue_value
+        self.fatigue_value = 0
+        
+    def match_state(self):
+        """Counters plus MATCH_STATE values as one flat list of plain values, for engine snapshots"""
+        return list(self.match_counters) + [getattr(self, name) for name in MATCH_STATE]
+        
+    def restore_match_state(self, state):
+        """Inverse of match_state()"""
+        counters = len(MATCH_COUNTERS)
+        if len(state) != counters + len(MATCH_STATE):
+            raise ValueError(f"Player state for {self.name} has {len(state)} values, expected {counters + len(MATCH_STATE)}")
+        self.match_counters[:] = array('l', state[:counters])
+        for name, value in zip(MATCH_STATE, state[counters:]):
+            setattr(self, name, value)
+        self.fatigue_key = None  # Recomputed from the restored minutes on the next lookup
+        
     def calculate_fatigue(self, current_minute):
         """
         Calculate player's current fatigue level based on minutes played, 
-        stamina, and position
+        stamina, and position.
+        
+        The curve is looked up in a table built at match setup, and the
+        result is reused until the minute or the player's minute on changes.
         """
+        key = (current_minute, self.match_minutes)
+        if key == self.fatigue_key:
+            return self.fatigue_value
+        
         # No fatigue if not playing
         if self.match_minutes == 0 or current_minute < self.match_minutes:
-            return 0
-        
-        # Base fatigue increases with time, but with diminishing returns
-        minutes_played = min(current_minute, 90) - self.match_minutes
-        if minutes_played <= 0:
-            return 0
-            
-        # Calculate fatigue curve - increases faster in later minutes
-        base_fatigue = (minutes_played / 90.0) ** 1.2 * 10
-        
-        # Stamina factor - better stamina reduces fatigue impact
-        # Scale from 0.5 (best stamina) to 1.5 (worst stamina)
-        stamina_factor = 1.5 - (self.stamina / 20.0)
-        
-        # Position factor - different positions have different workloads
-        position_factor = self.get_position_workload()
-        
-        # Calculate total fatigue
-        self.current_fatigue = base_fatigue * stamina_factor * position_factor
+            fatigue = 0
+        else:
+            # Base fatigue increases with time, but with diminishing returns
+            minutes_played = min(current_minute, 90) - self.match_minutes
+            if minutes_played <= 0:
+                fatigue = 0
+            else:
+                if self.position != self.fatigue_position:
+                    self.fatigue_table = fatigue_curve(self.stamina, self.get_position_workload())
+                    self.fatigue_position = self.position
+                
+                if isinstance(minutes_played, int):
+                    self.current_fatigue = self.fatigue_table[minutes_played]
+                else:
+                    self.current_fatigue = ((minutes_played / 90.0) ** 1.2 * 10 *
+                                            (1.5 - (self.stamina / 20.0)) * self.get_position_workload())
+                
+                # Ensure fatigue is between 0-1
+                fatigue = max(0, min(1, self.current_fatigue / 10))
         
-        # Ensure fatigue is between 0-1
-        return max(0, min(1, self.current_fatigue / 10))
+        self.fatigue_key = key
+        self.fatigue_value = fatigue
+        return fatigue
         
     def get_position_workload(self):
         """
         Get position-specific workload factor
         Higher values = more fatigue for position
         """
-        # Central midfielders and wing-backs typically cover more ground
-        if self.position in ['CM', 'LWB', 'RWB']:
-            return 1.2
-        # Wide midfielders and wingers also run a lot
-        elif self.position in ['LM', 'RM', 'LW', 'RW']:
-            return 1.15
-        # Strikers, attacking midfielders, defensive midfielders with average workload
-        elif self.position in ['ST', 'AM', 'DM']:
-            return 1.0
-        # Defenders have less total running but more high-intensity bursts
-        elif self.position in ['CB', 'LB', 'RB']:
-            return 0.9
-        # Goalkeepers have the least running
-        elif self.position == 'GK':
-            return 0.5
-        # Default for positions not specifically handled
-        else:
-            return 1.0
+        return POSITION_WORKLOAD.get(self.position, 1.0)
         
-    def get_effective_attribute(self, attribute_name, current_minute=None):
+    def get_effective_attribute(self, attribute_name, current_minute=None, rng=None):
         """
         Get attribute value adjusted for fatigue, substitution boost and other factors.
         This provides a dynamic performance model throughout the match.
+        Pass the match's rng to keep the run reproducible.
         """
-        # Get base attribute value
-        base_value = getattr(self, attribute_name, 10)
-        
         if current_minute is not None:
-            # Apply fatigue penalty
-            fatigue = self.calculate_fatigue(current_minute)
-            fatigue_penalty = fatigue * 5  # Up to 5 point reduction at max fatigue
-            
-            # Apply substitution boost for recently substituted players
-            boost_value = base_value * (self.substitution_boost - 1.0)
-            
-            # Reduce substitution boost over time
-            if self.substitution_boost > 1.0:
-                minutes_since_sub = current_minute - self.match_minutes
-                if minutes_since_sub > 15:  # Boost lasts 15 minutes
-                    self.substitution_boost = 1.0
-                else:
-                    # Gradually decrease boost
-                    self.substitution_boost = 1.0 + (0.1 * (15 - minutes_since_sub) / 15)
-            
             # Random variation factor - players have good and bad moments
-            variation = random.uniform(-0.5, 0.5)
+            variation = (rng or random).uniform(-0.5, 0.5)
             
             # Calculate final value
-            final_value = base_value - fatigue_penalty + boost_value + variation
+            final_value = self.get_match_attribute(attribute_name, current_minute) + variation
             
             # Ensure value stays in reasonable range
             return max(1, min(20, final_value))
         
-        return base_value
+        return getattr(self, attribute_name, 10)
+        
+    def get_match_attribute(self, attribute_name, current_minute):
+        """
+        Get attribute value adjusted for fatigue and substitution boost, without
+        the per-action random variation. Team rating caches build on this.
+        """
+        # Get base attribute value
+        base_value = getattr(self, attribute_name, 10)
+        
+        # Apply fatigue penalty
+        fatigue = self.calculate_fatigue(current_minute)
+        fatigue_penalty = fatigue * 5  # Up to 5 point reduction at max fatigue
+        
+        # Apply substitution boost for recently substituted players
+        boost_value = base_value * (self.substitution_boost - 1.0)
+        
+        # Reduce substitution boost over time
+        if self.substitution_boost > 1.0:
+            minutes_since_sub = current_minute - self.match_minutes
+            if minutes_since_sub > 15:  # Boost lasts 15 minutes
+                self.substitution_boost = 1.0
+            else:
+                # Gradually decrease boost
+                self.substitution_boost = 1.0 + (0.1 * (15 - minutes_since_sub) / 15)
+        
+        return base_value - fatigue_penalty + boost_value
         
     def calculate_match_rating(self):
         """
@@ -0,0 +1,61 @@
+# esms/engine/positions.py
+import random
+
+# Position groups used when picking a player for an action
+POSITION_GROUPS = {
+    'forward': ['ST', 'CF', 'LF', 'RF', 'LW', 'RW'],
+    'midfielder': ['CM', 'DM', 'AM', 'LM', 'RM'],
+    'winger': ['LW', 'RW', 'LM', 'RM'],
+    'defender': ['CB', 'LB', 'RB', 'LWB', 'RWB'],
+    'goalkeeper': ['GK']
+}
+
+
+class PositionIndex:
+    """
+    Per-team lists of the players who can still take part in play, split by
+    position group. Rebuilt only when the lineup changes (substitution, red
+    card), so picking a player does not scan the whole team.
+    """
+    def __init__(self, team, rng=random):
+        self.team = team
+        self.rng = rng
+        self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the group lists from the team's current players"""
+        self.available = [p for p in self.team.players if not p.match_red_card]
+        self.groups = {
+            group: [p for p in self.available if p.position in positions]
+            for group, positions in POSITION_GROUPS.items()
+        }
+
+    def select(self, preference=None, exclude=None):
+        """Pick a player, preferring the given group and skipping excluded players"""
+        if preference == 'goalkeeper':
+            for player in self.groups['goalkeeper']:
+                if not exclude or player not in exclude:
+                    return player
+        elif preference in self.groups:
+            player = self._choose(self.groups[preference], exclude, self.rng)
+            if player is not None:
+                return player
+                
+        player = self._choose(self.available, exclude, self.rng)
+        if player is None:
+            # Fallback to first player if no others available
+            return self.team.players[0] if self.team.players else None
+        return player
+
+    @staticmethod
+    def _choose(players, exclude, rng):
+        """Uniform choice among players not in exclude, or None"""
+        if not players:
+            return None
+        player = rng.choice(players)
+        if not exclude or player not in exclude:
+            return player
+        
+        # Rare path: the draw hit an excluded player, choose among the rest
+        remaining = [p for p in players if p not in exclude]
+        return rng.choice(remaining) if remaining else None
@@ -0,0 +1,113 @@
+# esms/engine/probability.py
+"""
+Precomputed outcome probabilities for the fast engine modes.
+
+Every action in the engine draws a random variation of +-0.5 for each skill
+involved and then compares another random number with a formula such as
+0.3 + shooting / 40 or (crossing - defending + 10) / 30. For a given pair of
+players the chance of each outcome is therefore fixed, so it can be worked
+out once per pairing: the variation is quantised to NODES evenly spaced
+values, the formula is evaluated for every combination and averaged. An
+action then needs one table lookup and one uniform draw instead of two
+variations, the formula and a draw.
+
+max_error() checks the tables against a much finer quadrature of the same
+formulas.
+"""
+import numpy as np
+
+# Quantisation of the per-action skill variation
+NODES = 16
+
+
+def variation(nodes=NODES):
+    """Midpoints of `nodes` equal slices of the uniform(-0.5, 0.5) variation"""
+    return (np.arange(nodes) + 0.5) / nodes - 0.5
+
+
+def quantised_skill(base, factor=1.0, nodes=NODES):
+    """Effective skill at every variation node, shape base.shape + (nodes,)"""
+    base = np.asarray(base, dtype=float)
+    return np.clip(base[..., None] + variation(nodes), 1, 20) * np.asarray(factor, dtype=float)[..., None]
+
+
+def shot_chances(shooting, central, goalkeeping, distance):
+    """
+    Chances that process_goal_attempt scores and that it hits the target,
+    for each shooter (rows of shooting) against each keeper (rows of
+    goalkeeping). Both are (players, nodes) from quantised_skill; central
+    flags shooters who get the ST/CF/AM bonus. Returns (goal, on_target),
+    each (shooters, keepers).
+    """
+    on_target = np.clip(0.3 + shooting / 40 + np.where(central, 0.05, 0.0)[:, None], 0, 1)
+    save = (0.6 + goalkeeping / 50)[None, None, :, :]
+    save = save - np.where(shooting > 15, 0.1, 0.0)[:, :, None, None] + (0.1 if distance else 0.0)
+    goal = (on_target[:, :, None, None] * np.clip(1 - save, 0, 1)).mean(axis=(1, 3))
+    return goal, np.broadcast_to(on_target.mean(axis=1)[:, None], goal.shape).copy()
+
+
+def contest_chances(attack, defence, offset=10, scale=30):
+    """Chance that clip((attack - defence + offset) / scale) succeeds, (attackers, defenders)"""
+    chance = (attack[:, :, None, None] - defence[None, None, :, :] + offset) / scale
+    return np.clip(chance, 0, 1).mean(axis=(1, 3))
+
+
+def threshold_chances(skill, offset, scale):
+    """Chance that clip((skill - offset) / scale) succeeds, one per player"""
+    return np.clip((skill - offset) / scale, 0, 1).mean(axis=1)
+
+
+def max_error(nodes=NODES, reference_nodes=128, step=0.3):
+    """
+    Largest absolute difference between tables built with `nodes` and with
+    `reference_nodes` variation nodes, over skills from 1 to 20 in `step`
+    increments. Returns {'goal', 'on_target', 'contest', 'threshold'}.
+    """
+    skills = np.arange(1, 20 + step / 2, step)
+    central = np.zeros(len(skills), dtype=bool)
+    coarse = quantised_skill(skills, nodes=nodes)
+    fine = quantised_skill(skills, nodes=reference_nodes)
+    errors = {'goal': 0.0, 'on_target': 0.0, 'contest': 0.0}
+
+    # One opposing skill at a time keeps the reference tables small
+    for i in range(len(skills)):
+        for distance in (False, True):
+            goal, on_target = shot_chances(coarse, central, coarse[i:i + 1], distance)
+            fine_goal, fine_on_target = shot_chances(fine, central, fine[i:i + 1], distance)
+            errors['goal'] = max(errors['goal'], float(np.abs(goal - fine_goal).max()))
+            errors['on_target'] = max(errors['on_target'], float(np.abs(on_target - fine_on_target).max()))
+        errors['contest'] = max(errors['contest'], float(np.abs(
+            contest_chances(coarse, coarse[i:i + 1]) - contest_chances(fine, fine[i:i + 1])).max()))
+
+    errors['threshold'] = float(np.abs(threshold_chances(coarse, 5, 20) - threshold_chances(fine, 5, 20)).max())
+    return errors
+
+
+class UniformBuffer:
+    """
+    Uniform random numbers generated in large blocks and handed out in
+    slices, with the random() / integers() calls of numpy's Generator that
+    the vector engine uses.
+    """
+    def __init__(self, rng, size=1 << 16):
+        if size < 1:
+            raise ValueError("UniformBuffer size must be at least 1")
+        self.rng = rng
+        self.size = size
+        self.buffer = rng.random(size)
+        self.position = 0
+
+    def random(self, n):
+        """Next n uniforms in [0, 1)"""
+        if n > self.size:
+            return self.rng.random(n)
+        if self.position + n > self.size:
+            self.buffer = self.rng.random(self.size)
+            self.position = 0
+        values = self.buffer[self.position:self.position + n]
+        self.position += n
+        return values
+
+    def integers(self, low, high, n):
+        """Next n integers in [low, high)"""
+        return low + (self.random(n) * (high - low)).astype(np.int64)
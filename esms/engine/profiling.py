@@ -0,0 +1,80 @@
+# esms/engine/profiling.py
+"""
+Per-phase timing of EnhancedMatchEngine.
+
+A PhaseProfile replaces the engine methods listed in PHASES with timed
+wrappers set on that one engine instance, so engines without a profile run
+the plain class methods and pay nothing. Times are inclusive: attacking
+play includes the goal attempts and fouls it leads to.
+"""
+import functools
+from time import perf_counter
+
+# Phase name -> EnhancedMatchEngine method that implements it
+PHASES = {
+    'possession': 'update_possession',
+    'field_position': 'update_field_position',
+    'goal_attempt': 'process_goal_attempt',
+    'attacking_play': 'process_attacking_play',
+    'midfield_play': 'process_midfield_play',
+    'fouls': 'process_foul',
+    'substitutions': 'check_for_substitutions',
+    'fatigue': 'update_player_condition',
+    'stats': 'generate_match_stats'
+}
+
+
+class PhaseProfile:
+    """Call counts and cumulative seconds per phase of one engine"""
+    def __init__(self):
+        self.counts = dict.fromkeys(PHASES, 0)
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+
+    def attach(self, engine):
+        """Start timing engine's phases"""
+        for phase, method in PHASES.items():
+            setattr(engine, method, self._timed(phase, getattr(type(engine), method).__get__(engine)))
+
+    @staticmethod
+    def detach(engine):
+        """Go back to the untimed class methods"""
+        for method in PHASES.values():
+            engine.__dict__.pop(method, None)
+
+    def _timed(self, phase, method):
+        counts = self.counts
+        seconds = self.seconds
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[phase] += perf_counter() - start
+                counts[phase] += 1
+        return timed
+
+    def reset(self):
+        """Zero every counter"""
+        for phase in PHASES:
+            self.counts[phase] = 0
+            self.seconds[phase] = 0.0
+
+    def report(self):
+        """{phase: {'calls', 'seconds', 'mean_us'}} in PHASES order"""
+        return {
+            phase: {
+                'calls': self.counts[phase],
+                'seconds': self.seconds[phase],
+                'mean_us': self.seconds[phase] / self.counts[phase] * 1e6 if self.counts[phase] else 0.0
+            }
+            for phase in PHASES
+        }
+
+    def format(self):
+        """The report as a text table, slowest phase first"""
+        lines = [f"{'phase':<16}{'calls':>10}{'seconds':>12}{'mean us':>10}"]
+        for phase, row in sorted(self.report().items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{phase:<16}{row['calls']:>10}{row['seconds']:>12.4f}{row['mean_us']:>10.1f}")
+        return '\n'.join(lines)
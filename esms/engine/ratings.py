@@ -0,0 +1,67 @@
+# esms/engine/ratings.py
+import random
+
+MIDFIELD_POSITIONS = ['CM', 'DM', 'AM', 'LM', 'RM']
+
+# Standard deviation of the uniform(-0.5, 0.5) variation in get_effective_attribute
+PLAYER_VARIATION_SD = (1 / 12) ** 0.5
+
+
+class TeamRatings:
+    """
+    Cache of a team's fatigue-adjusted aggregate ratings for the match engine.
+
+    Aggregates are rebuilt at most once per match minute, or after invalidate()
+    when the lineup changes (substitution, red card). The per-action random
+    variation of each player is replaced by a single draw with the spread of
+    the average over the group.
+    """
+    def __init__(self, team, rng=random):
+        self.team = team
+        self.rng = rng
+        self.minute = None
+        self.passing = 10
+        self.passing_spread = 0
+        self.midfield = None  # None if the team has no midfielders
+        self.midfield_spread = 0
+
+    def invalidate(self):
+        """Force a rebuild on the next lookup"""
+        self.minute = None
+
+    def refresh(self, minute):
+        """Rebuild the aggregates if they are not for the given minute"""
+        if minute == self.minute:
+            return
+        
+        # Sent-off players no longer contribute to the team
+        players = [p for p in self.team.players if not p.match_red_card] or self.team.players
+        
+        passing = [max(1, min(20, p.get_match_attribute('passing', minute))) for p in players]
+        self.passing = sum(passing) / len(passing)
+        self.passing_spread = PLAYER_VARIATION_SD / len(passing) ** 0.5
+        
+        midfield_passing = [value for p, value in zip(players, passing) if p.position in MIDFIELD_POSITIONS]
+        if midfield_passing:
+            midfield_technique = [max(1, min(20, p.get_match_attribute('technique', minute)))
+                                  for p in players if p.position in MIDFIELD_POSITIONS]
+            count = len(midfield_passing)
+            self.midfield = (sum(midfield_passing) / count + sum(midfield_technique) / count) / 2
+            self.midfield_spread = PLAYER_VARIATION_SD / (2 * count) ** 0.5
+        else:
+            self.midfield = None
+            self.midfield_spread = 0
+        
+        self.minute = minute
+
+    def average_passing(self, minute):
+        """Average effective passing of the team, with random variation"""
+        self.refresh(minute)
+        return self.passing + self.rng.gauss(0, self.passing_spread)
+
+    def midfield_quality(self, minute):
+        """Average of midfield passing and technique, or None without midfielders"""
+        self.refresh(minute)
+        if self.midfield is None:
+            return None
+        return self.midfield + self.rng.gauss(0, self.midfield_spread)
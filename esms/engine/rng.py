@@ -0,0 +1,15 @@
+# esms/engine/rng.py
+"""Random number streams for the match engine"""
+import hashlib
+import random
+
+
+def match_seed(match_id, base_seed=0):
+    """Deterministic seed for a match, independent of run order and worker"""
+    digest = hashlib.sha256(f"{base_seed}:{match_id}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def make_rng(seed=None):
+    """Create an independent random generator; a None seed draws from the OS"""
+    return random.Random(seed)
@@ -1,5 +1,128 @@
 # esms/engine/tactics.py
 import os
+from array import array
+
+# Position groups and skills of the classic tactics.dat format
+TACTIC_GROUPS = ('DF', 'DM', 'MF', 'AM', 'FW')
+TACTIC_SKILLS = ('TK', 'PS', 'SH')
+TK, PS, SH = range(len(TACTIC_SKILLS))
+
+# Tactic group index of each engine position (goalkeepers have none)
+POSITION_TACTIC_GROUP = {
+    'CB': 0, 'LB': 0, 'RB': 0, 'LWB': 0, 'RWB': 0,
+    'DM': 1,
+    'CM': 2, 'LM': 2, 'RM': 2,
+    'AM': 3,
+    'ST': 4, 'CF': 4, 'LF': 4, 'RF': 4, 'LW': 4, 'RW': 4
+}
+
+
+class TacticsTable:
+    """
+    Dense multiplier table indexed by tactic x opponent tactic x position
+    group x skill, stored flat so a lookup is a single array index.
+    Each entry is the tactic's MULT value plus any BONUS against the opponent.
+    """
+    def __init__(self, codes, multipliers=None, bonuses=None):
+        self.codes = tuple(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.block = len(TACTIC_GROUPS) * len(TACTIC_SKILLS)
+        self.values = array('d', [0.0]) * (len(self.codes) ** 2 * self.block)
+        
+        # multipliers: {(tactic, group, skill): value}
+        for (tactic, group, skill), value in (multipliers or {}).items():
+            for opponent in self.codes:
+                self.values[self.offset(tactic, opponent) + group * len(TACTIC_SKILLS) + skill] = value
+                
+        # bonuses: {(tactic, opponent, group, skill): value}
+        for (tactic, opponent, group, skill), value in (bonuses or {}).items():
+            self.values[self.offset(tactic, opponent) + group * len(TACTIC_SKILLS) + skill] += value
+    
+    def offset(self, tactic, opponent):
+        """Start of the (tactic, opponent) block - unknown codes use the first tactic"""
+        t = self.index.get(tactic, 0)
+        o = self.index.get(opponent, 0)
+        return (t * len(self.codes) + o) * self.block
+    
+    def multiplier(self, tactic, opponent, group, skill):
+        """Multiplier for a position group and skill index"""
+        return self.values[self.offset(tactic, opponent) + group * len(TACTIC_SKILLS) + skill]
+    
+    def matchup(self, tactic, opponent):
+        """All multipliers of a matchup, indexed by group * len(TACTIC_SKILLS) + skill"""
+        start = self.offset(tactic, opponent)
+        return tuple(self.values[start:start + self.block])
+    
+    def relative(self, tactic, opponent, baseline='N', weight=1.0):
+        """
+        Matchup multipliers divided by the baseline tactic's (against itself),
+        then pulled towards 1 by weight. The baseline tactic always gives 1.0,
+        as do entries the baseline leaves at zero.
+        """
+        base = self.matchup(baseline, baseline)
+        return tuple(
+            1 + weight * (value / reference - 1) if reference else 1.0
+            for value, reference in zip(self.matchup(tactic, opponent), base)
+        )
+
+
+def position_factor(factors, position, skill):
+    """Factor for a player's position from a relative matchup row (1.0 without a group)"""
+    group = POSITION_TACTIC_GROUP.get(position)
+    if group is None:
+        return 1.0
+    return factors[group * len(TACTIC_SKILLS) + skill]
+
+
+def read_tactics_file(tactics_file):
+    """
+    Parse a classic tactics.dat file:
+        TACTIC <code> <name>
+        MULT <tactic> <group> <skill> <value>
+        BONUS <tactic> <opponent> <group> <skill> <value>
+    Lines starting with # are comments. Tactics must be declared before use.
+    Returns (codes, names, table); table is None if no tactics are declared.
+    """
+    codes = []
+    names = {}
+    multipliers = {}
+    bonuses = {}
+    
+    def check_tactic(code):
+        if code not in names:
+            raise ValueError(f"tactic '{code}' used before its TACTIC line")
+    
+    with open(tactics_file, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+                
+            keyword = fields[0].upper()
+            try:
+                if keyword == 'TACTIC' and len(fields) >= 3:
+                    if fields[1] not in names:
+                        codes.append(fields[1])
+                    names[fields[1]] = fields[2].replace('_', ' ')
+                elif keyword == 'MULT' and len(fields) == 5:
+                    tactic, group, skill, value = fields[1:]
+                    check_tactic(tactic)
+                    key = (tactic, TACTIC_GROUPS.index(group), TACTIC_SKILLS.index(skill))
+                    multipliers[key] = float(value)
+                elif keyword == 'BONUS' and len(fields) == 6:
+                    tactic, opponent, group, skill, value = fields[1:]
+                    check_tactic(tactic)
+                    check_tactic(opponent)
+                    key = (tactic, opponent, TACTIC_GROUPS.index(group), TACTIC_SKILLS.index(skill))
+                    bonuses[key] = bonuses.get(key, 0.0) + float(value)
+                else:
+                    raise ValueError(f"unrecognised line '{line.strip()}'")
+            except ValueError as e:
+                raise ValueError(f"{tactics_file}:{line_number}: {e}") from None
+                
+    table = TacticsTable(codes, multipliers, bonuses) if codes else None
+    return codes, names, table
+
 
 class TacticsManager:
     _instance = None
@@ -27,41 +150,25 @@ class TacticsManager:
         self.initialized = True
     
     def load_tactics(self, tactics_file):
-        """Load tactics from file"""
-        # This is a placeholder - you'll implement the actual loading logic later
-        print(f"Would load tactics from {tactics_file}")
+        """Load tactics from a classic tactics.dat file, see read_tactics_file"""
+        codes, names, table = read_tactics_file(tactics_file)
+        if not codes:
+            return
+            
+        self.table = table
+        for code in codes:
+            self.tactics[code] = {'name': names[code]}
             
     def _init_default_tactics(self):
         """Initialize default tactics if file loading fails"""
         self.tactics = {
-            'N': {
-                'name': 'Normal',
-                'effects': {
-                    'attacking_boost': 0,
-                    'defensive_boost': 0,
-                    'attacking_penalty': 0,
-                    'defensive_penalty': 0
-                }
-            },
-            'A': {
-                'name': 'Attacking',
-                'effects': {
-                    'attacking_boost': 2,
-                    'defensive_boost': 0,
-                    'attacking_penalty': 0,
-                    'defensive_penalty': 1
-                }
-            },
-            'D': {
-                'name': 'Defensive',
-                'effects': {
-                    'attacking_boost': 0,
-                    'defensive_boost': 2,
-                    'attacking_penalty': 1,
-                    'defensive_penalty': 0
-                }
-            }
+            'N': {'name': 'Normal'},
+            'A': {'name': 'Attacking'},
+            'D': {'name': 'Defensive'}
         }
+        
+        # Without a tactics file every multiplier is neutral
+        self.table = TacticsTable(self.tactics.keys())
     
     def tactic_exists(self, tactic_code):
         """Check if a tactic code exists"""
@@ -75,11 +182,11 @@ class TacticsManager:
             return "Unknown"
         return self.tactics[tactic_code]['name']
     
-    def get_tactic_effects(self, tactic_code):
-        """Get the effects of a tactic from its code"""
-        if not self.initialized or tactic_code not in self.tactics:
-            return {}
-        return self.tactics[tactic_code]['effects']
+    def get_table(self):
+        """Get the compiled multiplier table"""
+        if not self.initialized:
+            return TacticsTable(['N'])
+        return self.table
     
     def get_all_tactics(self):
         """Get all available tactics"""
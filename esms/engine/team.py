@@ -0,0 +1,15 @@
+# esms/engine/team.py
+class Team:
+    """
+    Represents a team in the match simulation engine: a name, a tactic code,
+    a formation and the engine players currently on the pitch.
+    """
+    def __init__(self, name, tactic='N', formation='4-4-2'):
+        self.name = name
+        self.tactic = tactic
+        self.formation = formation
+        self.players = []
+
+    def add_player(self, player):
+        """Add an engine player to the team"""
+        self.players.append(player)
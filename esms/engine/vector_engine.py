@@ -0,0 +1,576 @@
+# esms/engine/vector_engine.py
+"""
+Vectorised match engine backend.
+
+Keeps team and player attributes in NumPy arrays and advances thousands of
+independent matches together, one event step at a time. Each step follows the
+zone/possession/momentum model of EnhancedMatchEngine (update_possession,
+update_field_position, process_goal_attempt, process_attacking_play,
+process_midfield_play, process_foul and update_momentum), but only scores and
+team statistics are kept - no events, commentary or player stats.
+
+Known differences from the scalar engine:
+- No substitutions are made, the starting eleven play the whole match
+- Red-carded players can still be picked for actions
+- The fatigue penalty is left out (it stays below 0.1 of a skill point
+  in the scalar model)
+
+By default each action's outcome comes from per-pairing probability tables
+(see esms.engine.probability) and one uniform draw taken from a bulk
+buffer, rather than from two random skill variations and the formula.
+"""
+import numpy as np
+
+from esms.engine.match_engine import EnhancedMatchEngine
+from esms.engine.positions import POSITION_GROUPS
+from esms.engine.tactics import position_factor, TK, PS, SH
+from esms.engine.probability import (
+    quantised_skill, shot_chances, contest_chances, threshold_chances, UniformBuffer
+)
+
+# Skill columns of the player attribute table
+SKILLS = ('passing', 'technique', 'shooting', 'tackling', 'goalkeeper')
+PASSING, TECHNIQUE, SHOOTING, TACKLING, GOALKEEPER = range(len(SKILLS))
+
+# tactics.dat skill behind each skill column (None: not affected by tactics)
+TACTIC_SKILL = (PS, None, SH, TK, None)
+
+# Player groups, matching the preferences of select_player_for_action
+GROUP_POSITIONS = tuple(POSITION_GROUPS[group] for group in
+                        ('forward', 'midfielder', 'winger', 'defender', 'goalkeeper'))
+FORWARD, MIDFIELDER, WINGER, DEFENDER, KEEPER, ANY = range(len(GROUP_POSITIONS) + 1)
+MIDFIELD_POSITIONS = ('CM', 'DM', 'AM', 'LM', 'RM')
+CENTRAL_POSITIONS = ('ST', 'CF', 'AM')
+
+TACTICS = ('N', 'A', 'D', 'P', 'C', 'L')
+TACTIC_INDEX = {code: index for index, code in enumerate(TACTICS)}
+
+# Forward movement adjustment per tactic (counter is handled separately)
+FORWARD_ADJUSTMENT = np.array([0.0, 0.1, -0.1, 0.0, 0.0, 0.0])
+
+# Event step modes
+GOAL_ATTEMPT, ATTACKING_PLAY, MIDFIELD_PLAY = range(3)
+
+# Attacking play event columns
+SHOT, CROSS, THROUGH_BALL, DRIBBLE, PASS = range(5)
+
+# Match phases
+FIRST_HALF, SECOND_HALF, INJURY_TIME, FINISHED = 1, 2, 3, 4
+
+
+def _attacking_play_weights():
+    """Cumulative attacking play weights indexed by [tactic, in_box, event]"""
+    table = np.zeros((len(TACTICS), 2, 5))
+    for tactic, code in enumerate(TACTICS):
+        for in_box in (0, 1):
+            if in_box:
+                weights = [0.5, 0.15, 0.15, 0.15, 0.05]
+            else:
+                weights = [0.2, 0.3, 0.25, 0.15, 0.1]
+            if code == 'A':
+                weights[SHOT] += 0.1
+            elif code == 'P':
+                weights[PASS] += 0.1
+            elif code == 'C':
+                weights[THROUGH_BALL] += 0.1
+            table[tactic, in_box] = np.cumsum(weights) / sum(weights)
+    return table
+
+
+ATTACKING_PLAY_WEIGHTS = _attacking_play_weights()
+
+# Cumulative midfield play weights: pass, dribble, tackle, foul
+MIDFIELD_PLAY_WEIGHTS = np.array([0.5, 0.7, 0.9, 1.0])
+MIDFIELD_TACKLE, MIDFIELD_FOUL = 2, 3
+
+
+class _TeamTable:
+    """Player attributes and position groups of a set of teams as dense arrays"""
+    def __init__(self, teams):
+        size = max(len(team.players) for team in teams)
+        groups = len(GROUP_POSITIONS) + 1
+
+        self.skills = np.full((len(teams), size, len(SKILLS)), 10.0)
+        self.central = np.zeros((len(teams), size), dtype=bool)
+        self.members = np.zeros((len(teams), groups, size), dtype=np.int64)
+        self.group_size = np.zeros((len(teams), groups), dtype=np.int64)
+        self.tactic = np.zeros(len(teams), dtype=np.int64)
+        self.avg_passing = np.zeros(len(teams))
+        self.midfield_quality = np.zeros(len(teams))
+        self.has_midfield = np.zeros(len(teams), dtype=bool)
+
+        # Tactical effects depend on the opponent: indexed by [team, opponent, ...]
+        self.factors = np.ones((len(teams), len(teams), size, len(SKILLS)))
+        self.passing_boost = np.zeros((len(teams), len(teams)))
+        self.outcomes = None  # _OutcomeTables, when the engine uses them
+
+        for t, team in enumerate(teams):
+            players = team.players
+            if not players:
+                raise ValueError(f"Team {team.name} has no players")
+
+            for p, player in enumerate(players):
+                for s, skill in enumerate(SKILLS):
+                    self.skills[t, p, s] = getattr(player, skill, 10)
+                self.central[t, p] = player.position in CENTRAL_POSITIONS
+
+            for g in range(groups):
+                if g == ANY:
+                    chosen = []
+                else:
+                    chosen = [p for p, player in enumerate(players) if player.position in GROUP_POSITIONS[g]]
+                    if g == KEEPER:
+                        chosen = chosen[:1]  # Always the first goalkeeper
+                if not chosen:
+                    chosen = list(range(len(players)))
+                self.members[t, g, :len(chosen)] = chosen
+                self.group_size[t, g] = len(chosen)
+
+            self.tactic[t] = TACTIC_INDEX.get(team.tactic, 0)
+            self.avg_passing[t] = self.skills[t, :len(players), PASSING].mean()
+
+            midfielders = [p for p, player in enumerate(players) if player.position in MIDFIELD_POSITIONS]
+            if midfielders:
+                avg_passing = self.skills[t, midfielders, PASSING].mean()
+                avg_technique = self.skills[t, midfielders, TECHNIQUE].mean()
+                self.midfield_quality[t] = (avg_passing + avg_technique) / 2
+                self.has_midfield[t] = True
+            else:
+                self.midfield_quality[t] = 10
+
+    def add_matchup(self, t, o, team):
+        """Store the tactical effects applied to team (index t) against opponent o"""
+        self.passing_boost[t, o] = team.temp_passing_boost
+        for p, player in enumerate(team.players):
+            for s, skill in enumerate(TACTIC_SKILL):
+                if skill is not None:
+                    self.factors[t, o, p, s] = position_factor(team.tactic_factors, player.position, skill)
+
+
+class _OutcomeTables:
+    """
+    Chance of each action's outcome for every pair of players, indexed by
+    [team, opponent, player, opposing player]. Tackles are indexed from the
+    tackling team's side.
+    """
+    def __init__(self, table, pairs):
+        teams, size = table.skills.shape[:2]
+        self.goal = np.zeros((teams, teams, size, size, 2))  # Last axis: shot from outside the box
+        self.on_target = np.zeros((teams, teams, size, size, 2))
+        self.cross = np.zeros((teams, teams, size, size))
+        self.through = np.zeros((teams, teams, size))
+        self.dribble = np.zeros((teams, teams, size, size))
+        self.tackle = np.zeros((teams, teams, size, size))
+        for t, o in pairs:
+            self.add_matchup(table, t, o)
+
+    def add_matchup(self, table, t, o):
+        """Fill in the actions of team t (index) against opponent o"""
+        players = table.group_size[t, ANY]
+        opponents = table.group_size[o, ANY]
+
+        def skill(team, opponent, count, column):
+            return quantised_skill(table.skills[team, :count, column], table.factors[team, opponent, :count, column])
+
+        passing = skill(t, o, players, PASSING)
+        technique = skill(t, o, players, TECHNIQUE)
+        shooting = skill(t, o, players, SHOOTING)
+        tackling = skill(o, t, opponents, TACKLING)
+        goalkeeping = skill(o, t, opponents, GOALKEEPER)
+
+        for distance in (0, 1):
+            goal, on_target = shot_chances(shooting, table.central[t, :players], goalkeeping, distance)
+            self.goal[t, o, :players, :opponents, distance] = goal
+            self.on_target[t, o, :players, :opponents, distance] = on_target
+        self.cross[t, o, :players, :opponents] = contest_chances(passing, tackling)
+        self.through[t, o, :players] = threshold_chances(passing, 5, 20)
+        self.dribble[t, o, :players, :opponents] = contest_chances(technique, tackling)
+        self.tackle[o, t, :opponents, :players] = contest_chances(tackling, technique)
+
+
+class VectorMatchEngine:
+    """
+    NumPy match engine that simulates large batches of matches in lockstep.
+    Use it for forecasts where only scores and team statistics are needed.
+    """
+    def __init__(self, config=None, context=None, outcome_tables=True):
+        self.config = config
+        self.context = context
+        self.outcome_tables = outcome_tables  # False: draw skill variations per action like the scalar engine
+
+    def simulate(self, home_team, away_team, n, seed=None):
+        """
+        Run n matches between two teams and return aggregated results in the
+        same format as EnhancedMatchEngine.simulate_many
+        """
+        results = self.simulate_fixtures([(home_team, away_team)], runs=n, seed=seed)
+        return self.summarise(results, home_team.name, away_team.name)
+
+    def simulate_fixtures(self, fixtures, runs=1, seed=None):
+        """
+        Simulate every (home_team, away_team) fixture `runs` times in one batch.
+
+        Returns a dict of arrays with one entry per simulated match; the
+        'fixture' array maps each entry back to its index in `fixtures`.
+        """
+        fixtures = list(fixtures)
+        if not fixtures:
+            raise ValueError("No fixtures to simulate")
+        if runs < 1:
+            raise ValueError("simulate_fixtures needs at least one run per fixture")
+
+        teams = []
+        team_index = {}
+        home_ids = []
+        away_ids = []
+        for home_team, away_team in fixtures:
+            for team in (home_team, away_team):
+                if id(team) not in team_index:
+                    team_index[id(team)] = len(teams)
+                    teams.append(team)
+            home_ids.append(team_index[id(home_team)])
+            away_ids.append(team_index[id(away_team)])
+
+        table = _TeamTable(teams)
+
+        # Reuse the scalar engine's tactical effects so both backends agree
+        scalar = EnhancedMatchEngine(self.config, context=self.context)
+        for (home_team, away_team), h, a in zip(fixtures, home_ids, away_ids):
+            scalar.apply_tactical_effects(home_team, away_team)
+            scalar.apply_tactical_effects(away_team, home_team)
+            table.add_matchup(h, a, home_team)
+            table.add_matchup(a, h, away_team)
+
+        if self.outcome_tables:
+            pairs = set(zip(home_ids, away_ids)) | set(zip(away_ids, home_ids))
+            table.outcomes = _OutcomeTables(table, pairs)
+
+        fixture = np.repeat(np.arange(len(fixtures)), runs)
+        pairings = np.stack([np.asarray(home_ids)[fixture], np.asarray(away_ids)[fixture]], axis=1)
+
+        results = self._run(table, pairings, np.random.default_rng(seed))
+        results['fixture'] = fixture
+        return results
+
+    def _run(self, table, pairings, rng):
+        """Advance all matches event by event until every one has finished"""
+        if table.outcomes is not None:
+            rng = UniformBuffer(rng)
+        m = len(pairings)
+        home, away = pairings[:, 0], pairings[:, 1]
+        squad_size = table.skills.shape[1]
+
+        minute = np.ones(m, dtype=np.int64)
+        end = np.full(m, 45, dtype=np.int64)
+        phase = np.full(m, FIRST_HALF, dtype=np.int64)
+        zone = np.full(m, 3, dtype=np.int64)
+        momentum = np.zeros(m)
+        injury_time = np.zeros(m, dtype=np.int64)
+        side = np.zeros(m, dtype=np.int64)  # 0 = home attacking, 1 = away attacking
+        mode = np.zeros(m, dtype=np.int64)
+
+        state = {
+            'score': np.zeros((m, 2), dtype=np.int64),
+            'shots': np.zeros((m, 2), dtype=np.int64),
+            'shots_on_target': np.zeros((m, 2), dtype=np.int64),
+            'fouls': np.zeros((m, 2), dtype=np.int64),
+            'corners': np.zeros((m, 2), dtype=np.int64),
+            'yellow_cards': np.zeros((m, 2), dtype=np.int64),
+            'red_cards': np.zeros((m, 2), dtype=np.int64),
+            'player_fouls': np.zeros((m, 2, squad_size), dtype=np.int64),
+            'booked': np.zeros((m, 2, squad_size), dtype=bool),
+        }
+        score = state['score']
+        possession = np.full(m, 50.0)
+
+        # Everything in update_possession except momentum is fixed for a pairing
+        base_possession = np.where(table.tactic[home] == TACTIC_INDEX['P'], 55.0,
+                                   np.where(table.tactic[away] == TACTIC_INDEX['P'], 45.0, 50.0))
+        possession_bias = (base_possession
+                           + (table.passing_boost[home, away] - table.passing_boost[away, home]) * 2
+                           + (table.avg_passing[home] - table.avg_passing[away]) / 4)
+        midfield_quality = table.midfield_quality[pairings] + np.where(
+            table.has_midfield[pairings], table.passing_boost[pairings, pairings[:, ::-1]], 0.0)
+
+        while True:
+            live = np.nonzero(phase < FINISHED)[0]
+            if not live.size:
+                break
+
+            in_injury_time = phase[live] == INJURY_TIME
+            increment = rng.integers(1, 4, live.size)
+            increment[in_injury_time] = rng.integers(1, 3, int(in_injury_time.sum()))
+            minute[live] = np.minimum(minute[live] + increment, end[live])
+
+            normal = live[~in_injury_time]
+            stoppage = live[in_injury_time]
+
+            if normal.size:
+                # update_possession
+                possession[normal] = np.clip(possession_bias[normal] - momentum[normal] * 0.5, 30, 70)
+                side[normal] = rng.random(normal.size) * 100 >= possession[normal]
+
+                # update_field_position
+                s = side[normal]
+                tactic = table.tactic[pairings[normal, s]]
+                z = zone[normal]
+                forward_prob = 0.6 + FORWARD_ADJUSTMENT[tactic]
+                forward_prob += np.where((tactic == TACTIC_INDEX['C']) & (z == 3), 0.15, 0.0)
+                forward_prob -= np.where(np.where(s == 0, z >= 4, z <= 2), 0.15, 0.0)
+                forward_prob += (midfield_quality[normal, s] - midfield_quality[normal, 1 - s]) * 0.01
+                direction = np.where(s == 0, 1, -1)
+                step = np.where(rng.random(normal.size) < forward_prob, direction, -direction)
+                zone[normal] = np.clip(z + step, 1, 5)
+
+                z = zone[normal]
+                mode[normal] = np.where((z == 1) | (z == 5), GOAL_ATTEMPT,
+                                        np.where((z == 2) | (z == 4), ATTACKING_PLAY, MIDFIELD_PLAY))
+
+            if stoppage.size:
+                # simulate_injury_time: the losing team attacks, otherwise a coin toss
+                attacking = rng.random(stoppage.size) < 0.6
+                score_diff = score[stoppage, 0] - score[stoppage, 1]
+                away_by_coin = rng.random(stoppage.size) >= 0.5
+                side[stoppage] = np.where(attacking & (score_diff < 0), 0,
+                                          np.where(attacking & (score_diff > 0), 1, away_by_coin))
+                mode[stoppage] = np.where(attacking, ATTACKING_PLAY, MIDFIELD_PLAY)
+
+            attempts = [live[mode[live] == GOAL_ATTEMPT]]
+            attacks = live[mode[live] == ATTACKING_PLAY]
+            if attacks.size:
+                attempts.append(self._attacking_play(table, pairings, side, zone, attacks, rng))
+            midfield = live[mode[live] == MIDFIELD_PLAY]
+            if midfield.size:
+                self._midfield_play(table, pairings, side, zone, momentum, injury_time, midfield, state, rng)
+            attempts = np.concatenate(attempts)
+            if attempts.size:
+                self._goal_attempt(table, pairings, side, zone, momentum, injury_time, attempts, state, rng)
+
+            if normal.size:
+                # update_momentum
+                current = momentum[normal]
+                current = np.where(current > 0, current - 0.2, np.where(current < 0, current + 0.2, current))
+                current -= np.where(rng.random(normal.size) < 0.1, 0.1, 0.0)
+                current -= 0.05 * (score[normal, 0] - score[normal, 1])
+                momentum[normal] = np.clip(current, -10, 10)
+
+                # process_injury only matters here for the injury time it adds
+                injured = normal[rng.random(normal.size) < 0.01]
+                if injured.size:
+                    severity = rng.random(injured.size)
+                    added = np.where(severity < 0.7, 0,
+                                     np.where(severity < 0.95, 1, rng.integers(2, 4, injured.size)))
+                    injury_time[injured] += added
+
+            # Move matches whose current period has ended on to the next one
+            ended = live[minute[live] >= end[live]]
+            if ended.size:
+                current_phase = phase[ended]
+                first_half = ended[current_phase == FIRST_HALF]
+                phase[first_half] = SECOND_HALF
+                minute[first_half] = 46
+                end[first_half] = 90
+
+                second_half = ended[current_phase == SECOND_HALF]
+                phase[second_half] = np.where(injury_time[second_half] > 0, INJURY_TIME, FINISHED)
+                end[second_half] = 90 + injury_time[second_half]
+
+                phase[ended[current_phase == INJURY_TIME]] = FINISHED
+
+        results = {
+            'home_possession': possession,
+            'away_possession': 100 - possession,
+            'injury_time': injury_time,
+        }
+        for stat in ('score', 'shots', 'shots_on_target', 'fouls', 'corners', 'yellow_cards', 'red_cards'):
+            results[f'home_{stat}'] = state[stat][:, 0]
+            results[f'away_{stat}'] = state[stat][:, 1]
+        return results
+
+    def _pick(self, table, teams, group, rng):
+        """Pick a player from `group` of each team, like select_player_for_action"""
+        sizes = table.group_size[teams, group]
+        slots = (rng.random(len(teams)) * sizes).astype(np.int64)
+        return table.members[teams, group, slots]
+
+    def _effective(self, table, teams, opponents, players, skill, rng):
+        """Player skill with the per-action random variation and tactic factor of tactical_attribute"""
+        skill_value = np.clip(table.skills[teams, players, skill] + rng.random(len(teams)) - 0.5, 1, 20)
+        return skill_value * table.factors[teams, opponents, players, skill]
+
+    def _attacking_play(self, table, pairings, side, zone, idx, rng):
+        """Vectorised process_attacking_play; returns the matches that end in a shot"""
+        s = side[idx]
+        team = pairings[idx, s]
+        opponent = pairings[idx, 1 - s]
+        z = zone[idx]
+        in_box = ((z == 1) | (z == 5)).astype(np.int64)
+
+        weights = ATTACKING_PLAY_WEIGHTS[table.tactic[team], in_box]
+        event = np.minimum((rng.random(idx.size)[:, None] >= weights).sum(axis=1), PASS)
+
+        shoots = event == SHOT
+        success = np.zeros(idx.size, dtype=bool)
+        follow_up = np.zeros(idx.size)
+
+        outcomes = table.outcomes
+
+        cross = np.nonzero(event == CROSS)[0]
+        if cross.size:
+            crosser = self._pick(table, team[cross], WINGER, rng)
+            defender = self._pick(table, opponent[cross], DEFENDER, rng)
+            if outcomes is not None:
+                chance = outcomes.cross[team[cross], opponent[cross], crosser, defender]
+            else:
+                crossing = self._effective(table, team[cross], opponent[cross], crosser, PASSING, rng)
+                defending = self._effective(table, opponent[cross], team[cross], defender, TACKLING, rng)
+                chance = (crossing - defending + 10) / 30
+            success[cross] = rng.random(cross.size) < chance
+            follow_up[cross] = 0.6
+
+        through = np.nonzero(event == THROUGH_BALL)[0]
+        if through.size:
+            passer = self._pick(table, team[through], MIDFIELDER, rng)
+            if outcomes is not None:
+                chance = outcomes.through[team[through], opponent[through], passer]
+            else:
+                passing = self._effective(table, team[through], opponent[through], passer, PASSING, rng)
+                chance = (passing - 5) / 20
+            success[through] = rng.random(through.size) < chance
+            follow_up[through] = 0.7
+
+        dribble = np.nonzero(event == DRIBBLE)[0]
+        if dribble.size:
+            player = self._pick(table, team[dribble], ANY, rng)
+            defender = self._pick(table, opponent[dribble], ANY, rng)
+            if outcomes is not None:
+                chance = outcomes.dribble[team[dribble], opponent[dribble], player, defender]
+            else:
+                technique = self._effective(table, team[dribble], opponent[dribble], player, TECHNIQUE, rng)
+                tackling = self._effective(table, opponent[dribble], team[dribble], defender, TACKLING, rng)
+                chance = (technique - tackling + 10) / 30
+            success[dribble] = rng.random(dribble.size) < chance
+            follow_up[dribble] = 0.4
+
+        shoots |= success & (rng.random(idx.size) < follow_up)
+        return idx[shoots]
+
+    def _midfield_play(self, table, pairings, side, zone, momentum, injury_time, idx, state, rng):
+        """Vectorised process_midfield_play; passes and dribbles never change the match state"""
+        s = side[idx]
+        team = pairings[idx, s]
+        opponent = pairings[idx, 1 - s]
+        event = (rng.random(idx.size)[:, None] >= MIDFIELD_PLAY_WEIGHTS).sum(axis=1)
+
+        fouler = self._pick(table, opponent, ANY, rng)
+        fouls = event == MIDFIELD_FOUL
+
+        tackle = np.nonzero(event == MIDFIELD_TACKLE)[0]
+        if tackle.size:
+            attacker = self._pick(table, team[tackle], ANY, rng)
+            if table.outcomes is not None:
+                chance = table.outcomes.tackle[opponent[tackle], team[tackle], fouler[tackle], attacker]
+            else:
+                tackling = self._effective(table, opponent[tackle], team[tackle], fouler[tackle], TACKLING, rng)
+                technique = self._effective(table, team[tackle], opponent[tackle], attacker, TECHNIQUE, rng)
+                chance = (tackling - technique + 10) / 30
+            failed = rng.random(tackle.size) >= chance
+            fouls[tackle] = failed & (rng.random(tackle.size) < 0.3)
+
+        if fouls.any():
+            self._foul(zone, momentum, injury_time, idx[fouls], s[fouls], fouler[fouls], state, rng)
+
+    def _foul(self, zone, momentum, injury_time, idx, attacking_side, fouler, state, rng):
+        """Vectorised process_foul"""
+        fouling_side = 1 - attacking_side
+        state['fouls'][idx, fouling_side] += 1
+        state['player_fouls'][idx, fouling_side, fouler] += 1
+
+        booked = state['booked'][idx, fouling_side, fouler]
+        z = zone[idx]
+        card_chance = 0.2 + state['player_fouls'][idx, fouling_side, fouler] * 0.1
+        card_chance += np.where((z == 1) | (z == 5), 0.15, np.where((z == 2) | (z == 4), 0.05, 0.0))
+        card_chance += np.where(booked, 0.1, 0.0)
+        card = rng.random(idx.size) < card_chance
+
+        red = card & booked
+        yellow = card & ~booked
+        state['red_cards'][idx[red], fouling_side[red]] += 1
+        state['yellow_cards'][idx[yellow], fouling_side[yellow]] += 1
+        state['booked'][idx[yellow], fouling_side[yellow], fouler[yellow]] = True
+        injury_time[idx[red]] += rng.integers(1, 3, int(red.sum()))
+
+        home_attacking = attacking_side == 0
+        momentum[idx] += np.where(red, np.where(home_attacking, 3, -3),
+                                  np.where(yellow, np.where(home_attacking, 1, -1), 0))
+
+    def _goal_attempt(self, table, pairings, side, zone, momentum, injury_time, idx, state, rng):
+        """Vectorised process_goal_attempt"""
+        s = side[idx]
+        team = pairings[idx, s]
+        opponent = pairings[idx, 1 - s]
+        state['shots'][idx, s] += 1
+
+        shooter = self._pick(table, team, FORWARD, rng)
+        z = zone[idx]
+        if table.outcomes is not None:
+            # One draw decides goal / saved / off target
+            keeper = self._pick(table, opponent, KEEPER, rng)
+            distance = ((z == 2) | (z == 4)).astype(np.int64)
+            draw = rng.random(idx.size)
+            on_target = draw < table.outcomes.on_target[team, opponent, shooter, keeper, distance]
+            goal = draw < table.outcomes.goal[team, opponent, shooter, keeper, distance]
+        else:
+            shooting = self._effective(table, team, opponent, shooter, SHOOTING, rng)
+            on_target_chance = 0.3 + shooting / 40 + np.where(table.central[team, shooter], 0.05, 0.0)
+            on_target = rng.random(idx.size) < on_target_chance
+
+            keeper = self._pick(table, opponent, KEEPER, rng)
+            goalkeeping = self._effective(table, opponent, team, keeper, GOALKEEPER, rng)
+            save_chance = 0.6 + goalkeeping / 50
+            save_chance -= np.where(shooting > 15, 0.1, 0.0)
+            save_chance += np.where((z == 2) | (z == 4), 0.1, 0.0)
+            goal = on_target & (rng.random(idx.size) > save_chance)
+        saved = on_target & ~goal
+
+        state['shots_on_target'][idx[on_target], s[on_target]] += 1
+        state['score'][idx[goal], s[goal]] += 1
+        injury_time[idx[goal]] += rng.integers(0, 2, int(goal.sum()))
+
+        corner_chance = np.where(saved, 0.7, np.where(on_target, 0.0, 0.3))
+        corner = rng.random(idx.size) < corner_chance
+        state['corners'][idx[corner], s[corner]] += 1
+
+        home_attacking = s == 0
+        momentum[idx] += np.where(goal, np.where(home_attacking, -5, 5),
+                                  np.where(saved, np.where(home_attacking, 1, -1), 0))
+
+    def summarise(self, results, home_name=None, away_name=None):
+        """Aggregate per-match result arrays into distributions and mean team stats"""
+        n = len(results['home_score'])
+        home_goals = results['home_score']
+        away_goals = results['away_score']
+
+        scores, counts = np.unique(np.stack([home_goals, away_goals], axis=1), axis=0, return_counts=True)
+        mean_stats = {}
+        for stat, key in (('goals', 'score'), ('possession', 'possession'), ('shots', 'shots'),
+                          ('shots_on_target', 'shots_on_target'), ('fouls', 'fouls'), ('corners', 'corners')):
+            mean_stats[stat] = {
+                'home': round(float(results[f'home_{key}'].mean()), 2),
+                'away': round(float(results[f'away_{key}'].mean()), 2)
+            }
+
+        return {
+            'home_team': home_name,
+            'away_team': away_name,
+            'matches': n,
+            'home_win': float(np.mean(home_goals > away_goals)),
+            'draw': float(np.mean(home_goals == away_goals)),
+            'away_win': float(np.mean(home_goals < away_goals)),
+            'score_distribution': {
+                (int(home), int(away)): int(count) / n for (home, away), count in zip(scores, counts)
+            },
+            'home_goals': {int(g): int(c) / n for g, c in zip(*np.unique(home_goals, return_counts=True))},
+            'away_goals': {int(g): int(c) / n for g, c in zip(*np.unique(away_goals, return_counts=True))},
+            'mean_stats': mean_stats
+        }
@@ -5,4 +5,5 @@ from extensions import db
 from esms.models.team import Team
 from esms.models.player import Player
 from esms.models.match import Match
-from esms.models.formation import Formation  # Add this line
\ No newline at end of file
+from esms.models.formation import Formation  # Add this line
+from esms.models.job import SimulationJob
\ No newline at end of file
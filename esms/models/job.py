@@ -0,0 +1,48 @@
+# esms/models/job.py
+from extensions import db
+from datetime import datetime
+import json
+
+class SimulationJob(db.Model):
+    """A queued simulation, see esms.services.job_queue"""
+    __table_args__ = (
+        # At most one queued or running job per kind and match, so concurrent requests cannot queue twice
+        db.Index('ix_simulation_job_active_match', 'kind', 'match_id', unique=True,
+                 sqlite_where=db.text("status IN ('queued', 'running')"),
+                 postgresql_where=db.text("status IN ('queued', 'running')")),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # Handler name, e.g. 'match' or 'file'
+    params = db.Column(db.Text, nullable=False, default='{}')  # JSON keyword arguments for the handler
+    status = db.Column(db.String(10), nullable=False, default='queued', index=True)  # queued, running, done, failed
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), nullable=True)
+    result = db.Column(db.Text, nullable=True)  # JSON result once done
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    match = db.relationship('Match')
+    
+    def get_params(self):
+        return json.loads(self.params or '{}')
+    
+    def get_result(self):
+        return None if self.result is None else json.loads(self.result)
+    
+    def to_dict(self):
+        """Status fields for polling clients (the result is fetched separately)"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'match_id': self.match_id,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f"<SimulationJob {self.id} {self.kind} {self.status}>"
@@ -1,6 +1,7 @@
 # esms/models/match.py
 from extensions import db
 from datetime import datetime
+from esms.utils.event_log import unpack_events
 
 class Match(db.Model):
     """Represents a match between two teams"""
@@ -16,6 +17,13 @@ class Match(db.Model):
     home_team = db.relationship('Team', foreign_keys=[home_team_id], backref='home_matches')
     away_team = db.relationship('Team', foreign_keys=[away_team_id], backref='away_matches')
     match_events = db.relationship('MatchEvent', backref='match', lazy='dynamic')
+    event_log = db.relationship('MatchEventLog', backref='match', uselist=False)
+    
+    def get_events(self):
+        """Events ordered by minute, from the packed log if there is one, otherwise MatchEvent rows"""
+        if self.event_log is not None:
+            return self.event_log.get_events()
+        return self.match_events.order_by(MatchEvent.minute, MatchEvent.id).all()
     
     def __repr__(self):
         return f"<Match {self.id}>"
@@ -46,4 +54,14 @@ class MatchEvent(db.Model):
     
     player = db.relationship('Player', foreign_keys=[player_id])
     related_player = db.relationship('Player', foreign_keys=[related_player_id])
-    team = db.relationship('Team')
\ No newline at end of file
+    team = db.relationship('Team')
+
+class MatchEventLog(db.Model):
+    """All events of a match packed into one blob, see esms.utils.event_log"""
+    match_id = db.Column(db.Integer, db.ForeignKey('match.id'), primary_key=True)
+    event_count = db.Column(db.Integer, nullable=False, default=0)
+    data = db.Column(db.LargeBinary, nullable=False)
+    
+    def get_events(self):
+        """Decode the blob into event dicts"""
+        return unpack_events(self.data)
@@ -1,6 +1,6 @@
 # esms/roster.py
-from esms.player import Player
-from esms.team import Team
+from esms.engine.player import Player
+from esms.engine.team import Team
 
 class Roster:
     """
@@ -133,7 +133,7 @@ class Roster:
         team = Team(self.team_name, teamsheet.tactic)
         
         # Process players based on teamsheet positions
-        for position, player_name in teamsheet.positions.items():
+        for position, player_name in teamsheet.positions:
             # Check if player exists in roster
             if player_name in self.players_data:
                 player_data = self.players_data[player_name]
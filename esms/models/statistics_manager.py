@@ -9,26 +9,20 @@ class StatisticsManager:
     """
     Manages player statistics during and after matches.
     Handles the updating of rosters with new player statistics.
+    Create one per match - match_stats must not be shared between matches.
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(StatisticsManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self):
-        if self._initialized:
-            return
-            
         # Initialize statistics tracking
         self.match_stats = {}
-        self._initialized = True
+        self.rng = random
     
-    def reset_match_stats(self):
-        """Reset match statistics for a new match"""
+    def reset_match_stats(self, rng=None):
+        """
+        Reset match statistics for a new match. Pass the match's random
+        generator to make ability changes and injuries reproducible.
+        """
+        self.rng = rng or random
         self.match_stats = {
             'player_stats': {},  # Player-specific stats
             'team_stats': {},    # Team-level stats
@@ -133,22 +127,22 @@ class StatisticsManager:
         # Different events affect different abilities
         if stat_type == 'goals':
             # Scoring goals improves shooting ability
-            ability_changes['sab'] += random.randint(20, 30) * value
+            ability_changes['sab'] += self.rng.randint(20, 30) * value
         elif stat_type == 'assists':
             # Assists improve passing ability
-            ability_changes['pab'] += random.randint(15, 25) * value
+            ability_changes['pab'] += self.rng.randint(15, 25) * value
         elif stat_type == 'key_tackles':
             # Key tackles improve tackling ability
-            ability_changes['tab'] += random.randint(15, 25) * value
+            ability_changes['tab'] += self.rng.randint(15, 25) * value
         elif stat_type == 'saves':
             # Saves improve goalkeeper ability
-            ability_changes['kab'] += random.randint(15, 25) * value
+            ability_changes['kab'] += self.rng.randint(15, 25) * value
         elif stat_type == 'key_passes':
             # Key passes improve passing ability
-            ability_changes['pab'] += random.randint(10, 15) * value
+            ability_changes['pab'] += self.rng.randint(10, 15) * value
         elif stat_type == 'shots':
             # Shots improve shooting ability (slightly)
-            ability_changes['sab'] += random.randint(5, 10) * value
+            ability_changes['sab'] += self.rng.randint(5, 10) * value
     
     def generate_match_summary(self):
         """Generate a summary of the match statistics"""
@@ -276,8 +270,8 @@ class StatisticsManager:
                 })
             
             # Process random injuries (small chance for players who played)
-            if stats['minutes_played'] > 0 and random.random() < 0.05:  # 5% injury chance
-                injury_duration = random.randint(1, 3)  # 1-3 weeks of injury
+            if stats['minutes_played'] > 0 and self.rng.random() < 0.05:  # 5% injury chance
+                injury_duration = self.rng.randint(1, 3)  # 1-3 weeks of injury
                 player.injury += injury_duration
                 updates['injuries'].append({
                     'player_name': player.name,
@@ -391,7 +385,6 @@ class StatisticsManager:
         except Exception as e:
             print(f"Error writing updated roster for {team.name}: {str(e)}")
 
-# Singleton instance
 def stats_manager():
-    """Get the singleton instance of StatisticsManager"""
+    """Get a new StatisticsManager for one match"""
     return StatisticsManager()
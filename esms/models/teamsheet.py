@@ -6,7 +6,7 @@ class Teamsheet:
     def __init__(self, team_name, tactic='N'):
         self.team_name = team_name
         self.tactic = tactic
-        self.positions = {}  # Map of position -> player name
+        self.positions = []  # (position, player name) pairs in teamsheet order; positions repeat
     
     @classmethod
     def parse(cls, teamsheet_text):
@@ -22,7 +22,7 @@ class Teamsheet:
         lines = teamsheet_text.strip().split('\n')
         team_name = ""
         tactic = "N"  # Default tactic
-        positions = {}
+        positions = []
         
         line_index = 0
         for line in lines:
@@ -47,7 +47,7 @@ class Teamsheet:
                 parts = line.split(':', 1)
                 position = parts[0].strip()
                 player_name = parts[1].strip()
-                positions[position] = player_name
+                positions.append((position, player_name))
                 line_index += 1
         
         # Create and configure the teamsheet
@@ -58,6 +58,6 @@ class Teamsheet:
     def __str__(self):
         """String representation of the teamsheet"""
         result = f"Team: {self.team_name}\nTactic: {self.tactic}\n\nPlayers:\n"
-        for position, player in self.positions.items():
+        for position, player in self.positions:
             result += f"{position}: {player}\n"
         return result
\ No newline at end of file
@@ -1,8 +1,11 @@
 # esms/routes/match.py
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, Response, current_app, render_template, request, redirect, url_for, flash, jsonify
 from esms.models.match import Match, MatchEvent, MatchLineup
 from esms.models.team import Team
+from esms.models.job import SimulationJob
 from esms.services.match_service import MatchService
+from esms.engine.rng import match_seed
+from esms.utils.live import live_events, MIN_SPEED, MAX_SPEED
 from extensions import db
 from datetime import datetime
 
@@ -32,6 +35,51 @@ def match_detail(match_id):
     match = Match.query.get_or_404(match_id)
     return render_template('match_detail.html', match=match)
 
+@match_bp.route('/<int:match_id>/forecast')
+def match_forecast(match_id):
+    """Outcome and score probabilities for a match, exact by default or from ?runs= simulations"""
+    runs = request.args.get('runs', type=int)
+    if runs is not None and runs < 1:
+        return jsonify({'error': 'runs must be at least 1'}), 400
+    
+    forecast = match_service.forecast_match(match_id, runs=runs, seed=request.args.get('seed', type=int))
+    return jsonify({
+        'home_team': forecast['home_team'],
+        'away_team': forecast['away_team'],
+        'home_win': forecast['home_win'],
+        'draw': forecast['draw'],
+        'away_win': forecast['away_win'],
+        'score_distribution': {
+            f"{home}-{away}": probability
+            for (home, away), probability in forecast['score_distribution'].items()
+        }
+    })
+
+@match_bp.route('/<int:match_id>/live')
+def match_live(match_id):
+    """
+    Stream a match as Server-Sent Events, paced at ?speed= match minutes per
+    real minute (default LIVE_MATCH_SPEED). The replay uses the match's seed,
+    so it shows the result run_match will record. Matches already played get
+    409 and a link to their page instead of a new simulation.
+    """
+    match = Match.query.get_or_404(match_id)
+    if match.completed:
+        return jsonify({'error': 'match has already been played',
+                        'match_url': url_for('match.match_detail', match_id=match.id)}), 409
+    
+    try:
+        speed = float(request.args.get('speed', current_app.config.get('LIVE_MATCH_SPEED', 30)))
+    except ValueError:
+        speed = None
+    if speed is None or not MIN_SPEED <= speed <= MAX_SPEED:  # The comparison also rejects nan
+        return jsonify({'error': f'speed must be a number from {MIN_SPEED} to {MAX_SPEED}'}), 400
+    
+    resume_after = request.headers.get('Last-Event-ID', type=int)
+    events = match_service.stream_match(match_id)
+    return Response(live_events(events, speed, resume_after), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @match_bp.route('/new', methods=['GET', 'POST'])
 def match_new():
     """Create new match"""
@@ -60,7 +108,7 @@ def match_new():
 
 @match_bp.route('/sample')
 def sample():
-    """Run a sample match"""
+    """Run a sample match - the same one on every reload unless ?seed= picks another"""
     # Load sample data
     with open('samples/home_roster.txt', 'r') as f:
         home_roster = f.read()
@@ -74,12 +122,13 @@ def sample():
     with open('samples/away_teamsheet.txt', 'r') as f:
         away_teamsheet = f.read()
     
-    # Run sample match
+    # Run sample match; a fixed seed lets reloads come from the simulation cache
     result = match_service.run_file_simulation(
         home_roster,
         away_roster,
         home_teamsheet,
-        away_teamsheet
+        away_teamsheet,
+        seed=request.args.get('seed', match_seed('sample'), type=int)
     )
     
     return render_template('match_result.html', result=result)
@@ -103,15 +152,15 @@ def simulate():
     home_teamsheet = home_teamsheet_file.read().decode('utf-8')
     away_teamsheet = away_teamsheet_file.read().decode('utf-8')
     
-    # Run the simulation
-    result = match_service.run_file_simulation(
+    # Simulate in the background; the client polls the job
+    job = match_service.enqueue_file_simulation(
         home_roster,
         away_roster,
         home_teamsheet,
         away_teamsheet
     )
     
-    return render_template('match_result.html', result=result)
+    return job_accepted(job)
 
 @match_bp.route('/run/<int:match_id>')
 def run_match(match_id):
@@ -122,11 +171,40 @@ def run_match(match_id):
         flash("This match has already been played.")
         return redirect(url_for('match.match_detail', match_id=match.id))
     
-    # Run the simulation
-    result = match_service.run_match_simulation(match.id)
-    
-    flash("Match simulation completed!")
-    return render_template('match_result.html', result=result, match=match)
+    # Simulate in the background; the client polls the job
+    job = match_service.enqueue_match_simulation(match.id)
+    return job_accepted(job)
+
+@match_bp.route('/jobs/<int:job_id>')
+def job_status(job_id):
+    """Status of a simulation job as JSON, with result_url once it is done"""
+    job = SimulationJob.query.get_or_404(job_id)
+    status = job.to_dict()
+    if job.status == 'done':
+        status['result_url'] = url_for('match.job_result', job_id=job.id)
+    return jsonify(status)
+
+@match_bp.route('/jobs/<int:job_id>/result')
+def job_result(job_id):
+    """Result page of a finished simulation job (JSON with ?format=json), or the waiting page before then"""
+    job = SimulationJob.query.get_or_404(job_id)
+    if job.status != 'done':
+        return render_template('job_status.html', job=job)
+    
+    result = job.get_result()
+    if request.args.get('format') == 'json':
+        return jsonify(result)
+    if result.get('skipped'):
+        # The match was played before this job ran
+        return redirect(url_for('match.match_detail', match_id=job.match_id))
+    return render_template('match_result.html', result=result, match=job.match)
+
+def job_accepted(job):
+    """202 response for a queued job: JSON for API clients, otherwise a page that polls it"""
+    status_url = url_for('match.job_status', job_id=job.id)
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify({'job_id': job.id, 'status': job.status, 'status_url': status_url}), 202
+    return render_template('job_status.html', job=job), 202
 
 @match_bp.route('/lineup/<int:match_id>', methods=['GET', 'POST'])
 def submit_lineup(match_id):
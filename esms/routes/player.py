@@ -1,6 +1,7 @@
 # esms/routes/player.py
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from esms.models.player import Player
+from esms.services.simulation_cache import simulation_cache
 from extensions import db
 
 player_bp = Blueprint('player', __name__)
@@ -73,6 +74,7 @@ def player_edit(player_id):
         player.positioning = int(request.form.get('positioning', 10))
         
         db.session.commit()
+        simulation_cache().invalidate(f'player:{player.id}')
         flash(f"Player {player.name} updated successfully!")
         return redirect(url_for('player.player_detail', player_id=player.id))
     
@@ -3,6 +3,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from esms.models.team import Team, TeamPlayer
 from esms.models.player import Player
 from esms.models.formation import Formation
+from esms.services.simulation_cache import simulation_cache
 from extensions import db
 import json
 
@@ -51,6 +52,7 @@ def team_edit(team_id):
         team.formation = request.form.get('formation', '4-4-2')
         
         db.session.commit()
+        simulation_cache().invalidate(f'team:{team.id}')
         flash(f"Team '{team.name}' updated successfully!")
         return redirect(url_for('team.team_detail', team_id=team.id))
     
@@ -74,6 +76,7 @@ def team_add_player(team_id):
         team_player = TeamPlayer(team_id=team.id, player_id=player.id, position=position)
         db.session.add(team_player)
         db.session.commit()
+        simulation_cache().invalidate(f'team:{team.id}')
         
         flash(f"Added {player.name} to {team.name} as {position}!")
         return redirect(url_for('team.team_detail', team_id=team.id))
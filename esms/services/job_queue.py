@@ -0,0 +1,172 @@
+# services/job_queue.py
+"""
+Background simulation jobs.
+
+Every job is a SimulationJob row, so any web process can report its status,
+and its id is handed to a pool of worker threads through an in-process queue
+- a local stand-in for a real broker. A worker claims the job with a
+conditional UPDATE (so only one worker takes each claim), calls the handler
+registered for its kind inside an app context and stores the JSON result or
+the error. Jobs still queued when a process starts its pool, e.g. after a
+restart, are picked up again. A claim is a lease: a job left running for
+longer than the queue's timeout (its worker died with the process) goes
+back to queued and is run again. A slow worker may still be running it
+then, so handlers must cope with running twice - the match handler does,
+since only the first save of a match goes through.
+"""
+import json
+import queue
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from esms.models import db
+from esms.models.job import SimulationJob
+
+# Job states a client can still wait on
+ACTIVE_STATES = ('queued', 'running')
+
+
+class JobQueue:
+    """Worker pool running SimulationJob rows"""
+    def __init__(self, app, workers=2, timeout=600):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self.app = app
+        self.workers = workers
+        self.timeout = timeout  # Seconds a running job may take before it is run again
+        self.handlers = {}  # kind -> handler(**params), see register
+        self.pending = queue.Queue()
+        self.threads = []
+        self.lock = threading.Lock()
+
+    def register(self, kind, handler):
+        """
+        Run jobs of this kind with handler(**params), plus match_id= for jobs
+        tied to a match. The handler returns a JSON-serialisable result.
+        """
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind, match_id=None, **params):
+        """
+        Store a queued job and hand it to the workers; returns the
+        SimulationJob. A match can only have one active job of a kind, so
+        when another request queued one first that job is returned instead.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self._start()
+
+        job = SimulationJob(kind=kind, match_id=match_id, params=json.dumps(params))
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            existing = self.active_job(kind, match_id) if match_id is not None else None
+            if existing is None:
+                raise
+            return existing
+        self.pending.put(job.id)
+        return job
+
+    def active_job(self, kind, match_id):
+        """The queued or running job of this kind for a match, if any"""
+        self._start()
+        self._reclaim()
+        return SimulationJob.query.filter(
+            SimulationJob.kind == kind,
+            SimulationJob.match_id == match_id,
+            SimulationJob.status.in_(ACTIVE_STATES)
+        ).order_by(SimulationJob.id).first()
+
+    def join(self):
+        """Block until every job handed to this queue has finished"""
+        self.pending.join()
+
+    def _start(self):
+        """Start the workers on first use and re-queue jobs left over from earlier processes"""
+        with self.lock:
+            if self.threads:
+                return
+            leftover = [job_id for (job_id,) in db.session.query(SimulationJob.id).filter_by(status='queued')]
+            for job_id in leftover:
+                self.pending.put(job_id)
+            self._reclaim()
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'simulation-worker-{number}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def _reclaim(self):
+        """Re-queue running jobs whose lease has expired"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.timeout)
+        expired = [job_id for (job_id,) in db.session.query(SimulationJob.id).filter(
+            SimulationJob.status == 'running', SimulationJob.started_at < cutoff)]
+        table = SimulationJob.__table__
+        for job_id in expired:
+            # Conditional, so a job that finished or was reclaimed meanwhile is left alone
+            reclaimed = db.session.execute(
+                table.update()
+                .where(table.c.id == job_id, table.c.status == 'running', table.c.started_at < cutoff)
+                .values(status='queued', started_at=None)
+            ).rowcount
+            db.session.commit()
+            if reclaimed:
+                print(f"Warning: simulation job {job_id} ran past its {self.timeout}s lease, queueing it again")
+                self.pending.put(job_id)
+
+    def _work(self):
+        while True:
+            job_id = self.pending.get()
+            try:
+                with self.app.app_context():
+                    self._run(job_id)
+            except Exception:
+                print(f"Warning: simulation worker failed on job {job_id}\n{traceback.format_exc()}")
+            finally:
+                self.pending.task_done()
+
+    def _run(self, job_id):
+        table = SimulationJob.__table__
+        claimed = db.session.execute(
+            table.update()
+            .where(table.c.id == job_id, table.c.status == 'queued')
+            .values(status='running', started_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return  # Already taken by another worker or process
+
+        job = db.session.get(SimulationJob, job_id)
+        params = job.get_params()
+        if job.match_id is not None:
+            params['match_id'] = job.match_id
+        try:
+            job.result = json.dumps(self.handlers[job.kind](**params))
+            job.status = 'done'
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(SimulationJob, job_id)
+            job.status = 'failed'
+            job.error = f"{type(e).__name__}: {e}"
+            print(f"Warning: simulation job {job_id} failed\n{traceback.format_exc()}")
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+
+_job_queue = None
+
+
+def job_queue():
+    """The process-wide queue for the current app, with JOB_WORKERS worker threads and a JOB_TIMEOUT lease"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(current_app._get_current_object(), current_app.config.get('JOB_WORKERS', 2),
+                              current_app.config.get('JOB_TIMEOUT', 600))
+    return _job_queue
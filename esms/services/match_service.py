@@ -1,15 +1,75 @@
 # services/match_service.py
-from esms.models.match import Match, MatchEvent, MatchLineup
+from flask import current_app
+from sqlalchemy import bindparam, false
+from esms.models.match import Match, MatchEvent, MatchEventLog, MatchLineup
+from esms.models.player import Player
+from esms.models.team import TeamPlayer
 from esms.models import db
-from esms.utils.converters import team_to_engine_model
+from esms.utils.converters import team_to_engine_model, roster_to_engine_model, teamsheet_to_engine_model
 from esms.engine.match_engine import EnhancedMatchEngine
+from esms.engine.analytic import AnalyticMatchModel
+from esms.engine.vector_engine import VectorMatchEngine
+from esms.engine.player import Player as EnginePlayer
 from esms.engine.config import Config
+from esms.engine.rng import match_seed
+from esms.utils.event_log import pack_events
+from esms.services.simulation_cache import simulation_cache, simulation_key
+from esms.services.job_queue import job_queue
 
 class MatchService:
-    def run_match_simulation(self, match_id):
-        """Run match simulation for a database match"""
+    def get_match_by_id(self, match_id):
+        return Match.query.get_or_404(match_id)
+    
+    def run_match_simulation(self, match_id, seed=None, packed_events=None):
+        """
+        Run match simulation for a database match. Without an explicit seed the
+        match id is used, so the same match always replays the same way.
+        With packed_events (default: the PACKED_MATCH_EVENTS setting) the events
+        are stored as one MatchEventLog blob instead of MatchEvent rows.
+        Returns None, dropping the result, when another run saved the match
+        first.
+        """
         match = self.get_match_by_id(match_id)
         
+        # Run simulation
+        engine = self._match_engine(match, seed)
+        result = engine.run_full_match()
+        
+        # Save score and events
+        saved = self.save_results([{
+            'match_id': match.id,
+            'home_score': result['home_score'],
+            'away_score': result['away_score'],
+            'events': result['events']
+        }], packed_events=packed_events)
+        
+        return result if saved else None
+        
+    def enqueue_match_simulation(self, match_id):
+        """
+        Queue run_match_simulation for a database match; returns its
+        SimulationJob. A match already queued or running gets its existing job.
+        """
+        queue = self._job_queue()
+        return queue.active_job('match', match_id) or queue.enqueue('match', match_id=match_id)
+    
+    def enqueue_file_simulation(self, home_roster, away_roster, home_teamsheet=None, away_teamsheet=None, seed=None):
+        """Queue run_file_simulation for roster (and teamsheet) texts; returns its SimulationJob"""
+        return self._job_queue().enqueue('file', home_roster=home_roster, away_roster=away_roster,
+                                         home_teamsheet=home_teamsheet, away_teamsheet=away_teamsheet, seed=seed)
+    
+    def stream_match(self, match_id, seed=None):
+        """
+        iter_match() of a database match with the seed run_match_simulation
+        uses, so the stream shows the result the match will get. Nothing is
+        saved. The teams are loaded before this returns, so the generator can
+        be consumed outside the request's app context.
+        """
+        match = self.get_match_by_id(match_id)
+        return self._match_engine(match, seed).iter_match()
+    
+    def _match_engine(self, match, seed=None):
+        """Engine set up for a database match, seeded from the match id unless seed is given"""
         # Convert teams to engine models
         home_team = team_to_engine_model(match.home_team)
         away_team = team_to_engine_model(match.away_team)
@@ -18,51 +78,192 @@ class MatchService:
         home_subs = self._get_subs_for_team(match.id, match.home_team_id)
         away_subs = self._get_subs_for_team(match.id, match.away_team_id)
         
+        engine = EnhancedMatchEngine(Config(), seed=match_seed(match.id) if seed is None else seed)
+        engine.setup_match(home_team, away_team, home_subs, away_subs)
+        return engine
+        
+    def run_file_simulation(self, home_team_data, away_team_data, home_subs=None, away_subs=None, seed=None):
+        """
+        Run match simulation for file-based teams. Team data is an engine
+        team or roster text; with roster text the subs may be teamsheet text,
+        which picks the lineup and tactic and leaves the rest of the roster on
+        the bench. Seeded runs are served from the simulation cache when the
+        same inputs were simulated before.
+        """
+        # Convert data to engine models
+        home_team, home_subs = self._file_team(home_team_data, home_subs)
+        away_team, away_subs = self._file_team(away_team_data, away_subs)
+        
         # Run simulation
         config = Config()
-        engine = EnhancedMatchEngine(config)
-        engine.setup_match(home_team, away_team, home_subs, away_subs)
-        result = engine.run_full_match()
         
-        # Update match with results
-        match.home_score = result['home_score']
-        match.away_score = result['away_score']
-        match.completed = True
+        def simulate():
+            engine = EnhancedMatchEngine(config, seed=seed)
+            engine.setup_match(home_team, away_team, home_subs, away_subs)
+            return engine.run_full_match()
         
-        # Save match events
-        for event in result['events']:
-            match_event = MatchEvent(
-                match_id=match.id,
-                minute=event['minute'],
-                event_type=event['type'],
-                description=event['description']
-            )
-            db.session.add(match_event)
+        if seed is None:
+            return simulate()
+        key = simulation_key('match', [(home_team, home_subs), (away_team, away_subs)], config, seed=seed)
+        return simulation_cache().get_or_compute(key, simulate)
+    
+    def _file_team(self, team_data, subs):
+        """(engine team, subs) from roster text, roster and teamsheet text, or an engine team"""
+        if not isinstance(team_data, str):
+            return team_data, subs
+        if isinstance(subs, str):
+            return teamsheet_to_engine_model(team_data, subs)
+        return roster_to_engine_model(team_data), subs
+    
+    def _job_queue(self):
+        """The job queue with this service's handlers registered, so leftover jobs of either kind can run"""
+        queue = job_queue()
+        queue.register('match', self._match_job)
+        queue.register('file', self._file_job)
+        return queue
+    
+    def _match_job(self, match_id):
+        """
+        Job handler for enqueue_match_simulation. A match played since the job
+        was queued, or saved by another run while this one simulated it, keeps
+        its result; the job's result is then just {'skipped': True, 'match_id': ...}.
+        """
+        result = None if self.get_match_by_id(match_id).completed else self.run_match_simulation(match_id)
+        if result is None:
+            return {'skipped': True, 'match_id': match_id}
+        return self.result_to_dict(result)
+    
+    def _file_job(self, home_roster, away_roster, home_teamsheet=None, away_teamsheet=None, seed=None):
+        """Job handler for enqueue_file_simulation"""
+        return self.result_to_dict(self.run_file_simulation(
+            home_roster, away_roster, home_teamsheet, away_teamsheet, seed=seed))
+    
+    def result_to_dict(self, result):
+        """JSON-ready copy of a run_full_match result, with the fields match_result.html reads"""
+        return {
+            'home_team': {'name': result['home_team'].name},
+            'away_team': {'name': result['away_team'].name},
+            'home_score': result['home_score'],
+            'away_score': result['away_score'],
+            'events': [
+                {'minute': event['minute'], 'type': event['type'], 'description': event['description']}
+                for event in result['events']
+            ],
+            'statistics': result['statistics'],
+            'home_subs_used': result['home_subs_used'],
+            'away_subs_used': result['away_subs_used']
+        }
+    
+    def forecast(self, home_team, away_team, runs=None, seed=None, tags=()):
+        """
+        Outcome and score probabilities for engine teams, cached. Without runs
+        the exact distribution comes from AnalyticMatchModel, otherwise from
+        `runs` VectorMatchEngine matches.
+        """
+        config = Config()
+        key = simulation_key('forecast', [(home_team, None), (away_team, None)], config,
+                             runs=runs, seed=seed)
         
-        db.session.commit()
+        def simulate():
+            if runs is None:
+                return AnalyticMatchModel(config).score_distribution(home_team, away_team)
+            return VectorMatchEngine(config).simulate(home_team, away_team, runs, seed=seed)
         
-        return result
+        return simulation_cache().get_or_compute(key, simulate, tags)
+    
+    def forecast_match(self, match_id, runs=None, seed=None):
+        """Forecast a database match; the cached result is dropped when either team or its players are edited"""
+        match = self.get_match_by_id(match_id)
+        tags = []
+        for team in (match.home_team, match.away_team):
+            tags.append(f'team:{team.id}')
+            tags.extend(f'player:{team_player.player_id}' for team_player in team.players)
         
-    def run_file_simulation(self, home_team_data, away_team_data, home_subs=None, away_subs=None):
-        """Run match simulation for file-based teams"""
-        # Convert data to engine models
-        if isinstance(home_team_data, str):
-            home_team = roster_to_engine_model(home_team_data)
-        else:
-            home_team = home_team_data
-            
-        if isinstance(away_team_data, str):
-            away_team = roster_to_engine_model(away_team_data)
-        else:
-            away_team = away_team_data
+        return self.forecast(team_to_engine_model(match.home_team), team_to_engine_model(match.away_team),
+                             runs=runs, seed=seed, tags=tags)
         
-        # Run simulation
-        config = Config()
-        engine = EnhancedMatchEngine(config)
-        engine.setup_match(home_team, away_team, home_subs, away_subs)
-        result = engine.run_full_match()
+    def save_results(self, results, packed_events=None, batch_size=200):
+        """
+        Write simulated results in bulk. Each result is a dict with match_id,
+        home_score, away_score and events. Score updates and events go through
+        executemany statements instead of the ORM unit of work, committing once
+        per batch of matches. With packed_events (default: the
+        PACKED_MATCH_EVENTS setting) each match gets one MatchEventLog blob
+        instead of MatchEvent rows.
+        
+        A match is only saved if it is not completed yet, checked and set by
+        the score update itself, so when two runs of a match race the first
+        one's result stands and the other is dropped. Returns the ids of the
+        matches saved.
+        """
+        if packed_events is None:
+            packed_events = current_app.config.get('PACKED_MATCH_EVENTS', False)
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+            
+        match_table = Match.__table__
+        score_update = match_table.update().where(
+            match_table.c.id == bindparam('result_match_id'),
+            match_table.c.completed == false()
+        ).values(
+            home_score=bindparam('result_home_score'),
+            away_score=bindparam('result_away_score'),
+            completed=True
+        )
+        event_table = MatchEventLog.__table__ if packed_events else MatchEvent.__table__
+        counts_executemany = db.engine.dialect.supports_sane_multi_rowcount
         
-        return result
+        results = list(results)
+        saved = []
+        try:
+            for start in range(0, len(results), batch_size):
+                batch = results[start:start + batch_size]
+                scores = [
+                    {
+                        'result_match_id': result['match_id'],
+                        'result_home_score': result['home_score'],
+                        'result_away_score': result['away_score']
+                    }
+                    for result in batch
+                ]
+                
+                claimed_all = False
+                if counts_executemany:
+                    claimed_all = db.session.execute(score_update, scores).rowcount == len(batch)
+                    if not claimed_all:
+                        db.session.rollback()
+                if not claimed_all:
+                    # Some matches were completed meanwhile (or the driver cannot tell): claim one at a time
+                    batch = [result for result, score in zip(batch, scores)
+                             if db.session.execute(score_update, score).rowcount]
+                
+                event_rows = []
+                for result in batch:
+                    event_rows.extend(self._event_rows(result['match_id'], result['events'], packed_events))
+                if event_rows:
+                    db.session.execute(event_table.insert(), event_rows)
+                db.session.commit()
+                saved.extend(result['match_id'] for result in batch)
+        except Exception:
+            db.session.rollback()
+            raise
+        return saved
+            
+    def _event_rows(self, match_id, events, packed_events):
+        """Insert parameters for a match's events - one packed log row or one row per event"""
+        if packed_events:
+            events = list(events)
+            return [{'match_id': match_id, 'event_count': len(events), 'data': pack_events(events)}]
+            
+        return [
+            {
+                'match_id': match_id,
+                'minute': event['minute'],
+                'event_type': event['type'],
+                'description': event['description']
+            }
+            for event in events
+        ]
         
     def _get_subs_for_team(self, match_id, team_id):
         """Get substitute players for a team in a match"""
@@ -0,0 +1,101 @@
+# services/season_service.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from extensions import db
+from esms.models.match import Match
+from esms.services.match_service import MatchService
+from esms.utils.converters import team_to_engine_model
+from esms.engine import init_engine
+from esms.engine.match_engine import EnhancedMatchEngine
+from esms.engine.config import Config
+from esms.engine.rng import match_seed
+
+
+def round_robin_fixtures(teams):
+    """Every team plays every other team once at home and once away"""
+    return [(home, away) for home in teams for away in teams if home is not away]
+
+
+def _simulate_job(job):
+    """Worker entry point: simulate one prepared match and return a compact result"""
+    match_id, seed, home_team, away_team, home_subs, away_subs = job
+    engine = EnhancedMatchEngine(Config(), seed=seed)
+    engine.setup_match(home_team, away_team, home_subs, away_subs)
+    result = engine.run_full_match()
+
+    return {
+        'match_id': match_id,
+        'seed': seed,
+        'home_score': result['home_score'],
+        'away_score': result['away_score'],
+        'events': result['events']
+    }
+
+
+class SeasonService:
+    """
+    Simulates many matches at once across a process pool. Teams are converted
+    to engine models up front, workers only run the engine, and results are
+    written back in bulk by MatchService.save_results.
+    """
+    def __init__(self, max_workers=None, base_seed=0):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.base_seed = base_seed
+        self.match_service = MatchService()
+
+    def simulate_pending(self):
+        """Simulate every match that has not been played yet"""
+        matches = Match.query.filter_by(completed=False).order_by(Match.scheduled_time).all()
+        return self.simulate_matches(matches)
+
+    def simulate_fixtures(self, fixtures, scheduled_time=None):
+        """Create matches for a list of (home_team, away_team) pairs and simulate them"""
+        matches = []
+        for home_team, away_team in fixtures:
+            match = Match(
+                home_team_id=home_team.id,
+                away_team_id=away_team.id,
+                scheduled_time=scheduled_time or datetime.utcnow(),
+                completed=False,
+                home_score=0,
+                away_score=0
+            )
+            db.session.add(match)
+            matches.append(match)
+
+        # Flush so the new matches get ids to derive their seeds from
+        db.session.flush()
+        return self.simulate_matches(matches)
+
+    def simulate_matches(self, matches):
+        """
+        Simulate the given matches in parallel and save the results in bulk;
+        returns the results saved (a match completed meanwhile keeps its result)
+        """
+        matches = [match for match in matches if not match.completed]
+        if not matches:
+            return []
+
+        jobs = [self._prepare_job(match) for match in matches]
+        chunksize = max(1, len(jobs) // (self.max_workers * 4))
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_engine) as executor:
+                results = list(executor.map(_simulate_job, jobs, chunksize=chunksize))
+            saved = set(self.match_service.save_results(results))
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return [result for result in results if result['match_id'] in saved]
+
+    def _prepare_job(self, match):
+        """Convert a match's teams to picklable engine models"""
+        home_team = team_to_engine_model(match.home_team)
+        away_team = team_to_engine_model(match.away_team)
+        home_subs = self.match_service._get_subs_for_team(match.id, match.home_team_id)
+        away_subs = self.match_service._get_subs_for_team(match.id, match.away_team_id)
+
+        return (match.id, match_seed(match.id, self.base_seed), home_team, away_team, home_subs, away_subs)
@@ -0,0 +1,179 @@
+# services/simulation_cache.py
+"""
+Content-addressed cache of simulation results.
+
+Results are stored under a sha256 of everything that decides them: engine
+version, the canonical teams (tactic, players, positions and attributes,
+substitutes), engine config, tactics and commentary data, and the seed or
+sample count. Changing any input changes the key, so a stale result can
+never be served. An in-memory LRU sits in front of an optional SQLite file
+that survives restarts and is shared between worker processes.
+
+Entries can carry tags such as 'team:3' or 'player:17' so the edit routes
+can drop everything built from a team or player they just changed.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+
+from esms.engine.context import shared_context
+from esms.engine.match_engine import ENGINE_VERSION
+from esms.engine.player import BASE_ATTRIBUTES
+
+
+def canonical_player(player):
+    """Name, position and base attributes of an engine player"""
+    return [player.name, player.position] + [getattr(player, name, default) for name, default in BASE_ATTRIBUTES]
+
+
+def canonical_team(team, subs=None):
+    """Everything about an engine team and its bench that affects a simulation, in lineup order"""
+    return {
+        'name': team.name,
+        'tactic': team.tactic,
+        'formation': getattr(team, 'formation', None),
+        'players': [canonical_player(player) for player in team.players],
+        'subs': [canonical_player(player) for player in subs or []]
+    }
+
+
+def simulation_key(kind, teams, config=None, context=None, **params):
+    """
+    Cache key of a simulation. teams is a list of (engine team, subs) pairs,
+    params holds the seed, run count or anything else the result depends on.
+    The tactics and commentary data go in as the context's data_digest().
+    """
+    context = context or shared_context()
+    config = config or context.config
+    payload = {
+        'engine': ENGINE_VERSION,
+        'kind': kind,
+        'teams': [canonical_team(team, subs) for team, subs in teams],
+        'config': sorted(config.config.items()),
+        'data': context.data_digest(),
+        'params': sorted(params.items())
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class SimulationCache:
+    """In-memory LRU of results in front of an optional on-disk SQLite store"""
+    def __init__(self, max_entries=256, path=None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()  # key -> (value, tags), least recently used first
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+                conn.execute("CREATE TABLE IF NOT EXISTS tags (tag TEXT NOT NULL, key TEXT NOT NULL)")
+                conn.execute("CREATE INDEX IF NOT EXISTS tags_by_tag ON tags (tag)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        """Cached result for key, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        if self.path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                tags = [tag for (tag,) in conn.execute("SELECT tag FROM tags WHERE key = ?", (key,))]
+            if row is not None:
+                value = pickle.loads(row[0])
+                with self.lock:
+                    self.hits += 1
+                    self._remember(key, value, tags)
+                return value
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value, tags=()):
+        """Store a result in both tiers"""
+        tags = list(tags)
+        with self.lock:
+            self._remember(key, value, tags)
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                             (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+                conn.execute("DELETE FROM tags WHERE key = ?", (key,))
+                conn.executemany("INSERT INTO tags (tag, key) VALUES (?, ?)", [(tag, key) for tag in tags])
+
+    def get_or_compute(self, key, compute, tags=()):
+        """Cached result for key, computing and storing it with compute() on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value, tags)
+        return value
+
+    def invalidate(self, tag):
+        """Drop every result stored with tag; returns how many were in memory"""
+        with self.lock:
+            stale = [key for key, (value, tags) in self.entries.items() if tag in tags]
+            for key in stale:
+                del self.entries[key]
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM results WHERE key IN (SELECT key FROM tags WHERE tag = ?)", (tag,))
+                conn.execute("DELETE FROM tags WHERE key NOT IN (SELECT key FROM results)")
+        return len(stale)
+
+    def clear(self):
+        """Drop everything from both tiers"""
+        with self.lock:
+            self.entries.clear()
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM results")
+                conn.execute("DELETE FROM tags")
+
+    def _remember(self, key, value, tags):
+        # Caller holds the lock
+        self.entries[key] = (value, tags)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+_simulation_cache = None
+
+
+def simulation_cache():
+    """
+    The process-wide cache, sized from the SIMULATION_CACHE_SIZE and
+    SIMULATION_CACHE_PATH settings the first time it is used
+    """
+    global _simulation_cache
+    if _simulation_cache is None:
+        settings = current_app.config if has_app_context() else {}
+        _simulation_cache = SimulationCache(
+            settings.get('SIMULATION_CACHE_SIZE', 256),
+            settings.get('SIMULATION_CACHE_PATH')
+        )
+    return _simulation_cache
@@ -38,7 +38,7 @@ def roster_to_engine_model(roster_text):
     """Convert roster text file to engine Team object for simulation"""
     from esms.engine.team import Team as EngineTeam
     from esms.engine.player import Player as EnginePlayer
-    from esms.engine.roster import Roster
+    from esms.models.roster import Roster
     
     roster = Roster.parse(roster_text)
     
@@ -54,4 +54,31 @@ def roster_to_engine_model(roster_text):
         )
         engine_team.add_player(engine_player)
     
-    return engine_team
\ No newline at end of file
+    return engine_team
+
+def teamsheet_to_engine_model(roster_text, teamsheet_text):
+    """
+    Convert a roster and teamsheet into an engine Team holding the selected
+    lineup with the teamsheet's tactic, plus the roster players left out as
+    substitutes. Returns (team, subs).
+    """
+    from esms.engine.player import Player as EnginePlayer
+    from esms.models.roster import Roster
+    from esms.models.teamsheet import Teamsheet
+    
+    roster = Roster.parse(roster_text)
+    teamsheet = Teamsheet.parse(teamsheet_text)
+    engine_team = roster.to_team(teamsheet)
+    
+    selected = {player_name for position, player_name in teamsheet.positions}
+    subs = [
+        EnginePlayer(
+            name=player_name,
+            position=player_data['position'],
+            attributes=player_data['attributes']
+        )
+        for player_name, player_data in roster.players_data.items()
+        if player_name not in selected
+    ]
+    
+    return engine_team, subs
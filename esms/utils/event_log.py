@@ -0,0 +1,78 @@
+# esms/utils/event_log.py
+"""
+Packed binary format for a match's events, stored as a single blob instead
+of one MatchEvent row per event.
+
+Layout (little endian):
+    header   magic b'ESEV', version (B), record count (I), string count (I)
+    records  record count x (minute H, type string H, description string I)
+    strings  string count x (byte length I, UTF-8 bytes)
+
+Event types and descriptions share one de-duplicated string table.
+"""
+import struct
+
+MAGIC = b'ESEV'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBII')
+_RECORD = struct.Struct('<HHI')
+_LENGTH = struct.Struct('<I')
+
+
+def pack_events(events):
+    """Pack engine events (anything with minute, type and description keys) into bytes"""
+    strings = {}
+    records = []
+
+    def string_index(text):
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    for event in events:
+        records.append(_RECORD.pack(
+            event['minute'],
+            string_index(event['type']),
+            string_index(event['description'] or '')
+        ))
+
+    parts = [_HEADER.pack(MAGIC, VERSION, len(records), len(strings))]
+    parts.extend(records)
+    for text in strings:
+        data = text.encode('utf-8')
+        parts.append(_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def unpack_events(data):
+    """
+    Decode a packed blob into event dicts. Each dict has both 'type' (engine
+    results) and 'event_type' (MatchEvent rows) so either template can use it.
+    """
+    magic, version, record_count, string_count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a packed event log (or unsupported version)")
+
+    offset = _HEADER.size
+    records = [_RECORD.unpack_from(data, offset + i * _RECORD.size) for i in range(record_count)]
+    offset += record_count * _RECORD.size
+
+    strings = []
+    for _ in range(string_count):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        strings.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+
+    return [
+        {
+            'minute': minute,
+            'type': strings[type_index],
+            'event_type': strings[type_index],
+            'description': strings[description_index]
+        }
+        for minute, type_index, description_index in records
+    ]
@@ -0,0 +1,73 @@
+# esms/utils/live.py
+"""
+Server-Sent Events for live match replays.
+
+live_events() turns the items of EnhancedMatchEngine.iter_match() into an
+SSE stream paced by match minute: at speed 1 a minute of play takes a real
+minute, at speed 30 two seconds. Each event carries its sequence number as
+the SSE id, so a reconnecting client that sends Last-Event-ID gets the
+events it has already seen skipped without waiting - the replay is seeded,
+so the sequence is the same every time.
+"""
+import json
+import time
+
+# Longest silence before a comment line keeps proxies from closing the stream
+HEARTBEAT_SECONDS = 15
+
+# Allowed speeds: real time at the slowest (a stream holds its worker for the
+# whole match), nine seconds a match at the fastest
+MIN_SPEED = 1
+MAX_SPEED = 600
+
+
+def format_event(data, event=None, event_id=None):
+    """One SSE message with data serialised as JSON"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def live_events(items, speed, resume_after=None, sleep=time.sleep):
+    """
+    SSE messages for iter_match() items, waiting (minute gap x 60 / speed)
+    seconds before each new minute. Events up to and including the id
+    resume_after are skipped without waiting. Ends with an 'end' message
+    holding the final score.
+    """
+    if not MIN_SPEED <= speed <= MAX_SPEED:  # Also rejects nan
+        raise ValueError(f"speed must be between {MIN_SPEED} and {MAX_SPEED}")
+    seconds_per_minute = 60 / speed
+
+    minute = 0
+    score = (0, 0)
+    for sequence, item in enumerate(items):
+        score = item['score']
+        if resume_after is not None and sequence <= resume_after:
+            minute = item['minute']
+            continue
+
+        wait = (item['minute'] - minute) * seconds_per_minute
+        minute = item['minute']
+        while wait > 0:
+            pause = min(wait, HEARTBEAT_SECONDS)
+            sleep(pause)
+            wait -= pause
+            if wait > 0:
+                yield ": heartbeat\n\n"
+
+        event = item['event']
+        yield format_event({
+            'minute': event.minute,
+            'type': event.type,
+            'team': event.team,
+            'description': event.description,
+            'score': list(score),
+            'stats': item['stats']
+        }, event='match_event', event_id=sequence)
+
+    yield format_event({'home_score': score[0], 'away_score': score[1]}, event='end')